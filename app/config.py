@@ -25,8 +25,12 @@ class Settings:
     DOCS_DIR: str = os.path.join(STATIC_DIR, "docs")
     
     # Data Files
-    MASKING_DATA_FILE: str = "masking_df.xlsx"
-    IQC_DATA_FILE: str = "iqc_data.xlsx"
+    MASKING_DATA_FILE: str = os.getenv("MASKING_DATA_FILE", "masking_df.xlsx")
+    IQC_DATA_FILE: str = os.getenv("IQC_DATA_FILE", "iqc_data.xlsx")
+    # Parquet/Arrow 사본 (pyarrow 필요, 원본 mtime/크기가 바뀌면 다시 생성)
+    DATASET_SIDECAR_ENABLED: bool = os.getenv("DATASET_SIDECAR_ENABLED", "true").lower() == "true"
+    DATASET_SIDECAR_DIR: str = os.getenv("DATASET_SIDECAR_DIR", ".dataset_cache")
+    DATASET_SIDECAR_FORMAT: str = os.getenv("DATASET_SIDECAR_FORMAT", "parquet")  # "parquet" | "arrow"
     
     # Server Settings
     HOST: str = "0.0.0.0"
@@ -44,6 +48,9 @@ class Settings:
     ]
     SSO_REDIRECT_BASE_URL: str = "http://192.168.0.196:80"
     
+    # Admin Settings (관리자 API를 호출할 수 있는 user_id 목록, 쉼표로 구분)
+    ADMIN_USER_IDS: List[str] = [u.strip() for u in os.getenv("ADMIN_USER_IDS", "").split(",") if u.strip()]
+    
     # Database Settings
     DB_HOST: str = os.getenv("DB_HOST", "192.168.0.196")
     DB_DATABASE: str = os.getenv("DB_DATABASE", "chat_analysis_db")
@@ -51,6 +58,61 @@ class Settings:
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "dkzndk")
     DB_PORT: int = int(os.getenv("DB_PORT", "5433"))
     
+    # Database Connection Pool Settings
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    DB_POOL_IDLE_TIMEOUT: float = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300"))  # 초
+    DB_POOL_CHECKOUT_TIMEOUT: float = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "10"))  # 초
+    DB_POOL_HEALTH_CHECK_INTERVAL: float = float(os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL", "30"))  # 초
+    
+    # 저장소 쿼리를 연결마다 PREPARE 후 이름으로 실행 (PgBouncer transaction 모드에서는 false)
+    DB_PREPARED_STATEMENTS: bool = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"
+    
+    # Chat Write-Behind Settings (응답 전송 후 채팅 턴을 백그라운드에서 일괄 저장)
+    CHAT_WRITE_BEHIND_ENABLED: bool = os.getenv("CHAT_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+    CHAT_WRITE_BEHIND_MAX_QUEUE: int = int(os.getenv("CHAT_WRITE_BEHIND_MAX_QUEUE", "1000"))
+    CHAT_WRITE_BEHIND_BATCH_SIZE: int = int(os.getenv("CHAT_WRITE_BEHIND_BATCH_SIZE", "100"))
+    CHAT_WRITE_BEHIND_FLUSH_INTERVAL: float = float(os.getenv("CHAT_WRITE_BEHIND_FLUSH_INTERVAL", "0.2"))  # 초
+    CHAT_WRITE_BEHIND_MAX_RETRIES: int = int(os.getenv("CHAT_WRITE_BEHIND_MAX_RETRIES", "3"))
+    CHAT_WRITE_BEHIND_DEAD_LETTER_PATH: str = os.getenv("CHAT_WRITE_BEHIND_DEAD_LETTER_PATH", "dead_letter/chat_turns.jsonl")  # 저장하지 못한 턴
+    
+    # Partitioning Settings (service_chat_histories / service_bot_responses 월별 파티션)
+    PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    PARTITION_ENSURE_INTERVAL_SECONDS: float = float(os.getenv("PARTITION_ENSURE_INTERVAL_SECONDS", "86400"))  # 월 파티션 생성 확인 주기
+    PARTITION_ARCHIVE_DIR: str = os.getenv("PARTITION_ARCHIVE_DIR", "archive")
+    
+    # Data Generator Executor (pandas 데이터 생성 작업 전용 스레드풀)
+    DATA_GENERATOR_WORKERS: int = int(os.getenv("DATA_GENERATOR_WORKERS", "4"))
+    DATA_GENERATOR_MAX_QUEUE: int = int(os.getenv("DATA_GENERATOR_MAX_QUEUE", "32"))
+    DATA_GENERATOR_TIMEOUT: float = float(os.getenv("DATA_GENERATOR_TIMEOUT", "60"))  # 초
+    DATA_COALESCE_TIMEOUT: float = float(os.getenv("DATA_COALESCE_TIMEOUT", "60"))  # 같은 계산을 기다리는 키별 제한 시간(초)
+    
+    # Data Generator Result Cache (엑셀 기반 생성 결과를 원본 파일 지문 기준으로 캐시)
+    DATA_CACHE_ENABLED: bool = os.getenv("DATA_CACHE_ENABLED", "true").lower() == "true"
+    DATA_CACHE_TTL_SECONDS: float = float(os.getenv("DATA_CACHE_TTL_SECONDS", "600"))
+    DATA_CACHE_MAX_BYTES: int = int(os.getenv("DATA_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    
+    # Content-addressed Payloads (이 크기 이상의 real_data는 service_payloads에 해시로 저장)
+    CHAT_PAYLOAD_MIN_BYTES: int = int(os.getenv("CHAT_PAYLOAD_MIN_BYTES", "4096"))
+    PAYLOAD_GC_GRACE_MINUTES: int = int(os.getenv("PAYLOAD_GC_GRACE_MINUTES", "60"))
+    
+    # Stored Content Compression ("zstd" | "zlib" | "none", zstandard가 없으면 zstd 대신 zlib)
+    CHAT_CONTENT_COMPRESSION: str = os.getenv("CHAT_CONTENT_COMPRESSION", "none")
+    CHAT_CONTENT_COMPRESSION_LEVEL: int = int(os.getenv("CHAT_CONTENT_COMPRESSION_LEVEL", "3"))
+    
+    # Chunked Response Streaming (stream_rows 요청 시 real_data 청크 크기)
+    CHAT_STREAM_CHUNK_ROWS: int = int(os.getenv("CHAT_STREAM_CHUNK_ROWS", "500"))
+    
+    # Logging (LOG_LEVELS: "모듈=레벨" 쉼표 구분, LOG_FORMAT: "text" | "json")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))  # DEBUG 로그 출력 비율
+    
+    # Chat History Pagination
+    HISTORY_PAGE_DEFAULT_LIMIT: int = 20
+    HISTORY_PAGE_MAX_LIMIT: int = 200
+    
     # Static file examples
     STATIC_EXAMPLES = {
         "example1.pdf": "PCM 데이터 분석 가이드\n\n이 문서는 PCM 데이터 분석 방법에 대한 상세한 가이드입니다.",
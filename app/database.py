@@ -3,19 +3,415 @@ Database connection and utilities
 """
 
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
+from psycopg2.pool import PoolError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Generator, List, Optional, Sequence, Set, TypeVar
+import asyncio
+import functools
 import logging
+import re
+import threading
+import time
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+class PreparedStatementConnection(psycopg2.extensions.connection):
+    """서버에 PREPARE된 문장 이름을 기억하는 연결 (연결이 닫히면 함께 사라짐)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: Set[str] = set()
+
+
+@dataclass
+class _Statement:
+    """이름이 붙은 저장소 쿼리와 호출 통계"""
+    name: str
+    sql: str
+    server_name: str  # PREPARE에 쓰는 식별자
+    prepare_sql: str
+    execute_sql: str
+    calls: int = 0
+    errors: int = 0
+    prepares: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+# 저장소 SQL의 %s 자리표시자 (%%는 리터럴 %)
+_PLACEHOLDER_PATTERN = re.compile(r"%%|%s")
+
+
+class StatementRegistry:
+    """저장소 쿼리를 이름으로 관리하는 prepared statement 레지스트리
+
+    같은 쿼리를 매번 텍스트로 보내면 PostgreSQL이 매번 파싱/계획을 다시 세우므로,
+    풀의 연결마다 처음 한 번만 PREPARE하고 이후에는 EXECUTE name(...)으로 실행한다.
+    이름별 호출 수와 실행 시간을 모아 어떤 쿼리가 DB 시간을 차지하는지 확인할 수 있다.
+
+    - SQL은 %s 자리표시자만 사용해야 한다 (문자열 리터럴 안의 %s는 지원하지 않음)
+    - enabled=False이면 PREPARE 없이 원문 SQL을 실행하고 통계만 기록 (PgBouncer transaction 모드 등)
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _Statement] = {}
+
+    def _build(self, name: str, sql: str) -> _Statement:
+        param_count = 0
+
+        def replace(match: "re.Match[str]") -> str:
+            nonlocal param_count
+            if match.group(0) == "%%":
+                return "%"
+            param_count += 1
+            return f"${param_count}"
+
+        server_name = "stmt_" + re.sub(r"\W", "_", name)
+        converted = _PLACEHOLDER_PATTERN.sub(replace, sql)
+        args = f" ({', '.join(['%s'] * param_count)})" if param_count else ""
+        return _Statement(
+            name=name,
+            sql=sql,
+            server_name=server_name,
+            prepare_sql=f"PREPARE {server_name} AS {converted}",
+            execute_sql=f"EXECUTE {server_name}{args}",
+        )
+
+    def register(self, name: str, sql: str) -> _Statement:
+        """이름으로 쿼리 등록 (같은 이름에 다른 SQL을 등록하면 ValueError)"""
+        statement = self._statements.get(name)
+        if statement is not None:
+            if statement.sql is not sql and statement.sql != sql:
+                raise ValueError(f"Statement {name!r} is already registered with different SQL")
+            return statement
+        with self._lock:
+            statement = self._statements.get(name)
+            if statement is None:
+                statement = self._build(name, sql)
+                self._statements[name] = statement
+            elif statement.sql != sql:
+                raise ValueError(f"Statement {name!r} is already registered with different SQL")
+        return statement
+
+    def get_sql(self, name: str) -> str:
+        """등록된 쿼리의 원문 SQL"""
+        return self._statements[name].sql
+
+    def names(self) -> List[str]:
+        return sorted(self._statements)
+
+    def execute_registered(self, cursor, name: str, params: Optional[Sequence[Any]] = None) -> None:
+        """import 시점에 register()로 등록해 둔 쿼리를 이름으로 실행"""
+        self.execute(cursor, name, self.get_sql(name), params)
+
+    def execute(self, cursor, name: str, sql: str, params: Optional[Sequence[Any]] = None) -> None:
+        """이름 붙은 쿼리 실행 (연결에서 처음 실행될 때만 PREPARE)"""
+        statement = self.register(name, sql)
+        conn = cursor.connection
+        prepared = getattr(conn, "prepared_statements", None)
+        use_prepared = self.enabled and prepared is not None
+
+        started = time.perf_counter()
+        prepared_now = False
+        try:
+            if use_prepared:
+                if statement.server_name not in prepared:
+                    cursor.execute(statement.prepare_sql)
+                    prepared.add(statement.server_name)
+                    prepared_now = True
+                cursor.execute(statement.execute_sql, params or None)
+            else:
+                cursor.execute(statement.sql, params)
+        except psycopg2.Error as e:
+            if use_prepared and isinstance(e, psycopg2.errors.InvalidSqlStatementName):
+                # 서버 세션에서 문장이 사라진 경우 (DISCARD ALL 등) 다음 실행 때 다시 PREPARE
+                prepared.clear()
+            with self._lock:
+                statement.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                statement.calls += 1
+                statement.prepares += int(prepared_now)
+                statement.total_time += elapsed
+                statement.max_time = max(statement.max_time, elapsed)
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """쿼리별 호출 통계 (총 실행 시간이 큰 순)"""
+        with self._lock:
+            stats = [
+                {
+                    'name': st.name,
+                    'calls': st.calls,
+                    'errors': st.errors,
+                    'prepares': st.prepares,
+                    'total_ms': round(st.total_time * 1000, 3),
+                    'avg_ms': round(st.total_time / st.calls * 1000, 3) if st.calls else 0.0,
+                    'max_ms': round(st.max_time * 1000, 3),
+                }
+                for st in self._statements.values()
+            ]
+        return sorted(stats, key=lambda item: item['total_ms'], reverse=True)
+
+
+@dataclass
+class _PooledConnection:
+    """풀에서 관리하는 연결과 메타데이터"""
+    conn: psycopg2.extensions.connection
+    created_at: float = field(default_factory=time.monotonic)
+    last_used_at: float = field(default_factory=time.monotonic)
+
+
+class ConnectionPool:
+    """스레드 안전한 PostgreSQL 연결 풀
+
+    - min_size / max_size: 유지할 최소 연결 수와 동시에 열 수 있는 최대 연결 수
+    - idle_timeout: 이 시간(초) 이상 유휴 상태인 연결은 min_size를 초과하는 범위에서 정리
+    - checkout_timeout: 연결을 얻기 위해 대기할 최대 시간(초)
+    - health_check_interval: 이 시간(초) 이상 유휴였던 연결은 대여 시 SELECT 1로 생존 확인
+    """
+
+    def __init__(self, connection_params: Dict[str, Any], min_size: int = 1, max_size: int = 10,
+                 idle_timeout: float = 300.0, checkout_timeout: float = 10.0,
+                 health_check_interval: float = 30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+
+        self.connection_params = connection_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _PooledConnection] = {}
+        self._opening = 0
+        self._waiting = 0
+        self._closed = False
+        self._prefilled = False
+
+        # 통계
+        self._checkouts = 0
+        self._checkout_timeouts = 0
+        self._connections_created = 0
+        self._connections_discarded = 0
+        self._connections_evicted = 0
+        self._checkout_wait_total = 0.0
+        self._checkout_wait_max = 0.0
+
+    @property
+    def size(self) -> int:
+        """현재 열려 있는(또는 여는 중인) 연결 수"""
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def _connect(self) -> psycopg2.extensions.connection:
+        conn = psycopg2.connect(connection_factory=PreparedStatementConnection, **self.connection_params)
+        conn.autocommit = False
+        return conn
+
+    def _close_quietly(self, conn: psycopg2.extensions.connection) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _prefill(self) -> None:
+        """최초 대여 시 min_size만큼 연결을 미리 생성"""
+        with self._cond:
+            if self._prefilled or self._closed:
+                return
+            self._prefilled = True
+            missing = max(0, self.min_size - self.size)
+            self._opening += missing
+
+        for _ in range(missing):
+            entry = None
+            try:
+                entry = _PooledConnection(self._connect())
+            except psycopg2.Error as e:
+                logger.warning(f"Connection pool prefill failed: {e}")
+            with self._cond:
+                self._opening -= 1
+                if entry is not None:
+                    self._connections_created += 1
+                    self._idle.append(entry)
+                    self._cond.notify()
+
+    def _evict_idle_locked(self) -> None:
+        """idle_timeout을 넘긴 유휴 연결 정리 (lock 보유 상태에서 호출)"""
+        if self.idle_timeout <= 0:
+            return
+        now = time.monotonic()
+        # 가장 오래 쉰 연결이 deque 왼쪽에 위치
+        while self._idle and self.size > self.min_size:
+            oldest = self._idle[0]
+            if now - oldest.last_used_at < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._connections_evicted += 1
+            self._close_quietly(oldest.conn)
+
+    def _is_alive(self, entry: _PooledConnection) -> bool:
+        """대여 직전 연결 생존 확인"""
+        conn = entry.conn
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return False
+        if time.monotonic() - entry.last_used_at < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Discarding dead pooled connection: {e}")
+            return False
+
+    def getconn(self) -> psycopg2.extensions.connection:
+        """풀에서 연결 대여 (필요 시 생성, 가득 찼으면 checkout_timeout까지 대기)"""
+        if not self._prefilled:
+            self._prefill()
+
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+
+        while True:
+            entry = None
+            with self._cond:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                self._evict_idle_locked()
+
+                while not self._idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._checkout_timeouts += 1
+                        raise PoolError(
+                            f"Timed out after {self.checkout_timeout}s waiting for a database connection "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+                    if self._closed:
+                        raise PoolError("connection pool is closed")
+
+                if self._idle:
+                    # 최근 반납된 연결부터 재사용해 오래된 유휴 연결이 자연스럽게 정리되도록 함
+                    entry = self._idle.pop()
+                    self._in_use[id(entry.conn)] = entry
+                else:
+                    self._opening += 1
+
+            if entry is None:
+                try:
+                    entry = _PooledConnection(self._connect())
+                except Exception:
+                    with self._cond:
+                        self._opening -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._opening -= 1
+                    self._connections_created += 1
+                    self._in_use[id(entry.conn)] = entry
+            elif not self._is_alive(entry):
+                self._close_quietly(entry.conn)
+                with self._cond:
+                    self._in_use.pop(id(entry.conn), None)
+                    self._connections_discarded += 1
+                    self._cond.notify()
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._checkouts += 1
+                self._checkout_wait_total += waited
+                self._checkout_wait_max = max(self._checkout_wait_max, waited)
+            return entry.conn
+
+    def putconn(self, conn: psycopg2.extensions.connection, discard: bool = False) -> None:
+        """연결 반납 (깨진 연결이나 트랜잭션이 남아있는 연결은 정리)"""
+        with self._cond:
+            entry = self._in_use.get(id(conn))
+        if entry is None:
+            logger.warning("Returning a connection that does not belong to the pool")
+            self._close_quietly(conn)
+            return
+
+        if not discard and not conn.closed:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._cond:
+            self._in_use.pop(id(conn), None)
+            if discard or conn.closed or self._closed:
+                self._connections_discarded += 1
+                self._close_quietly(conn)
+            else:
+                entry.last_used_at = time.monotonic()
+                self._idle.append(entry)
+                self._evict_idle_locked()
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        """모든 유휴 연결을 닫고 풀을 종료 (사용 중인 연결은 반납 시 닫힘)"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._close_quietly(self._idle.pop().conn)
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 통계 조회"""
+        with self._cond:
+            self._evict_idle_locked()
+            checkouts = self._checkouts
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'waiting': self._waiting,
+                'checkouts': checkouts,
+                'checkout_timeouts': self._checkout_timeouts,
+                'connections_created': self._connections_created,
+                'connections_discarded': self._connections_discarded,
+                'connections_evicted': self._connections_evicted,
+                'checkout_wait_avg_ms': round(self._checkout_wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                'checkout_wait_max_ms': round(self._checkout_wait_max * 1000, 3),
+                'closed': self._closed,
+            }
+
 
 class DatabaseConnection:
     """PostgreSQL 데이터베이스 연결 관리"""
-    
+
     def __init__(self):
         self.connection_params = {
             'host': settings.DB_HOST,
@@ -24,24 +420,42 @@ class DatabaseConnection:
             'password': settings.DB_PASSWORD,
             'port': settings.DB_PORT
         }
-    
+        self.pool = ConnectionPool(
+            self.connection_params,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            idle_timeout=settings.DB_POOL_IDLE_TIMEOUT,
+            checkout_timeout=settings.DB_POOL_CHECKOUT_TIMEOUT,
+            health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL
+        )
+        # 저장소 쿼리 prepared statement 레지스트리
+        self.statements = StatementRegistry(enabled=settings.DB_PREPARED_STATEMENTS)
+        # 동기 저장소 호출을 이벤트 루프 밖에서 실행하는 전용 스레드풀
+        # (풀 최대 크기와 같게 두어 스레드가 연결 대기로 묶이지 않도록 함)
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.DB_POOL_MAX_SIZE,
+            thread_name_prefix="db-worker"
+        )
+
     @contextmanager
     def get_connection(self) -> Generator[psycopg2.extensions.connection, None, None]:
-        """데이터베이스 연결 컨텍스트 매니저"""
-        conn = None
+        """데이터베이스 연결 컨텍스트 매니저 (풀에서 대여 후 반납)"""
+        conn = self.pool.getconn()
+        discard = False
         try:
-            conn = psycopg2.connect(**self.connection_params)
-            conn.autocommit = False
             yield conn
         except psycopg2.Error as e:
             logger.error(f"Database connection error: {e}")
-            if conn:
+            try:
                 conn.rollback()
+            except psycopg2.Error:
+                discard = True
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                discard = True
             raise
         finally:
-            if conn:
-                conn.close()
-    
+            self.pool.putconn(conn, discard=discard)
+
     @contextmanager
     def get_cursor(self) -> Generator[psycopg2.extras.RealDictCursor, None, None]:
         """데이터베이스 커서 컨텍스트 매니저"""
@@ -56,7 +470,7 @@ class DatabaseConnection:
                 raise
             finally:
                 cursor.close()
-    
+
     def test_connection(self) -> bool:
         """데이터베이스 연결 테스트"""
         try:
@@ -69,6 +483,24 @@ class DatabaseConnection:
             logger.error(f"Database connection test failed: {e}")
             return False
 
+    async def run_in_executor(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """동기 DB 작업을 전용 스레드풀에서 실행하고 결과를 await"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """연결 풀 통계 조회"""
+        return self.pool.get_stats()
+
+    def get_statement_stats(self) -> List[Dict[str, Any]]:
+        """쿼리별 호출 수/실행 시간 통계 조회"""
+        return self.statements.get_stats()
+
+    def close(self) -> None:
+        """DB 스레드풀과 연결 풀 종료"""
+        self._executor.shutdown(wait=True)
+        self.pool.closeall()
+
 
 # 전역 데이터베이스 연결 인스턴스
-db_connection = DatabaseConnection()
\ No newline at end of file
+db_connection = DatabaseConnection()
@@ -3,37 +3,30 @@ Database initialization script
 """
 
 import logging
-from pathlib import Path
 from app.database import db_connection
+from app.migrations import MigrationRunner
+from app.migrations.partitions import PartitionManager
 
 logger = logging.getLogger(__name__)
 
 
 def init_database():
-    """데이터베이스 초기화 - 테이블 생성"""
+    """데이터베이스 초기화 - 버전별 마이그레이션 적용"""
     try:
-        # SQL 파일 읽기
-        sql_file_path = Path(__file__).parent.parent / "tables.sql"
-        
-        if not sql_file_path.exists():
-            logger.error(f"SQL file not found: {sql_file_path}")
-            return False
-        
-        with open(sql_file_path, 'r', encoding='utf-8') as f:
-            sql_script = f.read()
-        
         # 데이터베이스 연결 테스트
         if not db_connection.test_connection():
             logger.error("Database connection test failed")
             return False
         
-        # SQL 스크립트 실행
-        with db_connection.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute(sql_script)
-                conn.commit()
+        # 적용되지 않은 마이그레이션 실행 (schema_migrations 테이블로 적용 버전 관리)
+        applied = MigrationRunner(db_connection).migrate()
+        for migration in applied:
+            logger.info(f"Applied migration {migration.version:04d}_{migration.name}")
+        
+        # 앞으로 사용할 월 파티션 미리 생성
+        PartitionManager(db_connection).ensure_future_partitions()
         
-        logger.info("Database initialized successfully")
+        logger.info(f"Database initialized successfully ({len(applied)} migration(s) applied)")
         return True
         
     except Exception as e:
@@ -43,4 +36,4 @@ def init_database():
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    init_database()
\ No newline at end of file
+    init_database()
@@ -0,0 +1,111 @@
+"""
+Logging config - Queued, level-gated application logging (per-module levels, debug sampling, JSON output)
+"""
+
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.config import settings
+
+# LogRecord 기본 속성 (extra로 넘긴 필드만 구조화 로그에 담기 위해 제외)
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """"app.services.data_generators=WARNING,app.routers=DEBUG" → {모듈: 레벨}"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, sep, level = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        value = logging.getLevelName(level.strip().upper())
+        if isinstance(value, int):
+            levels[name.strip()] = value
+    return levels
+
+
+class DebugSamplingFilter(logging.Filter):
+    """DEBUG 레코드는 rate 비율만 통과 (요청마다 찍히는 디버그 로그 양 제한)
+
+    INFO 이상은 항상 통과한다. extra={'sample': False}로 남긴 디버그 로그는 샘플링하지 않는다.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        if getattr(record, "sample", True) is False:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (extra로 넘긴 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and key != "sample":
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: str = settings.LOG_LEVEL, module_levels: str = settings.LOG_LEVELS,
+                  log_format: str = settings.LOG_FORMAT,
+                  debug_sample_rate: float = settings.LOG_DEBUG_SAMPLE_RATE) -> None:
+    """루트 로거에 QueueHandler를 달고 별도 스레드(QueueListener)에서 stdout으로 출력
+
+    요청 처리 스레드/이벤트 루프는 레코드를 큐에 넣기만 하므로 출력 I/O로 막히지 않는다.
+    레벨 미달이거나 샘플링에서 빠진 레코드는 메시지 포맷팅 자체를 하지 않는다.
+    여러 번 호출해도 한 번만 설정된다.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if log_format.lower() == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+
+    root = logging.getLogger()
+    root.setLevel(logging.getLevelName(level.upper()))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    for name, module_level in parse_module_levels(module_levels).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 레코드를 모두 출력하고 리스너 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
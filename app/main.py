@@ -7,6 +7,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 
+import logging
 import sys
 import os
 
@@ -16,9 +17,19 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from app.config import settings
+from app.logging_config import setup_logging, shutdown_logging
+
+setup_logging()
+
 from app.utils import initialize_application
-from app.routers import chat_router, health_router, auth_router
+from app.routers import chat_router, health_router, auth_router, admin_router
 from app.repositories import ChatStorage, UserStorage
+from app.database import db_connection
+from app.repositories.write_behind import write_behind_queue
+from app.services.partition_job import partition_job
+from app.services.generator_executor import generator_executor
+
+logger = logging.getLogger(__name__)
 
 # Initialize global storage (in production, this would be dependency injected)
 chat_storage = ChatStorage()
@@ -35,8 +46,17 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
     initialize_application(chat_storage)
+    # 다음 달 파티션이 없으면 행이 default 파티션에 쌓이므로 시작할 때와 이후 주기적으로 확인
+    partition_job.start()
+    if settings.CHAT_WRITE_BEHIND_ENABLED:
+        write_behind_queue.start()
     yield
-    # Shutdown (if needed)
+    # Shutdown - 대기 중인 채팅 턴을 모두 저장한 뒤 DB 연결 종료
+    await write_behind_queue.stop()
+    await partition_job.stop()
+    generator_executor.shutdown()
+    db_connection.close()
+    shutdown_logging()
 
 # Create FastAPI app with lifespan
 app = FastAPI(title=settings.APP_TITLE, version=settings.APP_VERSION, lifespan=lifespan)
@@ -60,6 +80,7 @@ app.add_middleware(
 app.include_router(chat_router, tags=["chat"])
 app.include_router(health_router, tags=["health"])
 app.include_router(auth_router, tags=["authentication"])
+app.include_router(admin_router, tags=["admin"])
 
 # Static files mounting
 app.mount("/static", StaticFiles(directory=settings.STATIC_DIR), name="static")
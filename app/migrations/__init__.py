@@ -0,0 +1,7 @@
+"""
+Migrations package - Versioned database schema migrations
+"""
+
+from .runner import Migration, MigrationRunner, run_migrations
+
+__all__ = ["Migration", "MigrationRunner", "run_migrations"]
@@ -0,0 +1,39 @@
+"""
+Migration CLI
+
+Usage:
+    python -m app.migrations            # 적용되지 않은 마이그레이션 모두 적용
+    python -m app.migrations status     # 마이그레이션 적용 현황
+    python -m app.migrations migrate 3  # 버전 3까지만 적용
+"""
+
+import logging
+import sys
+
+from app.migrations.runner import MigrationRunner
+
+
+def main(argv) -> int:
+    command = argv[0] if argv else "migrate"
+    runner = MigrationRunner()
+
+    if command == "status":
+        for item in runner.status():
+            mark = "✅" if item["applied"] else "⏳"
+            warning = " (checksum mismatch)" if item["checksum_mismatch"] else ""
+            print(f"{mark} {item['version']:04d}_{item['name']}{warning}")
+        return 0
+
+    if command == "migrate":
+        target = int(argv[1]) if len(argv) > 1 else None
+        applied = runner.migrate(target)
+        print(f"Applied {len(applied)} migration(s)")
+        return 0
+
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,301 @@
+"""
+Partition manager - Creates upcoming monthly partitions and archives old ones to compressed files
+
+Usage:
+    python -m app.migrations.partitions ensure
+    python -m app.migrations.partitions list
+    python -m app.migrations.partitions archive --older-than-months 12
+    python -m app.migrations.partitions restore service_chat_histories_p202401
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import re
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from psycopg2 import sql
+
+from app.config import settings
+from app.database import DatabaseConnection, db_connection
+
+logger = logging.getLogger(__name__)
+
+# 월별 파티션 테이블과 파티션 키 (0007_partition_history_tables.sql)
+PARTITIONED_TABLES: Dict[str, str] = {
+    "service_chat_histories": "response_time",
+    "service_bot_responses": "timestamp",
+}
+
+PARTITION_NAME_PATTERN = re.compile(r"^(?P<parent>\w+)_p(?P<year>\d{4})(?P<month>\d{2})$")
+
+
+def _add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class PartitionManager:
+    """service_chat_histories / service_bot_responses 월별 파티션 관리
+
+    - ensure_future_partitions: 이번 달부터 months_ahead개월 뒤까지 파티션 생성 (없으면 default 파티션에 쌓임,
+      이미 쌓인 행은 파티션을 만들 때 새 파티션으로 옮김 - 0010_partition_default_rows.sql, 주기 실행은 PartitionJob)
+    - archive: older_than_months보다 오래된 파티션을 <dir>/<partition>.csv.gz로 내보낸 뒤 분리(DETACH)해 삭제
+      (봇 응답 파티션은 참조하는 payload도 <partition>.payloads.csv.gz로 함께 내보내고 ref_count를 줄임)
+    - restore: 내보낸 파일로 파티션을 다시 만들고 부모 테이블에 붙임(ATTACH)
+
+    분리/복원 후에는 채팅방 요약 컬럼(message_count, last_activity)을 남아 있는 히스토리 기준으로 다시 계산한다.
+    """
+
+    def __init__(self, db: DatabaseConnection = db_connection, archive_dir: Optional[Path] = None):
+        self.db = db
+        self.archive_dir = Path(archive_dir or settings.PARTITION_ARCHIVE_DIR)
+
+    def ensure_future_partitions(self, months_ahead: int = settings.PARTITION_MONTHS_AHEAD) -> int:
+        """이번 달 ~ months_ahead개월 뒤 파티션 생성, 새로 만든 개수 반환"""
+        this_month = date.today().replace(day=1)
+        created = 0
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                for parent in PARTITIONED_TABLES:
+                    cursor.execute(
+                        "SELECT service_ensure_monthly_partitions(%s, %s, %s)",
+                        (parent, this_month, _add_months(this_month, months_ahead))
+                    )
+                    created += cursor.fetchone()[0]
+            conn.commit()
+        if created:
+            logger.info(f"Created {created} monthly partitions")
+        return created
+
+    def list_partitions(self, parent: str) -> List[Dict[str, Any]]:
+        """부모 테이블에 붙어 있는 월 파티션 목록 (월 순)"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT c.relname, c.reltuples::bigint
+                    FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = %s::regclass
+                """, (parent,))
+                rows = cursor.fetchall()
+            conn.rollback()
+
+        partitions = []
+        for name, estimated_rows in rows:
+            match = PARTITION_NAME_PATTERN.match(name)
+            if not match or match.group("parent") != parent:
+                continue  # default 파티션
+            month_start = date(int(match.group("year")), int(match.group("month")), 1)
+            partitions.append({
+                "name": name,
+                "parent": parent,
+                "from": month_start,
+                "to": _add_months(month_start, 1),
+                "estimated_rows": max(estimated_rows, 0),
+            })
+        return sorted(partitions, key=lambda p: p["from"])
+
+    def _refresh_chatroom_activity(self, cursor, chatroom_ids: List[int]) -> None:
+        if chatroom_ids:
+            cursor.execute("SELECT service_refresh_chatroom_activity(%s::integer[])", (chatroom_ids,))
+
+    def _adjust_payload_refs(self, cursor, name: sql.Identifier, sign: int) -> None:
+        """분리/복원한 봇 응답 파티션이 참조하는 payload의 ref_count 조정
+
+        DETACH/ATTACH는 service_bot_responses 트리거를 거치지 않으므로 직접 반영한다.
+        """
+        cursor.execute(sql.SQL("""
+            UPDATE service_payloads p
+            SET ref_count = GREATEST(p.ref_count + %s * n.refs, 0),
+                last_referenced_at = CURRENT_TIMESTAMP
+            FROM (
+                SELECT payload_hash, COUNT(*) AS refs FROM {}
+                WHERE payload_hash IS NOT NULL
+                GROUP BY payload_hash
+            ) n
+            WHERE p.hash = n.payload_hash
+        """).format(name), (sign,))
+
+    def _export_payloads(self, cursor, name: sql.Identifier, path: Path) -> None:
+        """봇 응답 파티션이 참조하는 payload를 함께 내보냄 (보관 후 GC로 지워져도 복원 가능하도록)"""
+        with gzip.open(path, "wb") as f:
+            cursor.copy_expert(sql.SQL("""
+                COPY (
+                    SELECT hash, data, data_blob, data_encoding, size_bytes, created_at FROM service_payloads
+                    WHERE hash IN (SELECT payload_hash FROM {})
+                ) TO STDOUT WITH (FORMAT csv, HEADER)
+            """).format(name), f)
+
+    def _import_payloads(self, cursor, path: Path) -> None:
+        """보관된 payload를 다시 저장 (이미 있는 해시는 그대로 둠)"""
+        cursor.execute("""
+            CREATE TEMP TABLE restored_payloads (
+                hash CHAR(64), data JSONB, data_blob BYTEA, data_encoding VARCHAR(16),
+                size_bytes INTEGER, created_at TIMESTAMP
+            ) ON COMMIT DROP
+        """)
+        with gzip.open(path, "rb") as f:
+            # 압축 컬럼이 생기기 전에 보관한 파일도 읽을 수 있도록 파일 헤더의 컬럼만 지정
+            columns = f.readline().decode("utf-8").strip().split(",")
+            cursor.copy_expert(sql.SQL("COPY restored_payloads ({}) FROM STDIN WITH (FORMAT csv)").format(
+                sql.SQL(", ").join(sql.Identifier(c.strip('"')) for c in columns)
+            ), f)
+        cursor.execute("""
+            INSERT INTO service_payloads (hash, data, data_blob, data_encoding, size_bytes, created_at)
+            SELECT hash, data, data_blob, data_encoding, size_bytes, created_at FROM restored_payloads
+            ON CONFLICT (hash) DO NOTHING
+        """)
+
+    def archive_partition(self, partition: Dict[str, Any]) -> Path:
+        """파티션 하나를 분리하고 압축 파일로 내보낸 뒤 삭제"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        data_path = self.archive_dir / f"{partition['name']}.csv.gz"
+        payloads_path = self.archive_dir / f"{partition['name']}.payloads.csv.gz"
+        manifest_path = self.archive_dir / f"{partition['name']}.json"
+        name = sql.Identifier(partition["name"])
+        parent = sql.Identifier(partition["parent"])
+
+        # 내보내기는 붙어 있는 파티션에서 먼저 하고, 부모에 ACCESS EXCLUSIVE 잠금이 걸리는 DETACH/DROP은 마지막에 바로 커밋
+        # (파티션에만 SHARE 잠금을 걸어 내보내는 동안 그 달 행의 변경만 막고, 다른 달 조회/저장은 계속 진행)
+        with self.db.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql.SQL("LOCK TABLE {} IN SHARE MODE").format(name))
+
+                    chatroom_ids: List[int] = []
+                    if partition["parent"] == "service_chat_histories":
+                        cursor.execute(sql.SQL("SELECT DISTINCT chatroom_id FROM {}").format(name))
+                        chatroom_ids = [row[0] for row in cursor.fetchall()]
+
+                    cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(name))
+                    row_count = cursor.fetchone()[0]
+                    with gzip.open(data_path, "wb") as f:
+                        cursor.copy_expert(sql.SQL("COPY {} TO STDOUT WITH (FORMAT csv, HEADER)").format(name), f)
+
+                    if partition["parent"] == "service_bot_responses":
+                        self._export_payloads(cursor, name, payloads_path)
+                        self._adjust_payload_refs(cursor, name, -1)
+
+                    manifest_path.write_text(json.dumps({
+                        "partition": partition["name"],
+                        "parent": partition["parent"],
+                        "from": partition["from"].isoformat(),
+                        "to": partition["to"].isoformat(),
+                        "rows": row_count,
+                        "archived_at": datetime.now().isoformat(),
+                    }, indent=2), encoding="utf-8")
+
+                    # 파일을 모두 쓴 뒤에만 DETACH/DROP
+                    cursor.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(parent, name))
+                    cursor.execute(sql.SQL("DROP TABLE {}").format(name))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                data_path.unlink(missing_ok=True)
+                payloads_path.unlink(missing_ok=True)
+                manifest_path.unlink(missing_ok=True)
+                raise
+
+        # 요약 컬럼 재계산은 부모 잠금이 풀린 뒤 별도 트랜잭션으로 (다시 실행해도 결과가 같음)
+        if chatroom_ids:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    self._refresh_chatroom_activity(cursor, chatroom_ids)
+                conn.commit()
+
+        logger.info(f"Archived partition {partition['name']} ({row_count} rows) to {data_path}")
+        return data_path
+
+    def archive(self, older_than_months: int) -> List[Path]:
+        """이번 달 기준 older_than_months개월 이전에 끝나는 파티션을 모두 보관"""
+        cutoff = _add_months(date.today().replace(day=1), -older_than_months)
+        archived = []
+        for parent in PARTITIONED_TABLES:
+            for partition in self.list_partitions(parent):
+                if partition["to"] <= cutoff:
+                    archived.append(self.archive_partition(partition))
+        return archived
+
+    def restore(self, partition_name: str) -> int:
+        """보관된 파티션을 다시 만들어 부모 테이블에 붙이고 복원한 행 수 반환"""
+        manifest = json.loads((self.archive_dir / f"{partition_name}.json").read_text(encoding="utf-8"))
+        data_path = self.archive_dir / f"{partition_name}.csv.gz"
+        payloads_path = self.archive_dir / f"{partition_name}.payloads.csv.gz"
+        name = sql.Identifier(manifest["partition"])
+        parent = sql.Identifier(manifest["parent"])
+
+        with self.db.get_connection() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    # ATTACH는 부모의 CHECK 제약(chk_bot_responses_content_present 등)이 파티션에도 있어야 하므로 함께 복사
+                    cursor.execute(sql.SQL(
+                        "CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                    ).format(name, parent))
+                    with gzip.open(data_path, "rb") as f:
+                        # 보관 이후 추가된 컬럼(payload_hash 등)이 있어도 복원되도록 파일 헤더의 컬럼만 지정
+                        columns = f.readline().decode("utf-8").strip().split(",")
+                        cursor.copy_expert(sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+                            name, sql.SQL(", ").join(sql.Identifier(c.strip('"')) for c in columns)
+                        ), f)
+                    cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(name))
+                    row_count = cursor.fetchone()[0]
+
+                    # 부모에 붙이면 인덱스/트리거가 함께 적용됨 (범위가 default 파티션 행과 겹치면 실패)
+                    cursor.execute(
+                        sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)").format(parent, name),
+                        (manifest["from"], manifest["to"])
+                    )
+
+                    if manifest["parent"] == "service_chat_histories":
+                        cursor.execute(sql.SQL("SELECT DISTINCT chatroom_id FROM {}").format(name))
+                        self._refresh_chatroom_activity(cursor, [row[0] for row in cursor.fetchall()])
+                    elif manifest["parent"] == "service_bot_responses" and payloads_path.exists():
+                        self._import_payloads(cursor, payloads_path)
+                        self._adjust_payload_refs(cursor, name, 1)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        logger.info(f"Restored partition {partition_name} ({row_count} rows) from {data_path}")
+        return row_count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations.partitions")
+    parser.add_argument("--dir", type=Path, default=None, help="보관 파일 디렉토리 (기본: PARTITION_ARCHIVE_DIR)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ensure_parser = subparsers.add_parser("ensure", help="앞으로 사용할 월 파티션 생성")
+    ensure_parser.add_argument("--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    subparsers.add_parser("list", help="월 파티션 목록")
+    archive_parser = subparsers.add_parser("archive", help="오래된 파티션을 분리해 압축 파일로 보관")
+    archive_parser.add_argument("--older-than-months", type=int, required=True)
+    restore_parser = subparsers.add_parser("restore", help="보관된 파티션 복원")
+    restore_parser.add_argument("partition")
+
+    args = parser.parse_args(argv)
+    manager = PartitionManager(archive_dir=args.dir)
+
+    if args.command == "ensure":
+        print(f"created {manager.ensure_future_partitions(args.months_ahead)} partitions")
+    elif args.command == "list":
+        for parent in PARTITIONED_TABLES:
+            for p in manager.list_partitions(parent):
+                print(f"{p['name']:<40} {p['from']} ~ {p['to']}  ~{p['estimated_rows']} rows")
+    elif args.command == "archive":
+        for path in manager.archive(args.older_than_months):
+            print(f"archived {path}")
+    elif args.command == "restore":
+        print(f"restored {manager.restore(args.partition)} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Query plan check - Runs EXPLAIN on each repository read query and asserts index usage
+
+Usage:
+    python -m app.migrations.plan_check
+"""
+
+import importlib
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from app.database import DatabaseConnection, db_connection
+
+logger = logging.getLogger(__name__)
+
+
+# 검사할 쿼리를 등록하는 저장소 모듈 (import 시점에 db_connection.statements에 등록됨)
+REPOSITORY_MODULES = (
+    "app.repositories.chat_storage",
+    "app.repositories.conversation_session",
+    "app.repositories.user_storage",
+    "app.repositories.user_repository",
+    "app.repositories.data_preservation",
+)
+
+
+@dataclass
+class PlanCheck:
+    """EXPLAIN으로 확인할 저장소 쿼리 (SQL은 StatementRegistry에 같은 이름으로 등록된 원문을 사용)"""
+    name: str
+    params: Sequence[Any]
+    tables: Tuple[str, ...]  # 순차 스캔되면 안 되는 테이블 (파티션 테이블이면 모든 파티션 포함)
+
+
+# app/repositories의 조회/수정 쿼리 (INSERT 전용 쿼리는 제외)
+# 이름은 저장소 모듈이 StatementRegistry에 등록하는 문장 이름이며, /api/metrics/statements와도 같다.
+PLAN_CHECKS: List[PlanCheck] = [
+    PlanCheck("chat_storage.get_all_chatrooms", ("developer",), ("service_chatrooms",)),
+    PlanCheck("chat_storage.get_chatroom_history", (1, "2024-01-01"), ("service_chat_histories",)),
+    PlanCheck(
+        "chat_storage.get_chatroom_history_page",
+        (1, "infinity", 0, "infinity", "2024-01-01", 21),
+        ("service_chat_histories",),
+    ),
+    PlanCheck(
+        "chat_storage.get_chatroom_history_page_ids",
+        (1, "infinity", 0, "infinity", "2024-01-01", 21),
+        ("service_chat_histories",),
+    ),
+    PlanCheck("chat_storage.get_messages_by_chatroom", (1,), ("service_messages",)),
+    PlanCheck("chat_storage.get_responses_by_chatroom", (1, 1), ("service_bot_responses", "service_payloads")),
+    PlanCheck("conversation_session.get_session", (1, "developer"), ("service_conversation_sessions",)),
+    PlanCheck(
+        "conversation_session.save",
+        ("initial", None, None, None, 0, 1, "developer", 0),
+        ("service_conversation_sessions",),
+    ),
+    PlanCheck("user_storage.get_session", ("sso_0_developer",), ("service_user_storage",)),
+    PlanCheck("user_storage.get_user_sessions", ("developer",), ("service_user_storage",)),
+    PlanCheck("user_storage.cleanup_expired_sessions", (), ("service_user_storage",)),
+    PlanCheck("user_repository.get_user", ("developer",), ("service_users",)),
+    PlanCheck("user_repository.get_all_users", (100, 0), ("service_users",)),
+    PlanCheck(
+        "data_preservation.get_user_data_statistics",
+        ("developer",),
+        ("service_chatrooms", "service_chat_histories"),
+    ),
+    PlanCheck("data_preservation.collect_unreferenced_payloads", (60, 500), ("service_payloads",)),
+    PlanCheck("data_preservation.purge_deleted_chatrooms", (30, 0, 100), ("service_chatrooms",)),
+]
+
+
+def load_repository_statements() -> None:
+    """저장소 모듈을 import해 검사 대상 쿼리를 StatementRegistry에 등록"""
+    for module in REPOSITORY_MODULES:
+        importlib.import_module(module)
+
+
+def _walk(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _walk(child)
+
+
+def _matches(relation: str, tables: Sequence[str]) -> bool:
+    """테이블 이름 또는 그 파티션(<table>_p202401, <table>_default) 이름인지 확인"""
+    return any(relation == table or relation.startswith(table + "_") for table in tables)
+
+
+def explain(db: DatabaseConnection, check: PlanCheck) -> Dict[str, Any]:
+    """순차 스캔을 비활성화한 상태로 EXPLAIN 결과(JSON) 조회
+
+    테이블이 작으면 플래너가 인덱스가 있어도 순차 스캔을 고르므로 enable_seqscan을 끄고,
+    그래도 순차 스캔이 남으면 쿼리에 맞는 인덱스가 없다는 뜻이다.
+    """
+    with db.get_connection() as conn:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("EXPLAIN (FORMAT JSON) " + db.statements.get_sql(check.name), check.params)
+                result = cursor.fetchone()[0]
+        finally:
+            # EXPLAIN만 실행하지만 UPDATE 계획 확인도 있으므로 항상 롤백
+            conn.rollback()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]["Plan"]
+
+
+def run_plan_checks(db: DatabaseConnection = db_connection, checks: List[PlanCheck] = None) -> List[str]:
+    """모든 쿼리의 실행 계획을 확인하고 실패 목록 반환"""
+    load_repository_statements()
+    registered = set(db.statements.names())
+    failures = []
+    for check in checks if checks is not None else PLAN_CHECKS:
+        if check.name not in registered:
+            failures.append(f"{check.name}: statement is not registered")
+            logger.error(f"❌ {check.name}: statement is not registered")
+            continue
+        plan = explain(db, check)
+        seq_scanned = sorted({
+            node.get("Relation Name")
+            for node in _walk(plan)
+            if node.get("Node Type") == "Seq Scan" and _matches(node.get("Relation Name", ""), check.tables)
+        })
+        if seq_scanned:
+            failures.append(f"{check.name}: sequential scan on {', '.join(seq_scanned)}")
+            logger.error(f"❌ {check.name}: sequential scan on {', '.join(seq_scanned)}")
+        else:
+            logger.info(f"✅ {check.name}: index scan")
+    return failures
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(1 if run_plan_checks() else 0)
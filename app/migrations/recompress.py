@@ -0,0 +1,193 @@
+"""
+Recompress - Rewrites stored bot response content / payload data in the configured encoding, in batches
+
+Usage:
+    python -m app.migrations.recompress                       # CHAT_CONTENT_COMPRESSION 기준
+    python -m app.migrations.recompress --encoding zstd --batch-size 500
+    python -m app.migrations.recompress --encoding none       # 압축 해제 (JSONB로 되돌림)
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import psycopg2.extras
+from psycopg2 import sql
+
+from app.config import settings
+from app.database import DatabaseConnection, db_connection
+from app.repositories.content_codec import ContentCodec
+
+logger = logging.getLogger(__name__)
+
+# 테이블별 (키 컬럼, JSONB 컬럼, blob 컬럼, encoding 컬럼)
+# service_bot_responses는 파티션 테이블이라 UPDATE에 파티션 키(timestamp)까지 지정한다.
+RECOMPRESS_TARGETS: Dict[str, Dict[str, Any]] = {
+    "service_bot_responses": {
+        "keys": ("id", "timestamp"),
+        "json": "content",
+        "blob": "content_blob",
+        "encoding": "content_encoding",
+    },
+    "service_payloads": {
+        "keys": ("hash",),
+        "json": "data",
+        "blob": "data_blob",
+        "encoding": "data_encoding",
+    },
+}
+
+
+class Recompressor:
+    """저장된 JSON 컬럼을 목표 encoding으로 다시 쓰기
+
+    - 키 순서(keyset)로 batch_size개씩 읽어 배치마다 별도 트랜잭션으로 커밋
+    - 이미 목표 encoding인 행은 건너뛰므로 중단 후 다시 실행해도 처음부터 안전하게 이어짐
+    - 다른 트랜잭션이 잠근 행은 SKIP LOCKED로 건너뛰고 다음 실행에서 처리
+    """
+
+    def __init__(self, db: DatabaseConnection = db_connection, codec: Optional[ContentCodec] = None):
+        self.db = db
+        self.codec = codec or ContentCodec()
+
+    def _decode(self, target: Dict[str, Any], row: Dict[str, Any]) -> str:
+        if row[target["encoding"]]:
+            return self.codec.decode(row[target["blob"]], row[target["encoding"]])
+        value = row[target["json"]]
+        return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def _select_sql(self, table: str, after_key: bool) -> sql.Composed:
+        """목표 encoding이 아닌 다음 배치 조회 (after_key면 마지막 키 이후부터)"""
+        target = RECOMPRESS_TARGETS[table]
+        keys = sql.SQL(", ").join(sql.Identifier(k) for k in target["keys"])
+        lower_bound = sql.SQL("AND ({}) > ({})").format(
+            keys, sql.SQL(", ").join(sql.Placeholder() for _ in target["keys"])
+        ) if after_key else sql.SQL("")
+        return sql.SQL("""
+            SELECT {keys}, {json_col}, {blob_col}, {enc_col},
+                   COALESCE(octet_length({blob_col}), pg_column_size({json_col})) AS stored_bytes
+            FROM {table}
+            WHERE {enc_col} IS DISTINCT FROM %s
+              {lower_bound}
+            ORDER BY {keys}
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        """).format(
+            keys=keys,
+            json_col=sql.Identifier(target["json"]),
+            blob_col=sql.Identifier(target["blob"]),
+            enc_col=sql.Identifier(target["encoding"]),
+            table=sql.Identifier(table),
+            lower_bound=lower_bound,
+        )
+
+    def recompress_table(self, table: str, batch_size: int = 500,
+                         time_budget: Optional[float] = None) -> Dict[str, Any]:
+        """테이블 하나를 batch_size개씩 다시 압축하고 진행 결과 반환"""
+        target = RECOMPRESS_TARGETS[table]
+        keys = [sql.Identifier(k) for k in target["keys"]]
+        json_col, blob_col, enc_col = (sql.Identifier(target[c]) for c in ("json", "blob", "encoding"))
+        started = time.monotonic()
+        progress = {
+            "table": table,
+            "encoding": self.codec.encoding or "none",
+            "batches": 0,
+            "rows": 0,
+            "bytes_before": 0,
+            "bytes_after": 0,
+            "done": False,
+        }
+        last_key: Optional[List[Any]] = None
+
+        update_sql = sql.SQL("""
+            UPDATE {table} t
+            SET {json_col} = v.json_value::jsonb, {blob_col} = v.blob::bytea, {enc_col} = v.encoding
+            FROM (VALUES %s) AS v({key_names}, json_value, blob, encoding)
+            WHERE {key_match}
+        """).format(
+            table=sql.Identifier(table), json_col=json_col, blob_col=blob_col, enc_col=enc_col,
+            key_names=sql.SQL(", ").join(keys),
+            key_match=sql.SQL(" AND ").join(
+                sql.SQL("t.{0} = v.{0}").format(k) for k in keys
+            ),
+        )
+
+        while True:
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                break
+
+            with self.db.get_connection() as conn:
+                try:
+                    with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                        cursor.execute(self._select_sql(table, after_key=last_key is not None),
+                                       (self.codec.encoding, *(last_key or []), batch_size))
+                        rows = cursor.fetchall()
+                        if not rows:
+                            conn.rollback()
+                            progress["done"] = True
+                            break
+
+                        values = []
+                        for row in rows:
+                            text = self._decode(target, row)
+                            blob, encoding = self.codec.encode(text)
+                            values.append((
+                                *(row[k] for k in target["keys"]),
+                                text if blob is None else None,
+                                psycopg2.Binary(blob) if blob is not None else None,
+                                encoding,
+                            ))
+                            progress["bytes_before"] += row["stored_bytes"] or 0
+                            progress["bytes_after"] += len(blob) if blob is not None else len(text.encode("utf-8"))
+
+                        psycopg2.extras.execute_values(cursor, update_sql, values, page_size=len(values))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+
+            progress["batches"] += 1
+            progress["rows"] += len(rows)
+            last_key = [rows[-1][k] for k in target["keys"]]
+            logger.info(f"Recompressed {progress['rows']} rows of {table} "
+                        f"({progress['bytes_before']} → {progress['bytes_after']} bytes)")
+
+            if len(rows) < batch_size:
+                progress["done"] = True
+                break
+
+        progress["elapsed_seconds"] = round(time.monotonic() - started, 3)
+        return progress
+
+    def recompress(self, tables: Optional[List[str]] = None, batch_size: int = 500,
+                   time_budget: Optional[float] = None) -> List[Dict[str, Any]]:
+        """지정한 테이블(기본: 전체)을 순서대로 다시 압축"""
+        return [
+            self.recompress_table(table, batch_size=batch_size, time_budget=time_budget)
+            for table in (tables or list(RECOMPRESS_TARGETS))
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations.recompress")
+    parser.add_argument("--encoding", default=settings.CHAT_CONTENT_COMPRESSION,
+                        help="목표 encoding: zstd | zlib | none (기본: CHAT_CONTENT_COMPRESSION)")
+    parser.add_argument("--table", choices=list(RECOMPRESS_TARGETS), action="append",
+                        help="대상 테이블 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--time-budget", type=float, default=None, help="최대 실행 시간(초)")
+    args = parser.parse_args(argv)
+
+    recompressor = Recompressor(codec=ContentCodec(encoding=args.encoding))
+    for result in recompressor.recompress(args.table, batch_size=args.batch_size, time_budget=args.time_budget):
+        print(f"{result['table']:<24} {result['rows']} rows, {result['bytes_before']} → {result['bytes_after']} bytes "
+              f"({result['encoding']}, done={result['done']})")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
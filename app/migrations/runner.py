@@ -0,0 +1,179 @@
+"""
+Migration runner - Applies versioned SQL migrations and records them in schema_migrations
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psycopg2
+
+from app.database import DatabaseConnection, db_connection
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent / "versions"
+
+# 0001_initial_schema.sql 형식
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+# 파일 첫 줄에 이 지시어가 있으면 트랜잭션 밖에서 문장 단위로 실행 (CREATE INDEX CONCURRENTLY 등)
+NO_TRANSACTION_DIRECTIVE = "-- migrate: no-transaction"
+
+# 여러 프로세스가 동시에 마이그레이션을 실행하지 않도록 하는 advisory lock 키
+MIGRATION_LOCK_KEY = 72_031_004
+
+
+@dataclass
+class Migration:
+    """버전이 매겨진 SQL 마이그레이션 파일"""
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+    @property
+    def transactional(self) -> bool:
+        return not self.sql.lstrip().startswith(NO_TRANSACTION_DIRECTIVE)
+
+    def statements(self) -> List[str]:
+        """no-transaction 마이그레이션용 문장 분리 (줄 끝의 ';' 기준, 주석 줄 제외)"""
+        statements, current = [], []
+        for line in self.sql.splitlines():
+            if not current and (not line.strip() or line.strip().startswith("--")):
+                continue
+            current.append(line)
+            if line.rstrip().endswith(";"):
+                statements.append("\n".join(current).strip())
+                current = []
+        if current and "\n".join(current).strip():
+            statements.append("\n".join(current).strip())
+        return statements
+
+
+class MigrationRunner:
+    """versions/ 디렉토리의 마이그레이션을 순서대로 적용"""
+
+    def __init__(self, db: DatabaseConnection = db_connection, migrations_dir: Path = MIGRATIONS_DIR):
+        self.db = db
+        self.migrations_dir = migrations_dir
+
+    def discover(self) -> List[Migration]:
+        """마이그레이션 파일 목록 (버전 순)"""
+        migrations = []
+        for path in sorted(self.migrations_dir.glob("*.sql")):
+            match = MIGRATION_FILE_PATTERN.match(path.name)
+            if not match:
+                logger.warning(f"Ignoring migration file with unexpected name: {path.name}")
+                continue
+            migrations.append(Migration(version=int(match.group(1)), name=match.group(2), path=path))
+
+        versions = [m.version for m in migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError(f"Duplicate migration versions in {self.migrations_dir}")
+        return migrations
+
+    def _ensure_table(self, cursor) -> None:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum VARCHAR(64) NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def _applied(self, cursor) -> Dict[int, str]:
+        cursor.execute("SELECT version, checksum FROM schema_migrations ORDER BY version")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def status(self) -> List[Dict]:
+        """각 마이그레이션의 적용 여부 조회"""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._ensure_table(cursor)
+                applied = self._applied(cursor)
+            conn.commit()
+
+        return [
+            {
+                "version": m.version,
+                "name": m.name,
+                "applied": m.version in applied,
+                "checksum_mismatch": m.version in applied and applied[m.version] != m.checksum
+            }
+            for m in self.discover()
+        ]
+
+    def migrate(self, target: Optional[int] = None) -> List[Migration]:
+        """적용되지 않은 마이그레이션을 target 버전까지 순서대로 적용"""
+        migrations = self.discover()
+        applied_now: List[Migration] = []
+
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self._ensure_table(cursor)
+                conn.commit()
+
+                cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+                conn.commit()
+                try:
+                    applied = self._applied(cursor)
+                    conn.commit()
+
+                    for migration in migrations:
+                        if target is not None and migration.version > target:
+                            break
+                        if migration.version in applied:
+                            if applied[migration.version] != migration.checksum:
+                                logger.warning(
+                                    f"Migration {migration.version:04d}_{migration.name} changed after it was applied"
+                                )
+                            continue
+
+                        logger.info(f"Applying migration {migration.version:04d}_{migration.name}")
+                        self._apply(conn, cursor, migration)
+                        applied_now.append(migration)
+                finally:
+                    conn.rollback()
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+                    conn.commit()
+
+        return applied_now
+
+    def _apply(self, conn, cursor, migration: Migration) -> None:
+        try:
+            if migration.transactional:
+                cursor.execute(migration.sql)
+            else:
+                conn.autocommit = True
+                try:
+                    for statement in migration.statements():
+                        cursor.execute(statement)
+                finally:
+                    conn.autocommit = False
+
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (migration.version, migration.name, migration.checksum)
+            )
+            conn.commit()
+        except psycopg2.Error as e:
+            conn.rollback()
+            logger.error(f"Migration {migration.version:04d}_{migration.name} failed: {e}")
+            raise
+
+
+def run_migrations(target: Optional[int] = None) -> List[Migration]:
+    """기본 DB 연결로 마이그레이션 실행"""
+    return MigrationRunner().migrate(target)
@@ -0,0 +1,43 @@
+-- migrate: no-transaction
+-- 저장소(app/repositories) 쿼리별 보조 인덱스
+-- 운영 중 테이블 쓰기를 막지 않도록 CONCURRENTLY로 생성한다.
+
+-- service_chatrooms: 유저별 채팅방 목록/통계 (WHERE user_id = %s AND is_deleted = ...)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chatrooms_user_id_is_deleted
+    ON service_chatrooms (user_id, is_deleted);
+
+-- service_chatrooms: 오래된 삭제 채팅방 정리 (WHERE is_deleted = TRUE AND deleted_at < ...)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chatrooms_deleted_at
+    ON service_chatrooms (deleted_at)
+    WHERE is_deleted = TRUE;
+
+-- service_messages: 채팅방 메시지 조회 (WHERE chatroom_id = %s ORDER BY timestamp)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_chatroom_id_timestamp
+    ON service_messages (chatroom_id, timestamp);
+
+-- service_bot_responses: 채팅방 응답 조회 (WHERE chatroom_id = %s ORDER BY timestamp)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bot_responses_chatroom_id_timestamp
+    ON service_bot_responses (chatroom_id, timestamp);
+
+-- service_chat_histories: 히스토리 조회/채팅방 목록 집계 (WHERE chatroom_id = %s ORDER BY response_time)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_histories_chatroom_id_response_time
+    ON service_chat_histories (chatroom_id, response_time);
+
+-- service_user_storage: 세션 조회/갱신/삭제 (WHERE session_id = %s)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_storage_session_id
+    ON service_user_storage (session_id);
+
+-- service_user_storage: 유저별 활성 세션 (WHERE user_id = %s AND is_active = TRUE ORDER BY created_at DESC)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_storage_user_id_created_at
+    ON service_user_storage (user_id, created_at DESC)
+    WHERE is_active = TRUE;
+
+-- service_user_storage: 만료 세션 정리/활성 세션 수 (WHERE is_active = TRUE AND expires_at ...)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_storage_expires_at
+    ON service_user_storage (expires_at)
+    WHERE is_active = TRUE;
+
+-- service_users: 활성 유저 목록 (WHERE is_active = TRUE ORDER BY created_at DESC)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_created_at
+    ON service_users (created_at DESC)
+    WHERE is_active = TRUE;
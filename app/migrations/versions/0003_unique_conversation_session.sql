@@ -0,0 +1,11 @@
+-- service_conversation_sessions: (chatroom_id, user_id)당 세션은 하나
+-- 기존 중복 행은 가장 최근 버전(가장 큰 id)만 남기고 정리한 뒤 제약조건을 추가한다.
+
+DELETE FROM service_conversation_sessions s
+USING service_conversation_sessions newer
+WHERE s.chatroom_id = newer.chatroom_id
+  AND s.user_id = newer.user_id
+  AND s.id < newer.id;
+
+ALTER TABLE service_conversation_sessions
+    ADD CONSTRAINT uq_conversation_sessions_chatroom_user UNIQUE (chatroom_id, user_id);
@@ -0,0 +1,9 @@
+-- migrate: no-transaction
+-- 채팅방 히스토리 키셋 페이지네이션
+-- (WHERE chatroom_id = %s AND (response_time, id) < (...) ORDER BY response_time DESC, id DESC LIMIT %s)
+-- id까지 포함해야 같은 response_time을 가진 행 사이에서도 정렬 없이 인덱스 순서대로 읽는다.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_histories_chatroom_id_response_time_id
+    ON service_chat_histories (chatroom_id, response_time, id);
+
+-- 새 인덱스가 (chatroom_id, response_time) 조회도 처리하므로 기존 인덱스 제거
+DROP INDEX CONCURRENTLY IF EXISTS idx_chat_histories_chatroom_id_response_time;
@@ -0,0 +1,109 @@
+-- 채팅방 목록용 활동 요약 (message_count, last_activity)
+-- 채팅방 목록을 불러올 때마다 service_chat_histories를 COUNT/MAX로 집계하지 않도록
+-- 히스토리 INSERT/UPDATE/DELETE 트리거가 같은 트랜잭션 안에서 요약 값을 갱신한다.
+
+ALTER TABLE service_chatrooms
+    ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS last_activity TIMESTAMP NULL;
+
+-- 지정한 채팅방들의 요약 값을 히스토리에서 다시 계산 (트리거의 DELETE/UPDATE 경로와 정합성 복구에 사용)
+CREATE OR REPLACE FUNCTION service_refresh_chatroom_activity(room_ids INTEGER[]) RETURNS VOID AS $$
+BEGIN
+    UPDATE service_chatrooms c
+    SET message_count = COALESCE(s.message_count, 0),
+        last_activity = s.last_activity
+    FROM (
+        SELECT r.id AS chatroom_id,
+               (SELECT COUNT(*) FROM service_chat_histories ch WHERE ch.chatroom_id = r.id) AS message_count,
+               (SELECT MAX(ch.response_time) FROM service_chat_histories ch WHERE ch.chatroom_id = r.id) AS last_activity
+        FROM unnest(room_ids) AS r(id)
+    ) s
+    WHERE c.id = s.chatroom_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- INSERT: 문장 단위로 채팅방별 증가분만 반영 (배치 INSERT도 채팅방당 UPDATE 한 번)
+CREATE OR REPLACE FUNCTION service_chat_histories_after_insert() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE service_chatrooms c
+    SET message_count = c.message_count + n.added,
+        last_activity = GREATEST(c.last_activity, n.max_response_time)
+    FROM (
+        SELECT chatroom_id, COUNT(*) AS added, MAX(response_time) AS max_response_time
+        FROM new_rows
+        GROUP BY chatroom_id
+    ) n
+    WHERE c.id = n.chatroom_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- DELETE: 개수는 차감, last_activity는 최신 행이 지워진 채팅방만 다시 계산
+CREATE OR REPLACE FUNCTION service_chat_histories_after_delete() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE service_chatrooms c
+    SET message_count = GREATEST(c.message_count - d.removed, 0)
+    FROM (
+        SELECT chatroom_id, COUNT(*) AS removed
+        FROM old_rows
+        GROUP BY chatroom_id
+    ) d
+    WHERE c.id = d.chatroom_id;
+
+    PERFORM service_refresh_chatroom_activity(ARRAY(
+        SELECT DISTINCT o.chatroom_id
+        FROM old_rows o
+        JOIN service_chatrooms c ON c.id = o.chatroom_id
+        WHERE o.response_time >= c.last_activity
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- UPDATE: chatroom_id나 response_time이 바뀐 행의 채팅방만 다시 계산
+CREATE OR REPLACE FUNCTION service_chat_histories_after_update() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM service_refresh_chatroom_activity(ARRAY(
+        SELECT o.chatroom_id
+        FROM old_rows o JOIN new_rows n ON n.id = o.id
+        WHERE n.chatroom_id IS DISTINCT FROM o.chatroom_id
+           OR n.response_time IS DISTINCT FROM o.response_time
+        UNION
+        SELECT n.chatroom_id
+        FROM old_rows o JOIN new_rows n ON n.id = o.id
+        WHERE n.chatroom_id IS DISTINCT FROM o.chatroom_id
+           OR n.response_time IS DISTINCT FROM o.response_time
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 트리거를 먼저 만들어 히스토리 테이블을 잠근 뒤 백필해야 그 사이 INSERT가 누락되지 않는다.
+DROP TRIGGER IF EXISTS trg_chat_histories_activity_insert ON service_chat_histories;
+CREATE TRIGGER trg_chat_histories_activity_insert
+    AFTER INSERT ON service_chat_histories
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_chat_histories_after_insert();
+
+DROP TRIGGER IF EXISTS trg_chat_histories_activity_delete ON service_chat_histories;
+CREATE TRIGGER trg_chat_histories_activity_delete
+    AFTER DELETE ON service_chat_histories
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_chat_histories_after_delete();
+
+DROP TRIGGER IF EXISTS trg_chat_histories_activity_update ON service_chat_histories;
+CREATE TRIGGER trg_chat_histories_activity_update
+    AFTER UPDATE ON service_chat_histories
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_chat_histories_after_update();
+
+-- 기존 데이터 1회 백필
+UPDATE service_chatrooms c
+SET message_count = s.message_count,
+    last_activity = s.last_activity
+FROM (
+    SELECT chatroom_id, COUNT(*) AS message_count, MAX(response_time) AS last_activity
+    FROM service_chat_histories
+    GROUP BY chatroom_id
+) s
+WHERE c.id = s.chatroom_id;
@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- 채팅방 목록 조회 (WHERE user_id = %s AND is_deleted = FALSE ORDER BY COALESCE(last_activity, updated_at) DESC)
+-- 정렬 키까지 인덱스에 포함해 채팅방 목록을 정렬 없이 인덱스 순서대로 읽는다.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chatrooms_user_id_activity
+    ON service_chatrooms (user_id, (COALESCE(last_activity, updated_at)) DESC)
+    WHERE is_deleted = FALSE;
@@ -0,0 +1,134 @@
+-- service_chat_histories / service_bot_responses 월별 범위 파티셔닝
+-- (response_time / timestamp 기준, 파티션 이름은 <table>_pYYYYMM, 범위 밖의 행은 <table>_default)
+--
+-- 기존 테이블을 이름만 바꿔 두고 파티션 테이블을 새로 만든 뒤 데이터를 옮긴다.
+-- 한 트랜잭션에서 실행되며 옮기는 동안 두 테이블에 대한 쓰기는 대기한다.
+-- PG17 이전에는 파티션 테이블에 identity 컬럼을 쓸 수 없으므로 컬럼이 소유한 시퀀스를 사용하고,
+-- 기본 키는 파티션 키를 포함해야 하므로 (id, 시간)으로 바뀐다.
+
+-- parent의 from_month ~ to_month 월 파티션 생성 (이미 있으면 건너뜀), 생성한 개수 반환
+CREATE OR REPLACE FUNCTION service_ensure_monthly_partitions(parent TEXT, from_month DATE, to_month DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_month)::date;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= to_month LOOP
+        partition_name := parent || '_p' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                partition_name, parent, month_start, (month_start + INTERVAL '1 month')::date
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::date;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- 채팅 히스토리 -----------------------------------------------------------------
+
+ALTER TABLE service_chat_histories RENAME TO service_chat_histories_unpartitioned;
+ALTER TABLE service_chat_histories_unpartitioned ALTER COLUMN id DROP IDENTITY IF EXISTS;
+
+CREATE SEQUENCE service_chat_histories_id_seq AS INTEGER;
+
+CREATE TABLE service_chat_histories (
+    id INTEGER NOT NULL DEFAULT nextval('service_chat_histories_id_seq'),
+    chatroom_id INTEGER NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    user_message TEXT NOT NULL,
+    bot_response TEXT NOT NULL,
+    chat_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    response_time TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, response_time)
+) PARTITION BY RANGE (response_time);
+
+-- pg_get_serial_sequence('service_chat_histories', 'id')로 찾을 수 있도록 컬럼에 소속
+ALTER SEQUENCE service_chat_histories_id_seq OWNED BY service_chat_histories.id;
+
+CREATE TABLE service_chat_histories_default PARTITION OF service_chat_histories DEFAULT;
+
+SELECT service_ensure_monthly_partitions(
+    'service_chat_histories',
+    COALESCE((SELECT MIN(response_time) FROM service_chat_histories_unpartitioned), CURRENT_DATE)::date,
+    (CURRENT_DATE + INTERVAL '3 months')::date
+);
+
+-- 요약 컬럼(message_count/last_activity)은 이미 맞으므로 트리거는 데이터를 옮긴 뒤에 만든다.
+INSERT INTO service_chat_histories
+    (id, chatroom_id, user_id, user_message, bot_response, chat_time, response_time, created_at)
+SELECT id, chatroom_id, user_id, user_message, bot_response, chat_time,
+       COALESCE(response_time, created_at, CURRENT_TIMESTAMP), created_at
+FROM service_chat_histories_unpartitioned;
+
+SELECT setval('service_chat_histories_id_seq',
+              COALESCE((SELECT MAX(id) FROM service_chat_histories), 0) + 1, false);
+
+DROP TABLE service_chat_histories_unpartitioned;
+
+CREATE INDEX idx_chat_histories_chatroom_id_response_time_id
+    ON service_chat_histories (chatroom_id, response_time, id);
+
+CREATE TRIGGER trg_chat_histories_activity_insert
+    AFTER INSERT ON service_chat_histories
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_chat_histories_after_insert();
+
+CREATE TRIGGER trg_chat_histories_activity_delete
+    AFTER DELETE ON service_chat_histories
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_chat_histories_after_delete();
+
+CREATE TRIGGER trg_chat_histories_activity_update
+    AFTER UPDATE ON service_chat_histories
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_chat_histories_after_update();
+
+
+-- 봇 응답 -----------------------------------------------------------------------
+
+ALTER TABLE service_bot_responses RENAME TO service_bot_responses_unpartitioned;
+ALTER TABLE service_bot_responses_unpartitioned ALTER COLUMN id DROP IDENTITY IF EXISTS;
+
+CREATE SEQUENCE service_bot_responses_id_seq AS INTEGER;
+
+CREATE TABLE service_bot_responses (
+    id INTEGER NOT NULL DEFAULT nextval('service_bot_responses_id_seq'),
+    message_id INTEGER NOT NULL,
+    chatroom_id INTEGER NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    content JSONB NOT NULL,
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+ALTER SEQUENCE service_bot_responses_id_seq OWNED BY service_bot_responses.id;
+
+CREATE TABLE service_bot_responses_default PARTITION OF service_bot_responses DEFAULT;
+
+SELECT service_ensure_monthly_partitions(
+    'service_bot_responses',
+    COALESCE((SELECT MIN(timestamp) FROM service_bot_responses_unpartitioned), CURRENT_DATE)::date,
+    (CURRENT_DATE + INTERVAL '3 months')::date
+);
+
+INSERT INTO service_bot_responses
+    (id, message_id, chatroom_id, user_id, content, timestamp, created_at)
+SELECT id, message_id, chatroom_id, user_id, content,
+       COALESCE(timestamp, created_at, CURRENT_TIMESTAMP), created_at
+FROM service_bot_responses_unpartitioned;
+
+SELECT setval('service_bot_responses_id_seq',
+              COALESCE((SELECT MAX(id) FROM service_bot_responses), 0) + 1, false);
+
+DROP TABLE service_bot_responses_unpartitioned;
+
+CREATE INDEX idx_bot_responses_chatroom_id_timestamp
+    ON service_bot_responses (chatroom_id, timestamp);
@@ -0,0 +1,63 @@
+-- 큰 real_data를 내용 주소 기반(service_payloads) 테이블로 분리
+-- 같은 데이터셋을 다시 요청해도 real_data는 sha256 해시당 한 번만 저장하고,
+-- service_bot_responses에는 real_data를 뺀 응답과 payload_hash만 남긴다.
+
+CREATE TABLE IF NOT EXISTS service_payloads (
+    hash CHAR(64) PRIMARY KEY,              -- real_data JSON bytes의 sha256 (hex)
+    data JSONB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    ref_count INTEGER NOT NULL DEFAULT 0,   -- 이 payload를 참조하는 service_bot_responses 행 수 (트리거가 관리)
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_referenced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- GC 대상 조회 (WHERE ref_count = 0 AND last_referenced_at < ...)
+CREATE INDEX IF NOT EXISTS idx_payloads_unreferenced
+    ON service_payloads (last_referenced_at)
+    WHERE ref_count = 0;
+
+ALTER TABLE service_bot_responses ADD COLUMN IF NOT EXISTS payload_hash CHAR(64) NULL;
+
+-- 참조 수는 문장 단위 트리거로 관리해 다중 행 INSERT/배치 DELETE도 해시당 UPDATE 한 번으로 반영
+CREATE OR REPLACE FUNCTION service_bot_responses_payload_after_insert() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE service_payloads p
+    SET ref_count = p.ref_count + n.added,
+        last_referenced_at = CURRENT_TIMESTAMP
+    FROM (
+        SELECT payload_hash, COUNT(*) AS added
+        FROM new_rows
+        WHERE payload_hash IS NOT NULL
+        GROUP BY payload_hash
+    ) n
+    WHERE p.hash = n.payload_hash;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION service_bot_responses_payload_after_delete() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE service_payloads p
+    SET ref_count = GREATEST(p.ref_count - d.removed, 0)
+    FROM (
+        SELECT payload_hash, COUNT(*) AS removed
+        FROM old_rows
+        WHERE payload_hash IS NOT NULL
+        GROUP BY payload_hash
+    ) d
+    WHERE p.hash = d.payload_hash;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_bot_responses_payload_insert ON service_bot_responses;
+CREATE TRIGGER trg_bot_responses_payload_insert
+    AFTER INSERT ON service_bot_responses
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_bot_responses_payload_after_insert();
+
+DROP TRIGGER IF EXISTS trg_bot_responses_payload_delete ON service_bot_responses;
+CREATE TRIGGER trg_bot_responses_payload_delete
+    AFTER DELETE ON service_bot_responses
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION service_bot_responses_payload_after_delete();
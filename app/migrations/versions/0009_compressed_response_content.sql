@@ -0,0 +1,26 @@
+-- 봇 응답 content / payload data의 압축 저장 (CHAT_CONTENT_COMPRESSION)
+-- 압축한 행은 JSONB 컬럼을 NULL로 두고 *_blob(bytea)과 *_encoding('zstd' | 'zlib')에 저장한다.
+-- *_encoding이 NULL인 행(이전 행, 압축을 끈 경우)은 기존 JSONB 컬럼을 그대로 읽는다.
+-- 기존 행은 python -m app.migrations.recompress로 배치 단위로 다시 압축한다.
+
+ALTER TABLE service_bot_responses
+    ALTER COLUMN content DROP NOT NULL,
+    ADD COLUMN IF NOT EXISTS content_blob BYTEA NULL,
+    ADD COLUMN IF NOT EXISTS content_encoding VARCHAR(16) NULL;
+
+ALTER TABLE service_bot_responses
+    ADD CONSTRAINT chk_bot_responses_content_present
+    CHECK (content IS NOT NULL OR (content_blob IS NOT NULL AND content_encoding IS NOT NULL));
+
+ALTER TABLE service_payloads
+    ALTER COLUMN data DROP NOT NULL,
+    ADD COLUMN IF NOT EXISTS data_blob BYTEA NULL,
+    ADD COLUMN IF NOT EXISTS data_encoding VARCHAR(16) NULL;
+
+ALTER TABLE service_payloads
+    ADD CONSTRAINT chk_payloads_data_present
+    CHECK (data IS NOT NULL OR (data_blob IS NOT NULL AND data_encoding IS NOT NULL));
+
+-- 이미 압축된 bytes를 TOAST가 다시 pglz로 압축하지 않도록 외부 저장만 사용
+ALTER TABLE service_bot_responses ALTER COLUMN content_blob SET STORAGE EXTERNAL;
+ALTER TABLE service_payloads ALTER COLUMN data_blob SET STORAGE EXTERNAL;
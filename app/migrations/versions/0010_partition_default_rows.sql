@@ -0,0 +1,89 @@
+-- service_ensure_monthly_partitions가 default 파티션에 이미 들어간 행을 새 월 파티션으로 옮기도록 변경
+--
+-- 월 파티션이 없는 동안 들어온 행은 <parent>_default에 쌓이고, 그 달 범위의 행이 default에 있으면
+-- CREATE TABLE ... PARTITION OF가 실패해 이후로도 파티션을 만들 수 없었다.
+-- 해당 월 행이 default에 있으면 default를 떼어낸(DETACH) 상태에서 파티션을 만들고,
+-- 행을 새 파티션으로 옮긴 뒤 default를 다시 붙인다(ATTACH). 모두 호출한 트랜잭션 안에서 실행된다.
+--
+-- 이동은 부모 테이블을 거치지 않고 떼어낸 default와 새 파티션에 직접 실행하므로
+-- 부모의 statement 트리거(채팅방 요약, payload ref_count)는 실행되지 않는다 (같은 행이 자리만 옮김).
+
+CREATE OR REPLACE FUNCTION service_ensure_monthly_partitions(parent TEXT, from_month DATE, to_month DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_month)::date;
+    month_end DATE;
+    partition_name TEXT;
+    default_name TEXT;
+    key_column TEXT;
+    columns TEXT;
+    has_rows BOOLEAN;
+    created INTEGER := 0;
+BEGIN
+    -- 부모에 붙어 있는 default 파티션과 파티션 키 컬럼
+    SELECT c.relname INTO default_name
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    JOIN pg_partitioned_table pt ON pt.partrelid = i.inhparent
+    WHERE i.inhparent = parent::regclass AND c.oid = pt.partdefid;
+
+    SELECT a.attname INTO key_column
+    FROM pg_partitioned_table pt
+    JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+    WHERE pt.partrelid = parent::regclass;
+
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO columns
+    FROM pg_attribute
+    WHERE attrelid = parent::regclass AND attnum > 0 AND NOT attisdropped;
+
+    WHILE month_start <= to_month LOOP
+        partition_name := parent || '_p' || to_char(month_start, 'YYYYMM');
+        month_end := (month_start + INTERVAL '1 month')::date;
+        IF to_regclass(partition_name) IS NULL THEN
+            has_rows := FALSE;
+            IF default_name IS NOT NULL THEN
+                EXECUTE format(
+                    'SELECT EXISTS (SELECT 1 FROM %I WHERE %I >= %L AND %I < %L)',
+                    default_name, key_column, month_start, key_column, month_end
+                ) INTO has_rows;
+            END IF;
+
+            IF has_rows THEN
+                EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, default_name);
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, parent, month_start, month_end
+                );
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING %s) '
+                    'INSERT INTO %I (%s) SELECT %s FROM moved',
+                    default_name, key_column, month_start, key_column, month_end, columns,
+                    partition_name, columns, columns
+                );
+                EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', parent, default_name);
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, parent, month_start, month_end
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 이미 default에 쌓인 행은 지금 바로 옮김 (default의 가장 오래된 달 ~ 3개월 뒤, PARTITION_MONTHS_AHEAD 기본값)
+SELECT service_ensure_monthly_partitions(
+    'service_chat_histories',
+    LEAST(COALESCE((SELECT MIN(response_time) FROM service_chat_histories_default), CURRENT_DATE)::date, CURRENT_DATE),
+    (CURRENT_DATE + INTERVAL '3 months')::date
+);
+
+SELECT service_ensure_monthly_partitions(
+    'service_bot_responses',
+    LEAST(COALESCE((SELECT MIN(timestamp) FROM service_bot_responses_default), CURRENT_DATE)::date, CURRENT_DATE),
+    (CURRENT_DATE + INTERVAL '3 months')::date
+);
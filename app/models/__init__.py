@@ -7,12 +7,16 @@ from .chat_models import (
     ChatHistory,
     Message,
     BotResponse,
+    ChatTurnRecord,
+    PendingChatTurn,
     ChatRequest,
     EditMessageRequest,
     UpdateChatRoomNameRequest,
     ChatRoomListItem,
     ChatRoomListResponse,
     ChatHistoryResponse,
+    ChatHistorySummary,
+    ChatHistoryPageResponse,
     ChatRoomDetailResponse
 )
 
@@ -31,12 +35,16 @@ __all__ = [
     "ChatHistory", 
     "Message",
     "BotResponse",
+    "ChatTurnRecord",
+    "PendingChatTurn",
     "ChatRequest",
     "EditMessageRequest",
     "UpdateChatRoomNameRequest",
     "ChatRoomListItem",
     "ChatRoomListResponse",
     "ChatHistoryResponse",
+    "ChatHistorySummary",
+    "ChatHistoryPageResponse",
     "ChatRoomDetailResponse",
     "UserInfo",
     "SSOLoginRequest",
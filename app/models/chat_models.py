@@ -4,7 +4,7 @@ Chat-related Pydantic models and schemas
 
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal, Union
 from fastapi import UploadFile
 
 
@@ -47,11 +47,36 @@ class BotResponse(BaseModel):
     timestamp: datetime
 
 
+# 채팅 턴 저장 결과 모델 (메시지 + 봇 응답 + 히스토리를 한 트랜잭션으로 저장)
+class ChatTurnRecord(BaseModel):
+    message_id: str
+    response_id: str
+    chat_id: int
+    chatroom_id: int
+    user_id: str
+    chat_time: datetime
+    response_time: datetime
+
+
+
+# write-behind 대기 중인 채팅 턴 (id는 미리 예약, content는 직렬화된 JSON)
+class PendingChatTurn(ChatTurnRecord):
+    user_message: str
+    data_type: str
+    content: str
+    history_response: str
+    payload: Optional[str] = None  # service_payloads로 분리한 real_data JSON (있으면 content에는 real_data 없음)
+
+
 # 요청 모델
 class ChatRequest(BaseModel):
     choice: str  # 'pcm', 'inline', 'rag', 'excel'
     message: str
     chatroom_id: int  # 정수로 변경
+    progress: bool = True  # False면 진행 메시지 프레임 없이 최종 응답만 스트리밍 (API 클라이언트용)
+    stream_rows: bool = False  # True면 real_data를 header/chunk/end 프레임으로 나눠 스트리밍
+    aggregate: Optional[Literal['box']] = None  # 'box'면 INLINE Trend real_data를 원본 행 대신 박스 통계로 보냄
+    real_data_format: Literal['records', 'columnar'] = 'records'  # 'columnar'면 real_data의 행 목록을 컬럼 배열 + constants로 보냄 (stream_rows 무시)
 
 
 # 메시지 수정 요청 모델 (새로 추가)
@@ -60,6 +85,10 @@ class EditMessageRequest(BaseModel):
     message: str
     chatroom_id: int
     original_chat_id: int  # 기존 chat_id
+    progress: bool = True  # /chat과 동일
+    stream_rows: bool = False  # /chat과 동일
+    aggregate: Optional[Literal['box']] = None  # /chat과 동일
+    real_data_format: Literal['records', 'columnar'] = 'records'  # /chat과 동일
 
 
 # 채팅방 이름 수정 요청 모델 (새로 추가)
@@ -86,6 +115,22 @@ class ChatHistoryResponse(BaseModel):
     count: int
 
 
+# 채팅 히스토리 경량 모델 (id와 시간만)
+class ChatHistorySummary(BaseModel):
+    chat_id: int
+    chat_time: datetime
+    response_time: datetime
+
+
+# 채팅방 히스토리 페이지 응답 모델 (response_time, id 기준 키셋 페이지네이션)
+class ChatHistoryPageResponse(BaseModel):
+    chatroom_id: int
+    recent_conversations: List[Union[ChatHistory, ChatHistorySummary]]
+    count: int
+    has_more: bool
+    next_cursor: Optional[str] = None  # 더 오래된 대화를 가져올 때 before로 전달
+
+
 # 채팅방 상세 응답 모델
 class ChatRoomDetailResponse(BaseModel):
     chatroom: ChatRoom
@@ -6,5 +6,16 @@ from .chat_storage import ChatStorage
 from .user_storage import UserStorage
 from .user_repository import UserRepository
 from .data_preservation import DataPreservation
+from .async_repositories import AsyncChatStorage, AsyncUserStorage, AsyncConversationSessionRepo
+from .write_behind import WriteBehindQueue
 
-__all__ = ["ChatStorage", "UserStorage", "UserRepository", "DataPreservation"]
+__all__ = [
+    "ChatStorage",
+    "UserStorage",
+    "UserRepository",
+    "DataPreservation",
+    "AsyncChatStorage",
+    "AsyncUserStorage",
+    "AsyncConversationSessionRepo",
+    "WriteBehindQueue"
+]
@@ -0,0 +1,59 @@
+"""
+Async repository adapters - Expose the PostgreSQL repositories to async code without blocking the event loop
+"""
+
+import functools
+from typing import Any, Optional
+
+from app.database import db_connection
+from app.repositories.chat_storage import ChatStorage
+from app.repositories.user_storage import UserStorage
+from app.repositories.conversation_session import ConversationSessionRepo
+
+
+class AsyncRepository:
+    """동기 저장소를 감싸 모든 메서드를 await 가능한 형태로 제공
+
+    메서드 시그니처는 원본 저장소와 동일하며, 실제 psycopg2 호출은
+    db_connection의 전용 스레드풀에서 실행되어 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, repository: Any):
+        self._repository = repository
+
+    @property
+    def sync(self) -> Any:
+        """원본 동기 저장소 (스레드/스크립트에서 직접 사용할 때)"""
+        return self._repository
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._repository, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def async_method(*args, **kwargs):
+            return await db_connection.run_in_executor(attr, *args, **kwargs)
+
+        return async_method
+
+
+class AsyncChatStorage(AsyncRepository):
+    """ChatStorage의 비동기 버전 (get_chatroom, add_message, add_chat_history, ...)"""
+
+    def __init__(self, storage: Optional[ChatStorage] = None):
+        super().__init__(storage or ChatStorage())
+
+
+class AsyncUserStorage(AsyncRepository):
+    """UserStorage의 비동기 버전 (create_session, get_session, delete_session, ...)"""
+
+    def __init__(self, storage: Optional[UserStorage] = None):
+        super().__init__(storage or UserStorage())
+
+
+class AsyncConversationSessionRepo(AsyncRepository):
+    """ConversationSessionRepo의 비동기 버전 (get_or_create, save)"""
+
+    def __init__(self, repo: Optional[ConversationSessionRepo] = None):
+        super().__init__(repo or ConversationSessionRepo())
@@ -2,22 +2,150 @@
 Chat storage repository - Handles all chat data persistence with PostgreSQL
 """
 
+import base64
+import hashlib
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Union
 import logging
 
+import psycopg2.extras
+
 from app.models import (
     ChatRoom, ChatHistory, Message, BotResponse,
-    ChatRoomListItem, ChatHistoryResponse
+    ChatRoomListItem, ChatHistoryResponse, ChatTurnRecord, PendingChatTurn,
+    ChatHistorySummary, ChatHistoryPageResponse
 )
+from app.config import settings
 from app.database import db_connection
+from app.repositories.content_codec import content_codec
 
 logger = logging.getLogger(__name__)
 
+# 이름 붙은 쿼리는 import 시점에 StatementRegistry에 등록하고 execute_registered로 실행한다.
+# app.migrations.plan_check가 같은 이름으로 등록된 SQL을 EXPLAIN하므로 검사 대상이 실제 쿼리와 어긋나지 않는다.
+db_connection.statements.register("chat_storage.get_all_chatrooms", """
+    SELECT
+        id,
+        name,
+        message_count,
+        COALESCE(last_activity, updated_at) as last_activity
+    FROM service_chatrooms
+    WHERE user_id = %s AND is_deleted = FALSE
+    ORDER BY COALESCE(last_activity, updated_at) DESC
+""")
+db_connection.statements.register("chat_storage.get_chatroom_history", """
+    SELECT id, chatroom_id, user_id, user_message,
+           bot_response, chat_time, response_time
+    FROM service_chat_histories
+    WHERE chatroom_id = %s
+      AND response_time >= COALESCE(%s::timestamp - INTERVAL '1 day', '-infinity')
+    ORDER BY response_time DESC
+""")
+db_connection.statements.register("chat_storage.get_messages_by_chatroom", """
+    SELECT id, chatroom_id, user_id, content, message_type, data_type, timestamp
+    FROM service_messages
+    WHERE chatroom_id = %s
+    ORDER BY timestamp ASC
+""")
+db_connection.statements.register("chat_storage.get_responses_by_chatroom", """
+    SELECT r.id, r.message_id, r.chatroom_id, r.user_id, r.timestamp,
+           r.content, r.content_blob, r.content_encoding, r.payload_hash,
+           p.data AS payload, p.data_blob AS payload_blob, p.data_encoding AS payload_encoding
+    FROM service_bot_responses r
+    LEFT JOIN service_payloads p ON p.hash = r.payload_hash
+    WHERE r.chatroom_id = %s
+      AND r.timestamp >= COALESCE((
+          SELECT created_at - INTERVAL '1 day' FROM service_chatrooms WHERE id = %s
+      ), '-infinity')
+    ORDER BY r.timestamp ASC
+""")
+# 히스토리 페이지 (response_time 범위 조건은 월별 파티션 프루닝용, ids_only면 본문 없이 id/시간만)
+_HISTORY_PAGE_SQL = """
+    SELECT {columns}
+    FROM service_chat_histories
+    WHERE chatroom_id = %s
+      AND (response_time, id) < (%s::timestamp, %s)
+      AND response_time <= %s::timestamp
+      AND response_time >= COALESCE(%s::timestamp - INTERVAL '1 day', '-infinity')
+    ORDER BY response_time DESC, id DESC
+    LIMIT %s
+"""
+db_connection.statements.register("chat_storage.get_chatroom_history_page", _HISTORY_PAGE_SQL.format(
+    columns="id, chatroom_id, user_id, user_message, bot_response, chat_time, response_time"))
+db_connection.statements.register("chat_storage.get_chatroom_history_page_ids", _HISTORY_PAGE_SQL.format(
+    columns="id, chat_time, response_time"))
+
+
+def encode_history_cursor(response_time: datetime, chat_id: int) -> str:
+    """히스토리 키셋 커서 생성 (response_time, id)"""
+    raw = f"{response_time.isoformat()}|{chat_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    """히스토리 키셋 커서 해석 (잘못된 커서는 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        time_part, id_part = base64.urlsafe_b64decode(padded.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(time_part), int(id_part)
+    except Exception as e:
+        raise ValueError(f"Invalid history cursor: {cursor}") from e
+
+
+def payload_digest(payload: str) -> str:
+    """real_data JSON 문자열의 내용 주소 (sha256 hex)"""
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def split_payload(content: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    """응답에서 큰 real_data를 분리 (CHAT_PAYLOAD_MIN_BYTES 이상이면 (real_data 제외 응답, real_data JSON))"""
+    if 'real_data' not in content:
+        return content, None
+    payload = json.dumps(content['real_data'])
+    if len(payload.encode('utf-8')) < settings.CHAT_PAYLOAD_MIN_BYTES:
+        return content, None
+    return {key: value for key, value in content.items() if key != 'real_data'}, payload
+
+
+def _load_json(value: Any) -> Any:
+    """JSONB 컬럼 값 (psycopg2가 이미 파싱했으면 그대로, 문자열이면 파싱)"""
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _encode_json_column(text: str) -> Tuple[Optional[str], Any, Optional[str]]:
+    """JSON 문자열 → (JSONB 값, 압축 blob, encoding)
+
+    CHAT_CONTENT_COMPRESSION이 켜져 있으면 JSONB 컬럼은 NULL로 두고 압축한 bytes를 저장한다.
+    """
+    blob, encoding = content_codec.encode(text)
+    if blob is None:
+        return text, None, None
+    return None, psycopg2.Binary(blob), encoding
+
+
+def _read_json_column(value: Any, blob: Any, encoding: Optional[str]) -> Any:
+    """압축 여부와 상관없이 JSON 컬럼 값 읽기 (encoding이 없는 이전 행은 JSONB 값을 그대로 사용)"""
+    if encoding:
+        return json.loads(content_codec.decode(blob, encoding))
+    return _load_json(value)
+
+
+def _assemble_content(row: Dict[str, Any]) -> Dict[str, Any]:
+    """봇 응답 행의 content를 풀고, service_payloads로 분리된 real_data를 다시 합침"""
+    content = _read_json_column(row['content'], row['content_blob'], row['content_encoding'])
+    if row['payload_hash'] is not None:
+        content = dict(content, real_data=_read_json_column(row['payload'], row['payload_blob'], row['payload_encoding']))
+    return content
+
 
 class ChatStorage:
-    """PostgreSQL 기반 채팅 저장소"""
+    """PostgreSQL 기반 채팅 저장소
+
+    큰 real_data는 service_payloads에 sha256 해시로 한 번만 저장하고 service_bot_responses에는
+    payload_hash만 남긴다. 참조 수(ref_count)는 service_bot_responses 트리거가 관리하고,
+    참조가 없어진 payload는 DataPreservation.collect_unreferenced_payloads가 정리한다.
+    """
     
     def __init__(self):
         pass
@@ -26,7 +154,7 @@ class ChatStorage:
         """새 채팅방 생성"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "chat_storage.create_chatroom", """
                     INSERT INTO service_chatrooms (name, user_id, updated_at) 
                     VALUES (%s, %s, CURRENT_TIMESTAMP) 
                     RETURNING id, name, user_id, created_at, updated_at
@@ -48,7 +176,7 @@ class ChatStorage:
         """채팅방 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "chat_storage.get_chatroom", """
                     SELECT id, name, user_id, created_at, updated_at 
                     FROM service_chatrooms 
                     WHERE id = %s AND is_deleted = FALSE
@@ -70,20 +198,8 @@ class ChatStorage:
         """특정 유저의 모든 채팅방 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT 
-                        c.id,
-                        c.name,
-                        c.created_at,
-                        c.updated_at,
-                        COUNT(ch.id) as message_count,
-                        COALESCE(MAX(ch.response_time), c.updated_at) as last_activity
-                    FROM service_chatrooms c
-                    LEFT JOIN service_chat_histories ch ON c.id = ch.chatroom_id
-                    WHERE c.user_id = %s AND c.is_deleted = FALSE
-                    GROUP BY c.id, c.name, c.created_at, c.updated_at
-                    ORDER BY last_activity DESC
-                """, (user_id,))
+                # message_count / last_activity는 히스토리 트리거가 관리하는 요약 컬럼
+                db_connection.statements.execute_registered(cursor, "chat_storage.get_all_chatrooms", (user_id,))
                 
                 results = cursor.fetchall()
                 chatrooms = []
@@ -108,22 +224,16 @@ class ChatStorage:
         try:
             with db_connection.get_cursor() as cursor:
                 # 유저 권한 확인
-                cursor.execute("""
-                    SELECT user_id FROM service_chatrooms WHERE id = %s AND is_deleted = FALSE
+                db_connection.statements.execute(cursor, "chat_storage.get_chatroom_owner", """
+                    SELECT user_id, created_at FROM service_chatrooms WHERE id = %s AND is_deleted = FALSE
                 """, (chatroom_id,))
                 
                 result = cursor.fetchone()
                 if not result or result['user_id'] != user_id:
                     return None
                 
-                # 채팅 히스토리 조회
-                cursor.execute("""
-                    SELECT id, chatroom_id, user_id, user_message, 
-                           bot_response, chat_time, response_time
-                    FROM service_chat_histories 
-                    WHERE chatroom_id = %s 
-                    ORDER BY response_time DESC
-                """, (chatroom_id,))
+                # 채팅 히스토리 조회 (채팅방 생성 이전 월 파티션은 건너뜀, 서버 시계 차이를 고려해 하루 여유)
+                db_connection.statements.execute_registered(cursor, "chat_storage.get_chatroom_history", (chatroom_id, result['created_at']))
                 
                 results = cursor.fetchall()
                 histories = []
@@ -149,13 +259,84 @@ class ChatStorage:
             logger.error(f"Failed to get chatroom history {chatroom_id}: {e}")
             return None
     
+    def get_chatroom_history_page(self, chatroom_id: int, user_id: str, limit: int,
+                                  before: Optional[str] = None, ids_only: bool = False) -> Optional[ChatHistoryPageResponse]:
+        """채팅방 히스토리 페이지 조회 (최신순, response_time/id 키셋 페이지네이션)
+
+        before에는 이전 페이지의 next_cursor를 전달하며, 그보다 오래된 대화만 반환한다.
+        ids_only이면 메시지 본문 없이 id와 시간만 조회한다.
+        """
+        # 커서가 없으면 가장 최근부터 ('infinity'보다 작은 모든 행)
+        before_time, before_id = decode_history_cursor(before) if before else ('infinity', 0)
+        
+        try:
+            with db_connection.get_cursor() as cursor:
+                # 유저 권한 확인
+                db_connection.statements.execute(cursor, "chat_storage.get_chatroom_owner", """
+                    SELECT user_id, created_at FROM service_chatrooms WHERE id = %s AND is_deleted = FALSE
+                """, (chatroom_id,))
+                
+                result = cursor.fetchone()
+                if not result or result['user_id'] != user_id:
+                    return None
+                
+                # 한 행 더 조회해서 다음 페이지 존재 여부 판단
+                # response_time 범위 조건(커서 이전 ~ 채팅방 생성 하루 전)은 월별 파티션 프루닝용
+                statement = "chat_storage.get_chatroom_history_page_ids" if ids_only else "chat_storage.get_chatroom_history_page"
+                db_connection.statements.execute_registered(
+                    cursor, statement,
+                    (chatroom_id, before_time, before_id, before_time, result['created_at'], limit + 1)
+                )
+                
+                results = cursor.fetchall()
+                has_more = len(results) > limit
+                rows = results[:limit]
+                
+                if ids_only:
+                    histories = [
+                        ChatHistorySummary(
+                            chat_id=row['id'],
+                            chat_time=row['chat_time'],
+                            response_time=row['response_time']
+                        )
+                        for row in rows
+                    ]
+                else:
+                    histories = [
+                        ChatHistory(
+                            chat_id=row['id'],  # id를 chat_id로 매핑
+                            chatroom_id=row['chatroom_id'],
+                            user_id=row['user_id'],
+                            user_message=row['user_message'],
+                            chat_time=row['chat_time'],
+                            bot_response=row['bot_response'],
+                            response_time=row['response_time']
+                        )
+                        for row in rows
+                    ]
+                
+                next_cursor = None
+                if has_more and rows:
+                    next_cursor = encode_history_cursor(rows[-1]['response_time'], rows[-1]['id'])
+                
+                return ChatHistoryPageResponse(
+                    chatroom_id=chatroom_id,
+                    recent_conversations=histories,
+                    count=len(histories),
+                    has_more=has_more,
+                    next_cursor=next_cursor
+                )
+        except Exception as e:
+            logger.error(f"Failed to get chatroom history page {chatroom_id}: {e}")
+            return None
+    
     def delete_chatroom(self, chatroom_id: int, user_id: str) -> bool:
         """채팅방 삭제 (soft delete - 연관 데이터 보존)"""
         try:
             with db_connection.get_cursor() as cursor:
                 # 유저 권한 확인
-                cursor.execute("""
-                    SELECT user_id FROM service_chatrooms WHERE id = %s AND is_deleted = FALSE
+                db_connection.statements.execute(cursor, "chat_storage.get_chatroom_owner", """
+                    SELECT user_id, created_at FROM service_chatrooms WHERE id = %s AND is_deleted = FALSE
                 """, (chatroom_id,))
                 
                 result = cursor.fetchone()
@@ -163,7 +344,7 @@ class ChatStorage:
                     return False
                 
                 # Soft delete - 채팅방만 삭제 표시, 연관 데이터는 보존
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "chat_storage.delete_chatroom", """
                     UPDATE service_chatrooms 
                     SET is_deleted = TRUE, deleted_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
                     WHERE id = %s
@@ -179,7 +360,7 @@ class ChatStorage:
         """메시지 추가"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "chat_storage.add_message", """
                     INSERT INTO service_messages (chatroom_id, user_id, content, message_type, data_type, timestamp)
                     VALUES (%s, %s, %s, %s, %s, %s)
                     RETURNING id, chatroom_id, user_id, content, message_type, data_type, timestamp
@@ -209,7 +390,7 @@ class ChatStorage:
             bot_response_time = response_time if response_time else datetime.now()
             
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "chat_storage.add_chat_history", """
                     INSERT INTO service_chat_histories (chatroom_id, user_id, user_message, bot_response, chat_time, response_time)
                     VALUES (%s, %s, %s, %s, %s, %s)
                     RETURNING id, chatroom_id, user_id, user_message, bot_response, chat_time, response_time
@@ -236,7 +417,7 @@ class ChatStorage:
         """채팅 히스토리 수정"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "chat_storage.edit_chat_history", """
                     UPDATE service_chat_histories 
                     SET user_message = %s, bot_response = %s, 
                         chat_time = CURRENT_TIMESTAMP, response_time = CURRENT_TIMESTAMP
@@ -268,12 +449,7 @@ class ChatStorage:
         """채팅방의 메시지 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, chatroom_id, user_id, content, message_type, data_type, timestamp
-                    FROM service_messages 
-                    WHERE chatroom_id = %s 
-                    ORDER BY timestamp ASC
-                """, (chatroom_id,))
+                db_connection.statements.execute_registered(cursor, "chat_storage.get_messages_by_chatroom", (chatroom_id,))
                 
                 results = cursor.fetchall()
                 messages = []
@@ -295,15 +471,39 @@ class ChatStorage:
             logger.error(f"Failed to get messages for chatroom {chatroom_id}: {e}")
             return []
     
+    def _upsert_payloads(self, cursor, payloads: Dict[str, str]) -> None:
+        """payload 저장 (이미 있는 해시는 data를 다시 쓰지 않고 last_referenced_at만 갱신)
+
+        DO UPDATE로 행 잠금을 잡아 같은 트랜잭션이 끝날 때까지 GC가 이 payload를 지우지 못하게 한다.
+        ref_count 증가는 service_bot_responses INSERT 트리거가 처리한다.
+        """
+        if not payloads:
+            return
+        # 동시 배치끼리 잠금 순서를 맞추기 위해 해시 순으로 저장
+        rows = [
+            (digest, *_encode_json_column(payload), len(payload.encode('utf-8')))
+            for digest, payload in sorted(payloads.items())
+        ]
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO service_payloads (hash, data, data_blob, data_encoding, size_bytes) VALUES %s
+            ON CONFLICT (hash) DO UPDATE SET last_referenced_at = CURRENT_TIMESTAMP
+        """, rows, page_size=len(rows))
+    
     def add_response(self, message_id: str, chatroom_id: int, user_id: str, content: Dict[str, Any]) -> BotResponse:
-        """봇 응답 추가"""
+        """봇 응답 추가 (큰 real_data는 service_payloads로 분리)"""
         try:
+            stored_content, payload = split_payload(content)
+            payload_hash = payload_digest(payload) if payload is not None else None
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO service_bot_responses (message_id, chatroom_id, user_id, content, timestamp)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id, message_id, chatroom_id, user_id, content, timestamp
-                """, (int(message_id), chatroom_id, user_id, json.dumps(content), datetime.now()))
+                if payload is not None:
+                    self._upsert_payloads(cursor, {payload_hash: payload})
+                db_connection.statements.execute(cursor, "chat_storage.add_response", """
+                    INSERT INTO service_bot_responses
+                        (message_id, chatroom_id, user_id, content, content_blob, content_encoding, payload_hash, timestamp)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id, message_id, chatroom_id, user_id, timestamp
+                """, (int(message_id), chatroom_id, user_id, *_encode_json_column(json.dumps(stored_content)),
+                      payload_hash, datetime.now()))
                 
                 result = cursor.fetchone()
                 response = BotResponse(
@@ -311,7 +511,7 @@ class ChatStorage:
                     message_id=str(result['message_id']),
                     chatroom_id=result['chatroom_id'],
                     user_id=result['user_id'],
-                    content=json.loads(result['content']),
+                    content=content,
                     timestamp=result['timestamp']
                 )
                 logger.info(f"Added bot response {result['id']} to chatroom {chatroom_id}")
@@ -320,16 +520,199 @@ class ChatStorage:
             logger.error(f"Failed to add bot response: {e}")
             raise
     
+    def save_turn(self, chatroom_id: int, user_id: str, user_message: str, data_type: str,
+                  content: Union[Dict[str, Any], str], history_response: str,
+                  user_time: datetime = None, response_time: datetime = None,
+                  payload: Optional[str] = None) -> ChatTurnRecord:
+        """채팅 턴 저장 (메시지, 봇 응답, 히스토리를 한 트랜잭션/한 번의 왕복으로 저장)
+
+        content가 이미 직렬화된 JSON 문자열이면 그대로 저장한다.
+        payload(직렬화된 real_data)를 주면 content에는 real_data가 빠져 있어야 하며,
+        payload는 service_payloads에 해시로 저장되고 봇 응답은 payload_hash로 참조한다.
+
+        add_message → add_response → add_chat_history 를 각각 호출하면 연결과 트랜잭션이
+        세 번 필요하고, 중간에 실패하면 일부만 저장된 턴이 남는다.
+        데이터 변경 CTE로 세 행을 하나의 문장에서 삽입하고 생성된 id들을 반환한다.
+        """
+        try:
+            chat_time = user_time if user_time else datetime.now()
+            bot_response_time = response_time if response_time else datetime.now()
+            
+            payload_hash = payload_digest(payload) if payload is not None else None
+            
+            with db_connection.get_cursor() as cursor:
+                if payload is not None:
+                    self._upsert_payloads(cursor, {payload_hash: payload})
+                db_connection.statements.execute(cursor, "chat_storage.save_turn", """
+                    WITH new_message AS (
+                        INSERT INTO service_messages (chatroom_id, user_id, content, message_type, data_type, timestamp)
+                        VALUES (%s, %s, %s, 'user', %s, %s)
+                        RETURNING id, chatroom_id, user_id, content, timestamp
+                    ), new_response AS (
+                        INSERT INTO service_bot_responses
+                            (message_id, chatroom_id, user_id, content, content_blob, content_encoding, payload_hash, timestamp)
+                        SELECT m.id, m.chatroom_id, m.user_id, %s, %s, %s, %s, %s FROM new_message m
+                        RETURNING id
+                    ), new_history AS (
+                        INSERT INTO service_chat_histories (chatroom_id, user_id, user_message, bot_response, chat_time, response_time)
+                        SELECT m.chatroom_id, m.user_id, m.content, %s, m.timestamp, %s FROM new_message m
+                        RETURNING id, chat_time, response_time
+                    )
+                    SELECT m.id AS message_id, r.id AS response_id, h.id AS chat_id,
+                           m.chatroom_id, m.user_id, h.chat_time, h.response_time
+                    FROM new_message m, new_response r, new_history h
+                """, (chatroom_id, user_id, user_message, data_type, chat_time,
+                      *_encode_json_column(content if isinstance(content, str) else json.dumps(content)),
+                      payload_hash, bot_response_time,
+                      history_response, bot_response_time))
+                
+                result = cursor.fetchone()
+                turn = ChatTurnRecord(
+                    message_id=str(result['message_id']),
+                    response_id=str(result['response_id']),
+                    chat_id=result['chat_id'],
+                    chatroom_id=result['chatroom_id'],
+                    user_id=result['user_id'],
+                    chat_time=result['chat_time'],
+                    response_time=result['response_time']
+                )
+                logger.info(f"Saved chat turn (message {turn.message_id}, response {turn.response_id}, "
+                            f"history {turn.chat_id}) to chatroom {chatroom_id}")
+                return turn
+        except Exception as e:
+            logger.error(f"Failed to save chat turn: {e}")
+            raise
+    
+    def save_edit_turn(self, chatroom_id: int, chat_id: int, user_id: str, user_message: str, data_type: str,
+                       content: Union[Dict[str, Any], str], history_response: str,
+                       edit_time: datetime = None, payload: Optional[str] = None) -> Optional[ChatTurnRecord]:
+        """메시지 수정 저장 (히스토리 수정 + 수정된 메시지/새 봇 응답 추가를 한 트랜잭션/한 번의 왕복으로)
+
+        save_turn과 같은 데이터 변경 CTE로, 기존 히스토리 행을 수정하고 그 결과에 이어 메시지와 봇 응답을 삽입한다.
+        수정할 히스토리(chat_id)가 없거나 다른 유저의 것이면 아무것도 저장하지 않고 None을 반환한다.
+        """
+        try:
+            edit_time = edit_time if edit_time else datetime.now()
+            payload_hash = payload_digest(payload) if payload is not None else None
+            
+            with db_connection.get_cursor() as cursor:
+                if payload is not None:
+                    self._upsert_payloads(cursor, {payload_hash: payload})
+                db_connection.statements.execute(cursor, "chat_storage.save_edit_turn", """
+                    WITH edited_history AS (
+                        UPDATE service_chat_histories
+                        SET user_message = %s, bot_response = %s, chat_time = %s, response_time = %s
+                        WHERE id = %s AND chatroom_id = %s AND user_id = %s
+                        RETURNING id, chatroom_id, user_id, chat_time, response_time
+                    ), new_message AS (
+                        INSERT INTO service_messages (chatroom_id, user_id, content, message_type, data_type, timestamp)
+                        SELECT h.chatroom_id, h.user_id, %s, 'user', %s, h.chat_time FROM edited_history h
+                        RETURNING id, chatroom_id, user_id
+                    ), new_response AS (
+                        INSERT INTO service_bot_responses
+                            (message_id, chatroom_id, user_id, content, content_blob, content_encoding, payload_hash, timestamp)
+                        SELECT m.id, m.chatroom_id, m.user_id, %s, %s, %s, %s, %s FROM new_message m
+                        RETURNING id
+                    )
+                    SELECT m.id AS message_id, r.id AS response_id, h.id AS chat_id,
+                           h.chatroom_id, h.user_id, h.chat_time, h.response_time
+                    FROM edited_history h, new_message m, new_response r
+                """, (user_message, history_response, edit_time, edit_time,
+                      chat_id, chatroom_id, user_id,
+                      user_message, data_type,
+                      *_encode_json_column(content if isinstance(content, str) else json.dumps(content)),
+                      payload_hash, edit_time))
+                
+                result = cursor.fetchone()
+                if not result:
+                    logger.warning(f"Chat history {chat_id} not found in chatroom {chatroom_id} for user {user_id}")
+                    return None
+                turn = ChatTurnRecord(
+                    message_id=str(result['message_id']),
+                    response_id=str(result['response_id']),
+                    chat_id=result['chat_id'],
+                    chatroom_id=result['chatroom_id'],
+                    user_id=result['user_id'],
+                    chat_time=result['chat_time'],
+                    response_time=result['response_time']
+                )
+                logger.info(f"Saved edited chat turn {turn.chat_id} in chatroom {chatroom_id}")
+                return turn
+        except Exception as e:
+            logger.error(f"Failed to save edited chat turn: {e}")
+            raise
+    
+    def reserve_turn_ids(self, count: int = 1) -> List[Tuple[int, int, int]]:
+        """채팅 턴 id 미리 예약 [(message_id, response_id, chat_id), ...]
+
+        write-behind 모드에서 행을 삽입하기 전에 응답에 실제 id를 담아 보낼 수 있도록
+        각 테이블의 identity 시퀀스에서 값을 받아 둔다 (save_turns에서 그대로 사용).
+        """
+        try:
+            with db_connection.get_cursor() as cursor:
+                db_connection.statements.execute(cursor, "chat_storage.reserve_turn_ids", """
+                    SELECT nextval(pg_get_serial_sequence('service_messages', 'id')) AS message_id,
+                           nextval(pg_get_serial_sequence('service_bot_responses', 'id')) AS response_id,
+                           nextval(pg_get_serial_sequence('service_chat_histories', 'id')) AS chat_id
+                    FROM generate_series(1, %s::integer)
+                """, (count,))
+                return [(row['message_id'], row['response_id'], row['chat_id']) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to reserve chat turn ids: {e}")
+            raise
+    
+    def save_turns(self, turns: List[PendingChatTurn]) -> int:
+        """id가 예약된 채팅 턴 여러 개를 한 트랜잭션에서 다중 행 INSERT로 저장
+
+        테이블마다 INSERT 한 번씩만 실행하며, 예약된 id를 쓰기 위해 OVERRIDING SYSTEM VALUE를 사용한다.
+        """
+        if not turns:
+            return 0
+        try:
+            payload_hashes = [payload_digest(t.payload) if t.payload is not None else None for t in turns]
+            with db_connection.get_cursor() as cursor:
+                # 배치 안에서 같은 해시는 한 번만 저장 (ON CONFLICT DO UPDATE는 같은 행을 두 번 갱신할 수 없음)
+                self._upsert_payloads(cursor, {
+                    digest: t.payload for digest, t in zip(payload_hashes, turns) if digest is not None
+                })
+                
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO service_messages (id, chatroom_id, user_id, content, message_type, data_type, timestamp)
+                    OVERRIDING SYSTEM VALUE VALUES %s
+                """, [
+                    (int(t.message_id), t.chatroom_id, t.user_id, t.user_message, 'user', t.data_type, t.chat_time)
+                    for t in turns
+                ], page_size=len(turns))
+                
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO service_bot_responses
+                        (id, message_id, chatroom_id, user_id, content, content_blob, content_encoding, payload_hash, timestamp)
+                    OVERRIDING SYSTEM VALUE VALUES %s
+                """, [
+                    (int(t.response_id), int(t.message_id), t.chatroom_id, t.user_id,
+                     *_encode_json_column(t.content), digest, t.response_time)
+                    for digest, t in zip(payload_hashes, turns)
+                ], page_size=len(turns))
+                
+                psycopg2.extras.execute_values(cursor, """
+                    INSERT INTO service_chat_histories (id, chatroom_id, user_id, user_message, bot_response, chat_time, response_time)
+                    OVERRIDING SYSTEM VALUE VALUES %s
+                """, [
+                    (t.chat_id, t.chatroom_id, t.user_id, t.user_message, t.history_response, t.chat_time, t.response_time)
+                    for t in turns
+                ], page_size=len(turns))
+                
+                logger.info(f"Saved {len(turns)} chat turns in one batch")
+                return len(turns)
+        except Exception as e:
+            logger.error(f"Failed to save {len(turns)} chat turns: {e}")
+            raise
+    
     def get_responses_by_chatroom(self, chatroom_id: int) -> List[BotResponse]:
         """채팅방의 응답 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, message_id, chatroom_id, user_id, content, timestamp
-                    FROM service_bot_responses 
-                    WHERE chatroom_id = %s 
-                    ORDER BY timestamp ASC
-                """, (chatroom_id,))
+                db_connection.statements.execute_registered(cursor, "chat_storage.get_responses_by_chatroom", (chatroom_id, chatroom_id))
                 
                 results = cursor.fetchall()
                 responses = []
@@ -340,7 +723,7 @@ class ChatStorage:
                         message_id=str(row['message_id']),
                         chatroom_id=row['chatroom_id'],
                         user_id=row['user_id'],
-                        content=json.loads(row['content']),
+                        content=_assemble_content(row),
                         timestamp=row['timestamp']
                     )
                     responses.append(response)
@@ -355,8 +738,8 @@ class ChatStorage:
         try:
             with db_connection.get_cursor() as cursor:
                 # 유저 권한 확인
-                cursor.execute("""
-                    SELECT user_id FROM service_chatrooms WHERE id = %s AND is_deleted = FALSE
+                db_connection.statements.execute(cursor, "chat_storage.get_chatroom_owner", """
+                    SELECT user_id, created_at FROM service_chatrooms WHERE id = %s AND is_deleted = FALSE
                 """, (chatroom_id,))
                 
                 result = cursor.fetchone()
@@ -364,7 +747,7 @@ class ChatStorage:
                     return None
                 
                 # 채팅방 이름 업데이트
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "chat_storage.update_chatroom_name", """
                     UPDATE service_chatrooms 
                     SET name = %s, updated_at = CURRENT_TIMESTAMP 
                     WHERE id = %s
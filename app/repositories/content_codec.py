@@ -0,0 +1,84 @@
+"""
+Content codec - Optional binary compression for stored bot response JSON (zstd, zlib fallback)
+"""
+
+import logging
+import threading
+import zlib
+from typing import Optional, Tuple
+
+from app.config import settings
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+ENCODING_ZSTD = "zstd"
+ENCODING_ZLIB = "zlib"
+SUPPORTED_ENCODINGS = (ENCODING_ZSTD, ENCODING_ZLIB)
+
+
+class ContentCodec:
+    """봇 응답/payload JSON 압축 인코더
+
+    - encoding: "zstd" | "zlib" | "none" (zstandard가 없으면 zstd 대신 zlib 사용)
+    - encode는 (blob, encoding)을 반환하고, 압축을 끈 경우 (None, None)을 반환해 JSONB 컬럼에 그대로 저장
+    - decode는 행에 기록된 encoding으로 풀기 때문에 설정을 바꿔도 이전 행을 계속 읽을 수 있음
+
+    zstd 압축/해제 객체는 스레드 안전하지 않으므로 스레드마다 따로 만든다.
+    """
+
+    def __init__(self, encoding: str = settings.CHAT_CONTENT_COMPRESSION,
+                 level: int = settings.CHAT_CONTENT_COMPRESSION_LEVEL):
+        encoding = (encoding or "none").lower()
+        if encoding == ENCODING_ZSTD and not HAS_ZSTD:
+            logger.warning("zstandard is not installed, falling back to zlib content compression")
+            encoding = ENCODING_ZLIB
+        if encoding not in SUPPORTED_ENCODINGS:
+            encoding = None
+        self.encoding: Optional[str] = encoding
+        self.level = level
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.encoding is not None
+
+    def _zstd_compressor(self):
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = zstandard.ZstdCompressor(level=self.level)
+        return self._local.compressor
+
+    def _zstd_decompressor(self):
+        if not hasattr(self._local, "decompressor"):
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.decompressor
+
+    def encode(self, text: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """JSON 문자열 압축 → (blob, encoding), 압축을 끈 경우 (None, None)"""
+        if self.encoding is None:
+            return None, None
+        raw = text.encode("utf-8")
+        if self.encoding == ENCODING_ZSTD:
+            return self._zstd_compressor().compress(raw), ENCODING_ZSTD
+        return zlib.compress(raw, min(max(self.level, 1), 9)), ENCODING_ZLIB
+
+    def decode(self, blob: bytes, encoding: str) -> str:
+        """행에 기록된 encoding으로 압축 해제한 JSON 문자열"""
+        blob = bytes(blob)  # psycopg2는 bytea를 memoryview로 반환
+        if encoding == ENCODING_ZSTD:
+            if not HAS_ZSTD:
+                raise RuntimeError("zstandard is required to read zstd-compressed content")
+            return self._zstd_decompressor().decompress(blob).decode("utf-8")
+        if encoding == ENCODING_ZLIB:
+            return zlib.decompress(blob).decode("utf-8")
+        raise ValueError(f"Unknown content encoding: {encoding}")
+
+
+# 전역 코덱 (CHAT_CONTENT_COMPRESSION 설정 사용)
+content_codec = ContentCodec()
@@ -12,6 +12,33 @@ from app.models.conversation_models import SessionContext, ConversationState
 
 logger = logging.getLogger(__name__)
 
+# 쿼리는 import 시점에 등록 (app.migrations.plan_check가 같은 이름으로 EXPLAIN)
+db_connection.statements.register("conversation_session.get_session", """
+    SELECT state, current_module, extracted_params, last_executed_module,
+           modification_attempts, version
+    FROM service_conversation_sessions
+    WHERE chatroom_id = %s AND user_id = %s
+""")
+db_connection.statements.register("conversation_session.create_session", """
+    INSERT INTO service_conversation_sessions
+        (chatroom_id, user_id, state, version, updated_at)
+    VALUES (%s, %s, %s, 0, CURRENT_TIMESTAMP)
+    ON CONFLICT (chatroom_id, user_id)
+        DO UPDATE SET updated_at = service_conversation_sessions.updated_at
+    RETURNING state, current_module, extracted_params, last_executed_module, modification_attempts, version
+""")
+db_connection.statements.register("conversation_session.save", """
+    UPDATE service_conversation_sessions
+    SET state = %s,
+        current_module = %s,
+        extracted_params = %s,
+        last_executed_module = %s,
+        modification_attempts = %s,
+        version = version + 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE chatroom_id = %s AND user_id = %s AND version = %s
+""")
+
 
 class ConversationSessionRepo:
     """PostgreSQL 기반 대화 세션 저장소"""
@@ -20,13 +47,8 @@ class ConversationSessionRepo:
         """세션이 있으면 로드, 없으면 초기 상태로 생성 후 반환"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT state, current_module, extracted_params, last_executed_module,
-                           modification_attempts, version
-                    FROM service_conversation_sessions
-                    WHERE chatroom_id = %s AND user_id = %s
-                    """,
+                db_connection.statements.execute_registered(
+                    cursor, "conversation_session.get_session",
                     (chatroom_id, user_id),
                 )
                 row = cursor.fetchone()
@@ -40,14 +62,9 @@ class ConversationSessionRepo:
                     )
                     return ctx, row["version"]
 
-                # 없으면 생성
-                cursor.execute(
-                    """
-                    INSERT INTO service_conversation_sessions
-                        (chatroom_id, user_id, state, version, updated_at)
-                    VALUES (%s, %s, %s, 0, CURRENT_TIMESTAMP)
-                    RETURNING state, current_module, extracted_params, last_executed_module, modification_attempts, version
-                    """,
+                # 없으면 생성 (동시 요청이 먼저 만들었으면 uq_conversation_sessions_chatroom_user로 기존 행 반환)
+                db_connection.statements.execute_registered(
+                    cursor, "conversation_session.create_session",
                     (chatroom_id, user_id, ConversationState.INITIAL.value),
                 )
                 row = cursor.fetchone()
@@ -67,18 +84,8 @@ class ConversationSessionRepo:
         """낙관적 락으로 상태 저장, 동시성 충돌 시 예외 발생"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute(
-                    """
-                    UPDATE service_conversation_sessions
-                    SET state = %s,
-                        current_module = %s,
-                        extracted_params = %s,
-                        last_executed_module = %s,
-                        modification_attempts = %s,
-                        version = version + 1,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE chatroom_id = %s AND user_id = %s AND version = %s
-                    """,
+                db_connection.statements.execute_registered(
+                    cursor, "conversation_session.save",
                     (
                         ctx.state.value,
                         ctx.current_module,
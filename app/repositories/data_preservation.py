@@ -2,14 +2,45 @@
 Data preservation utilities - Ensures data integrity when chatrooms are deleted
 """
 
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from datetime import datetime
 import logging
+import time
 
+from app.config import settings
 from app.database import db_connection
 
 logger = logging.getLogger(__name__)
 
+# 배치 작업/통계 쿼리 중 실행 계획을 확인하는 쿼리는 이름으로 등록 (app.migrations.plan_check가 같은 이름으로 EXPLAIN)
+db_connection.statements.register("data_preservation.get_user_data_statistics", """
+    SELECT COUNT(*) as total_histories
+    FROM service_chat_histories ch
+    JOIN service_chatrooms c ON ch.chatroom_id = c.id
+    WHERE c.user_id = %s
+""")
+db_connection.statements.register("data_preservation.purge_deleted_chatrooms", """
+    SELECT id FROM service_chatrooms
+    WHERE is_deleted = TRUE
+    AND deleted_at < CURRENT_TIMESTAMP - make_interval(days => %s)
+    AND id > %s
+    ORDER BY id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+""")
+db_connection.statements.register("data_preservation.collect_unreferenced_payloads", """
+    DELETE FROM service_payloads
+    WHERE hash IN (
+        SELECT hash FROM service_payloads
+        WHERE ref_count = 0
+        AND last_referenced_at < CURRENT_TIMESTAMP - make_interval(mins => %s)
+        ORDER BY last_referenced_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    AND ref_count = 0
+""")
+
 
 class DataPreservation:
     """데이터 보존 관련 유틸리티"""
@@ -214,12 +245,9 @@ class DataPreservation:
                 total_messages = cursor.fetchone()['total_messages']
                 
                 # 총 채팅 히스토리 수
-                cursor.execute("""
-                    SELECT COUNT(*) as total_histories
-                    FROM service_chat_histories ch
-                    JOIN service_chatrooms c ON ch.chatroom_id = c.id
-                    WHERE c.user_id = %s
-                """, (user_id,))
+                db_connection.statements.execute_registered(
+                    cursor, "data_preservation.get_user_data_statistics", (user_id,)
+                )
                 
                 total_histories = cursor.fetchone()['total_histories']
                 
@@ -246,47 +274,153 @@ class DataPreservation:
             logger.error(f"Failed to get user data statistics for {user_id}: {e}")
             return {}
     
-    def cleanup_old_deleted_data(self, days_old: int = 30) -> int:
-        """오래된 삭제된 데이터 정리 (관리자 기능)"""
+    def check_chatroom_activity(self, fix: bool = False, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """채팅방 요약 컬럼(message_count, last_activity)과 실제 히스토리 비교
+
+        트리거가 관리하는 값이 히스토리 집계와 다른 채팅방 목록을 반환하며,
+        fix=True이면 해당 채팅방의 요약 값을 다시 계산해 바로잡는다.
+        """
         try:
             with db_connection.get_cursor() as cursor:
-                # 삭제된 지 오래된 채팅방의 데이터 영구 삭제
                 cursor.execute("""
-                    DELETE FROM service_bot_responses 
-                    WHERE chatroom_id IN (
-                        SELECT id FROM service_chatrooms 
-                        WHERE is_deleted = TRUE 
-                        AND deleted_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
-                    )
-                """, (days_old,))
-                
-                cursor.execute("""
-                    DELETE FROM service_messages 
-                    WHERE chatroom_id IN (
-                        SELECT id FROM service_chatrooms 
-                        WHERE is_deleted = TRUE 
-                        AND deleted_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
-                    )
-                """, (days_old,))
-                
-                cursor.execute("""
-                    DELETE FROM service_chat_histories 
-                    WHERE chatroom_id IN (
-                        SELECT id FROM service_chatrooms 
-                        WHERE is_deleted = TRUE 
-                        AND deleted_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
+                    SELECT 
+                        c.id,
+                        c.user_id,
+                        c.message_count as stored_message_count,
+                        c.last_activity as stored_last_activity,
+                        COALESCE(s.message_count, 0) as actual_message_count,
+                        s.last_activity as actual_last_activity
+                    FROM service_chatrooms c
+                    LEFT JOIN (
+                        SELECT chatroom_id, COUNT(*) as message_count, MAX(response_time) as last_activity
+                        FROM service_chat_histories
+                        GROUP BY chatroom_id
+                    ) s ON s.chatroom_id = c.id
+                    WHERE (%s::varchar IS NULL OR c.user_id = %s)
+                      AND (c.message_count <> COALESCE(s.message_count, 0)
+                           OR c.last_activity IS DISTINCT FROM s.last_activity)
+                    ORDER BY c.id
+                """, (user_id, user_id))
+                
+                mismatches = [dict(row) for row in cursor.fetchall()]
+                
+                if fix and mismatches:
+                    cursor.execute(
+                        "SELECT service_refresh_chatroom_activity(%s::integer[])",
+                        ([row['id'] for row in mismatches],)
                     )
-                """, (days_old,))
+                    logger.warning(f"Repaired activity summary for {len(mismatches)} chatrooms")
+                elif mismatches:
+                    logger.warning(f"Found {len(mismatches)} chatrooms with inconsistent activity summary")
                 
-                cursor.execute("""
-                    DELETE FROM service_chatrooms 
-                    WHERE is_deleted = TRUE 
-                    AND deleted_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
-                """, (days_old,))
-                
-                cleaned_count = cursor.rowcount
-                logger.info(f"Cleaned up {cleaned_count} old deleted chatrooms and their data")
-                return cleaned_count
+                return {
+                    'mismatch_count': len(mismatches),
+                    'mismatches': mismatches,
+                    'fixed': fix and bool(mismatches)
+                }
+        except Exception as e:
+            logger.error(f"Failed to check chatroom activity summary: {e}")
+            return {}
+    
+    def purge_deleted_chatrooms(self, days_old: int = 30, batch_size: int = 100,
+                                time_budget: Optional[float] = None, after_id: int = 0,
+                                progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """삭제된 지 days_old일이 지난 채팅방을 batch_size개씩 나눠 영구 삭제
+
+        - 배치마다 별도 트랜잭션으로 커밋해 히스토리 테이블 잠금과 WAL을 배치 크기로 제한
+        - 채팅방 id 순으로 진행하며, 중단된 작업은 반환된 last_chatroom_id를 after_id로 넘겨 이어서 실행
+          (이미 삭제된 채팅방은 다시 조회되지 않으므로 처음부터 다시 실행해도 안전)
+        - time_budget(초)을 넘기면 현재 배치까지만 처리하고 done=False로 반환
+        - progress_callback에는 배치가 끝날 때마다 진행 상황이 전달됨
+        """
+        started = time.monotonic()
+        progress = {
+            'days_old': days_old,
+            'batch_size': batch_size,
+            'batches': 0,
+            'chatrooms': 0,
+            'bot_responses': 0,
+            'messages': 0,
+            'chat_histories': 0,
+            'last_chatroom_id': after_id,
+            'payloads': 0,
+            'elapsed_seconds': 0.0,
+            'done': False
+        }
+        
+        while True:
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                logger.info(f"Purge stopped by time budget after {progress['chatrooms']} chatrooms "
+                            f"(resume after chatroom {progress['last_chatroom_id']})")
+                break
+            
+            with db_connection.get_cursor() as cursor:
+                # 다음 배치 대상 채팅방 (다른 트랜잭션이 같은 행을 처리 중이면 건너뜀)
+                db_connection.statements.execute_registered(
+                    cursor, "data_preservation.purge_deleted_chatrooms",
+                    (days_old, progress['last_chatroom_id'], batch_size)
+                )
+                
+                chatroom_ids = [row['id'] for row in cursor.fetchall()]
+                if not chatroom_ids:
+                    progress['done'] = True
+                    break
+                
+                # 관련 데이터 삭제 (히스토리 트리거가 채팅방 행을 갱신하므로 채팅방은 마지막에 삭제)
+                cursor.execute("DELETE FROM service_bot_responses WHERE chatroom_id = ANY(%s)", (chatroom_ids,))
+                progress['bot_responses'] += cursor.rowcount
+                cursor.execute("DELETE FROM service_messages WHERE chatroom_id = ANY(%s)", (chatroom_ids,))
+                progress['messages'] += cursor.rowcount
+                cursor.execute("DELETE FROM service_chat_histories WHERE chatroom_id = ANY(%s)", (chatroom_ids,))
+                progress['chat_histories'] += cursor.rowcount
+                cursor.execute("DELETE FROM service_chatrooms WHERE id = ANY(%s)", (chatroom_ids,))
+                progress['chatrooms'] += cursor.rowcount
+            
+            progress['batches'] += 1
+            progress['last_chatroom_id'] = chatroom_ids[-1]
+            progress['elapsed_seconds'] = round(time.monotonic() - started, 3)
+            if progress_callback:
+                progress_callback(dict(progress))
+            
+            if len(chatroom_ids) < batch_size:
+                progress['done'] = True
+                break
+        
+        if progress['done']:
+            # 삭제된 봇 응답이 참조하던 payload 중 더 이상 참조되지 않는 것 정리
+            progress['payloads'] = self.collect_unreferenced_payloads(batch_size=max(batch_size, 500))
+        
+        progress['elapsed_seconds'] = round(time.monotonic() - started, 3)
+        logger.info(f"Purged {progress['chatrooms']} old deleted chatrooms in {progress['batches']} batches "
+                    f"({progress['elapsed_seconds']}s, done={progress['done']})")
+        return progress
+    
+    def collect_unreferenced_payloads(self, grace_minutes: int = settings.PAYLOAD_GC_GRACE_MINUTES,
+                                      batch_size: int = 500) -> int:
+        """참조가 없는(ref_count = 0) service_payloads를 batch_size개씩 삭제하고 삭제한 개수 반환
+
+        grace_minutes 안에 참조된 payload는 남겨 둔다. 같은 해시를 저장 중인 트랜잭션은
+        ON CONFLICT DO UPDATE로 행을 잠그므로 SKIP LOCKED로 건너뛰고, 삭제 직전에 ref_count를 다시 확인한다.
+        """
+        deleted = 0
+        while True:
+            with db_connection.get_cursor() as cursor:
+                db_connection.statements.execute_registered(
+                    cursor, "data_preservation.collect_unreferenced_payloads", (grace_minutes, batch_size)
+                )
+                batch_deleted = cursor.rowcount
+            deleted += batch_deleted
+            if batch_deleted < batch_size:
+                break
+        
+        if deleted:
+            logger.info(f"Garbage-collected {deleted} unreferenced payloads")
+        return deleted
+    
+    def cleanup_old_deleted_data(self, days_old: int = 30) -> int:
+        """오래된 삭제된 데이터 정리 (관리자 기능) - 배치 단위로 끝까지 실행"""
+        try:
+            return self.purge_deleted_chatrooms(days_old=days_old)['chatrooms']
         except Exception as e:
             logger.error(f"Failed to cleanup old deleted data: {e}")
-            return 0
\ No newline at end of file
+            return 0
@@ -10,6 +10,20 @@ from app.database import db_connection
 
 logger = logging.getLogger(__name__)
 
+# 조회 쿼리 등록 (plan_check가 같은 이름으로 실행 계획 확인)
+db_connection.statements.register("user_repository.get_user", """
+    SELECT id, user_id, username, email, full_name, created_at, updated_at, is_active
+    FROM service_users
+    WHERE user_id = %s AND is_active = TRUE
+""")
+db_connection.statements.register("user_repository.get_all_users", """
+    SELECT id, user_id, username, email, full_name, created_at, updated_at, is_active
+    FROM service_users
+    WHERE is_active = TRUE
+    ORDER BY created_at DESC
+    LIMIT %s OFFSET %s
+""")
+
 
 class UserRepository:
     """PostgreSQL 기반 유저 저장소"""
@@ -21,7 +35,7 @@ class UserRepository:
         """새 유저 생성"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_repository.create_user", """
                     INSERT INTO service_users (user_id, username, email, full_name, updated_at)
                     VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
                     ON CONFLICT (user_id) DO NOTHING
@@ -41,11 +55,7 @@ class UserRepository:
         """유저 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, user_id, username, email, full_name, created_at, updated_at, is_active
-                    FROM service_users 
-                    WHERE user_id = %s AND is_active = TRUE
-                """, (user_id,))
+                db_connection.statements.execute_registered(cursor, "user_repository.get_user", (user_id,))
                 
                 result = cursor.fetchone()
                 if result:
@@ -60,18 +70,22 @@ class UserRepository:
         try:
             # 업데이트할 필드들만 동적으로 구성
             update_fields = []
+            updated_columns = []
             params = []
             
             if username is not None:
                 update_fields.append("username = %s")
+                updated_columns.append("username")
                 params.append(username)
             
             if email is not None:
                 update_fields.append("email = %s")
+                updated_columns.append("email")
                 params.append(email)
             
             if full_name is not None:
                 update_fields.append("full_name = %s")
+                updated_columns.append("full_name")
                 params.append(full_name)
             
             if not update_fields:
@@ -81,7 +95,9 @@ class UserRepository:
             params.append(user_id)
             
             with db_connection.get_cursor() as cursor:
-                cursor.execute(f"""
+                # 필드 조합마다 SQL이 다르므로 조합별로 이름을 붙여 PREPARE
+                statement = f"user_repository.update_user:{','.join(updated_columns)}"
+                db_connection.statements.execute(cursor, statement, f"""
                     UPDATE service_users 
                     SET {', '.join(update_fields)}
                     WHERE user_id = %s AND is_active = TRUE
@@ -99,7 +115,7 @@ class UserRepository:
         """유저 비활성화 (soft delete)"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_repository.deactivate_user", """
                     UPDATE service_users 
                     SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
                     WHERE user_id = %s
@@ -117,13 +133,7 @@ class UserRepository:
         """모든 활성 유저 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT id, user_id, username, email, full_name, created_at, updated_at, is_active
-                    FROM service_users 
-                    WHERE is_active = TRUE
-                    ORDER BY created_at DESC
-                    LIMIT %s OFFSET %s
-                """, (limit, offset))
+                db_connection.statements.execute_registered(cursor, "user_repository.get_all_users", (limit, offset))
                 
                 results = cursor.fetchall()
                 users = [dict(row) for row in results]
@@ -138,17 +148,16 @@ class UserRepository:
         """유저 통계 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_repository.get_user_stats", """
                     SELECT 
                         u.user_id,
                         u.username,
                         COUNT(DISTINCT c.id) as total_chatrooms,
                         COUNT(DISTINCT CASE WHEN c.is_deleted = FALSE THEN c.id END) as active_chatrooms,
-                        COUNT(DISTINCT ch.id) as total_messages,
-                        MAX(ch.response_time) as last_activity
+                        COALESCE(SUM(c.message_count), 0) as total_messages,
+                        MAX(c.last_activity) as last_activity
                     FROM service_users u
                     LEFT JOIN service_chatrooms c ON u.user_id = c.user_id
-                    LEFT JOIN service_chat_histories ch ON c.id = ch.chatroom_id
                     WHERE u.user_id = %s AND u.is_active = TRUE
                     GROUP BY u.user_id, u.username
                 """, (user_id,))
@@ -165,7 +174,7 @@ class UserRepository:
         """유저 검색"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_repository.search_users", """
                     SELECT id, user_id, username, email, full_name, created_at, updated_at, is_active
                     FROM service_users 
                     WHERE is_active = TRUE 
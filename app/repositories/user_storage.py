@@ -13,6 +13,24 @@ from app.database import db_connection
 
 logger = logging.getLogger(__name__)
 
+# 세션 쿼리 등록 (실행은 execute_registered, 실행 계획 확인은 app.migrations.plan_check)
+db_connection.statements.register("user_storage.get_session", """
+    SELECT user_id, session_id, user_data, source, created_at, expires_at
+    FROM service_user_storage
+    WHERE session_id = %s AND is_active = TRUE AND expires_at > CURRENT_TIMESTAMP
+""")
+db_connection.statements.register("user_storage.get_user_sessions", """
+    SELECT user_id, session_id, user_data, source, created_at, expires_at
+    FROM service_user_storage
+    WHERE user_id = %s AND is_active = TRUE AND expires_at > CURRENT_TIMESTAMP
+    ORDER BY created_at DESC
+""")
+db_connection.statements.register("user_storage.cleanup_expired_sessions", """
+    UPDATE service_user_storage
+    SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
+    WHERE expires_at <= CURRENT_TIMESTAMP AND is_active = TRUE
+""")
+
 
 class UserStorage:
     """PostgreSQL 기반 유저 스토리지"""
@@ -32,7 +50,7 @@ class UserStorage:
             
             with db_connection.get_cursor() as cursor:
                 # JSONB 컬럼에는 psycopg2.extras.Json으로 감싸서 전달
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_storage.create_session", """
                     INSERT INTO service_user_storage (user_id, session_id, user_data, source, expires_at, updated_at)
                     VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
                     RETURNING id, user_id, session_id, user_data, source, created_at, expires_at
@@ -56,11 +74,7 @@ class UserStorage:
         """세션 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT user_id, session_id, user_data, source, created_at, expires_at
-                    FROM service_user_storage 
-                    WHERE session_id = %s AND is_active = TRUE AND expires_at > CURRENT_TIMESTAMP
-                """, (session_id,))
+                db_connection.statements.execute_registered(cursor, "user_storage.get_session", (session_id,))
                 
                 result = cursor.fetchone()
                 if result:
@@ -83,7 +97,7 @@ class UserStorage:
                 raise ValueError("user_data must contain userId")
             
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_storage.update_session", """
                     UPDATE service_user_storage 
                     SET user_data = %s, updated_at = CURRENT_TIMESTAMP, expires_at = %s
                     WHERE session_id = %s AND is_active = TRUE
@@ -109,7 +123,7 @@ class UserStorage:
         """세션 삭제 (soft delete)"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_storage.delete_session", """
                     UPDATE service_user_storage 
                     SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
                     WHERE session_id = %s
@@ -127,12 +141,7 @@ class UserStorage:
         """특정 사용자의 모든 활성 세션 조회"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    SELECT user_id, session_id, user_data, source, created_at, expires_at
-                    FROM service_user_storage 
-                    WHERE user_id = %s AND is_active = TRUE AND expires_at > CURRENT_TIMESTAMP
-                    ORDER BY created_at DESC
-                """, (user_id,))
+                db_connection.statements.execute_registered(cursor, "user_storage.get_user_sessions", (user_id,))
                 
                 results = cursor.fetchall()
                 sessions = []
@@ -156,11 +165,7 @@ class UserStorage:
         """만료된 세션 정리"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
-                    UPDATE service_user_storage 
-                    SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
-                    WHERE expires_at <= CURRENT_TIMESTAMP AND is_active = TRUE
-                """)
+                db_connection.statements.execute_registered(cursor, "user_storage.cleanup_expired_sessions")
                 
                 expired_count = cursor.rowcount
                 if expired_count > 0:
@@ -175,7 +180,7 @@ class UserStorage:
         """전체 활성 세션 수 반환"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_storage.get_session_count", """
                     SELECT COUNT(*) as count
                     FROM service_user_storage 
                     WHERE is_active = TRUE AND expires_at > CURRENT_TIMESTAMP
@@ -191,7 +196,7 @@ class UserStorage:
         """세션 만료 시간 연장"""
         try:
             with db_connection.get_cursor() as cursor:
-                cursor.execute("""
+                db_connection.statements.execute(cursor, "user_storage.extend_session", """
                     UPDATE service_user_storage 
                     SET expires_at = %s, updated_at = CURRENT_TIMESTAMP
                     WHERE session_id = %s AND is_active = TRUE
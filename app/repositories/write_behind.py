@@ -0,0 +1,261 @@
+"""
+Write-behind queue - Persists chat turns in the background in multi-row batches
+
+Usage:
+    python -m app.repositories.write_behind replay
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.database import db_connection
+from app.models import PendingChatTurn
+from app.repositories.chat_storage import ChatStorage
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """채팅 턴 write-behind 배처
+
+    - 응답을 보내기 전에 reserve_turn_ids로 id만 받아 두고, 실제 INSERT는 큐에 넣어 나중에 수행
+    - 큐 크기가 max_queue_size에 도달하면 enqueue가 대기 (백프레셔)
+    - batch_size개가 모이거나 flush_interval(초)이 지나면 save_turns로 한 번에 저장
+    - 저장 실패 시 max_retries까지 재시도하고, 그래도 실패하면 턴을 하나씩 따로 저장
+      (FK 위반처럼 한 행 때문에 다중 행 INSERT 전체가 실패해도 나머지 턴은 저장됨)
+    - 따로 저장해도 실패한 턴은 dead_letter_path(JSON Lines)에 남기고 failed_turns에 기록
+      → 원인을 해결한 뒤 replay_dead_letters()로 다시 저장 (python -m app.repositories.write_behind replay)
+    - 플러시 지연(flush lag): 턴이 큐에 들어간 시점부터 DB에 커밋될 때까지의 시간
+
+    write-behind 모드에서는 응답 직후 히스토리 조회에 방금 턴이 아직 없을 수 있다.
+    """
+
+    def __init__(self, storage: Optional[ChatStorage] = None,
+                 max_queue_size: int = settings.CHAT_WRITE_BEHIND_MAX_QUEUE,
+                 batch_size: int = settings.CHAT_WRITE_BEHIND_BATCH_SIZE,
+                 flush_interval: float = settings.CHAT_WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_retries: int = settings.CHAT_WRITE_BEHIND_MAX_RETRIES,
+                 dead_letter_path: Optional[Path] = None):
+        self.storage = storage or ChatStorage()
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.dead_letter_path = Path(dead_letter_path or settings.CHAT_WRITE_BEHIND_DEAD_LETTER_PATH)
+        self._dead_letter_lock = threading.Lock()
+
+        self._queue: Optional[asyncio.Queue] = None
+        # 큐에 있는 턴의 enqueue 시각 (FIFO이므로 맨 앞이 가장 오래 기다린 턴)
+        self._pending_since: Deque[float] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # 통계
+        self._enqueued = 0
+        self._flushed_turns = 0
+        self._flush_batches = 0
+        self._failed_turns = 0
+        self._isolated_batches = 0
+        self._backpressure_waits = 0
+        self._flush_lag_last = 0.0
+        self._flush_lag_max = 0.0
+        self._flush_lag_total = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """배처 시작 (이벤트 루프 안에서 호출)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._pending_since.clear()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="chat-write-behind")
+        logger.info(f"Write-behind batcher started (max_queue={self.max_queue_size}, batch={self.batch_size})")
+
+    async def reserve_ids(self) -> Tuple[int, int, int]:
+        """턴 하나의 (message_id, response_id, chat_id) 예약"""
+        ids = await db_connection.run_in_executor(self.storage.reserve_turn_ids, 1)
+        return ids[0]
+
+    async def enqueue(self, turn: PendingChatTurn) -> None:
+        """턴을 저장 대기열에 추가 (큐가 가득 차면 빈 자리가 날 때까지 대기)"""
+        if not self.running or self._stopping:
+            # 배처가 없으면 바로 저장해 턴을 잃지 않도록 함
+            await db_connection.run_in_executor(self.storage.save_turns, [turn])
+            return
+        if self._queue.full():
+            self._backpressure_waits += 1
+        enqueued_at = time.monotonic()
+        await self._queue.put((enqueued_at, turn))
+        self._pending_since.append(enqueued_at)
+        self._enqueued += 1
+
+    async def _next_batch(self) -> List[Tuple[float, PendingChatTurn]]:
+        """첫 항목을 기다린 뒤 batch_size 또는 flush_interval 중 먼저 도달할 때까지 모음"""
+        batch = [await self._queue.get()]
+        self._pending_since.popleft()
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+            self._pending_since.popleft()
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Tuple[float, PendingChatTurn]]) -> None:
+        turns = [turn for _, turn in batch]
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await db_connection.run_in_executor(self.storage.save_turns, turns)
+                break
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Write-behind flush of {len(turns)} turns failed {attempt} times, "
+                                 f"saving turns one by one: {e}")
+                    batch = await self._flush_each(batch)
+                    break
+                logger.warning(f"Write-behind flush failed (attempt {attempt}/{self.max_retries}): {e}")
+                await asyncio.sleep(min(0.5 * 2 ** (attempt - 1), 5.0))
+
+        if not batch:
+            return
+        lag = time.monotonic() - batch[0][0]
+        self._flushed_turns += len(batch)
+        self._flush_batches += 1
+        self._flush_lag_last = lag
+        self._flush_lag_max = max(self._flush_lag_max, lag)
+        self._flush_lag_total += lag
+
+    async def _flush_each(self, batch: List[Tuple[float, PendingChatTurn]]) -> List[Tuple[float, PendingChatTurn]]:
+        """배치 저장이 계속 실패할 때 턴을 하나씩 저장하고 저장된 항목만 반환 (실패한 턴은 dead letter 파일로)"""
+        self._isolated_batches += 1
+        saved, failed = [], []
+        for item in batch:
+            try:
+                await db_connection.run_in_executor(self.storage.save_turns, [item[1]])
+                saved.append(item)
+            except Exception as e:
+                logger.error(f"Failed to save chat turn chat_id={item[1].chat_id} "
+                             f"(chatroom {item[1].chatroom_id}): {e}")
+                failed.append(item[1])
+        if failed:
+            self._failed_turns += len(failed)
+            try:
+                await db_connection.run_in_executor(self._write_dead_letters, failed)
+                logger.error(f"Wrote {len(failed)} unsaved chat turns to {self.dead_letter_path}")
+            except Exception as e:
+                logger.critical(f"Failed to write {len(failed)} chat turns to {self.dead_letter_path}: {e}; "
+                                f"lost turns: {[t.model_dump_json() for t in failed]}")
+        return saved
+
+    def _write_dead_letters(self, turns: List[PendingChatTurn]) -> None:
+        with self._dead_letter_lock:
+            self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.dead_letter_path.open("a", encoding="utf-8") as f:
+                for turn in turns:
+                    f.write(turn.model_dump_json() + "\n")
+
+    def replay_dead_letters(self) -> Dict[str, int]:
+        """dead letter 파일의 턴을 하나씩 다시 저장하고, 여전히 실패한 턴만 파일에 남김 (동기 함수)"""
+        with self._dead_letter_lock:
+            if not self.dead_letter_path.exists():
+                return {'replayed': 0, 'remaining': 0}
+            lines = [line for line in self.dead_letter_path.read_text(encoding="utf-8").splitlines() if line.strip()]
+            remaining = []
+            for line in lines:
+                turn = PendingChatTurn.model_validate_json(line)
+                try:
+                    self.storage.save_turns([turn])
+                except Exception as e:
+                    logger.error(f"Replay of chat turn chat_id={turn.chat_id} failed: {e}")
+                    remaining.append(line)
+            if remaining:
+                self.dead_letter_path.write_text("".join(line + "\n" for line in remaining), encoding="utf-8")
+            else:
+                self.dead_letter_path.unlink()
+        logger.info(f"Replayed {len(lines) - len(remaining)} dead-letter chat turns ({len(remaining)} remaining)")
+        return {'replayed': len(lines) - len(remaining), 'remaining': len(remaining)}
+
+    async def stop(self) -> None:
+        """남은 턴을 모두 저장한 뒤 배처 종료 (lifespan 종료 시 호출)"""
+        if not self.running:
+            return
+        self._stopping = True
+        pending = self._queue.qsize()
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"Write-behind batcher stopped (flushed {pending} pending turns on shutdown)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배처 통계 조회"""
+        depth = self._queue.qsize() if self._queue is not None else 0
+        oldest_age = time.monotonic() - self._pending_since[0] if self._pending_since else 0.0
+        return {
+            'enabled': settings.CHAT_WRITE_BEHIND_ENABLED,
+            'running': self.running,
+            'queue_depth': depth,
+            'max_queue_size': self.max_queue_size,
+            'batch_size': self.batch_size,
+            'enqueued': self._enqueued,
+            'flushed_turns': self._flushed_turns,
+            'flush_batches': self._flush_batches,
+            'failed_turns': self._failed_turns,
+            'isolated_batches': self._isolated_batches,
+            'dead_letter_path': str(self.dead_letter_path),
+            'backpressure_waits': self._backpressure_waits,
+            'oldest_pending_age_ms': round(oldest_age * 1000, 3),
+            'flush_lag_last_ms': round(self._flush_lag_last * 1000, 3),
+            'flush_lag_max_ms': round(self._flush_lag_max * 1000, 3),
+            'flush_lag_avg_ms': round(self._flush_lag_total / self._flush_batches * 1000, 3) if self._flush_batches else 0.0,
+        }
+
+
+# 전역 write-behind 배처 (CHAT_WRITE_BEHIND_ENABLED일 때 lifespan에서 시작)
+write_behind_queue = WriteBehindQueue()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.repositories.write_behind")
+    parser.add_argument("--path", type=Path, default=None,
+                        help="dead letter 파일 (기본: CHAT_WRITE_BEHIND_DEAD_LETTER_PATH)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("replay", help="저장하지 못한 채팅 턴을 다시 저장")
+
+    args = parser.parse_args(argv)
+    result = WriteBehindQueue(dead_letter_path=args.path).replay_dead_letters()
+    print(f"replayed {result['replayed']} turns, {result['remaining']} remaining")
+    return 1 if result['remaining'] else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
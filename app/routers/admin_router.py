@@ -0,0 +1,50 @@
+"""
+Admin router - Handles maintenance endpoints restricted to admin users
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.config import settings
+from app.routers.chat_router import get_current_user
+from app.services.purge_job import purge_job
+from app.services.result_cache import result_cache
+
+router = APIRouter()
+
+
+async def get_admin_user(user_id: str = Depends(get_current_user)):
+    """관리자 권한 확인 의존성 (settings.ADMIN_USER_IDS)"""
+    if user_id not in settings.ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
+    return user_id
+
+
+@router.post("/api/admin/purge-deleted-chatrooms", status_code=202)
+async def start_purge_deleted_chatrooms(
+    days_old: int = Query(30, ge=0),
+    batch_size: int = Query(100, ge=1, le=10000),
+    time_budget: Optional[float] = Query(None, gt=0, description="실행 시간 제한(초), 초과 시 일시 중지 후 다음 실행에서 이어서 진행"),
+    admin_id: str = Depends(get_admin_user)
+):
+    """삭제된 지 오래된 채팅방 영구 삭제를 백그라운드에서 시작"""
+    if not purge_job.start(days_old=days_old, batch_size=batch_size, time_budget=time_budget):
+        raise HTTPException(status_code=409, detail="이미 실행 중인 정리 작업이 있습니다.")
+    return purge_job.status()
+
+
+@router.get("/api/admin/purge-deleted-chatrooms")
+async def get_purge_deleted_chatrooms_status(admin_id: str = Depends(get_admin_user)):
+    """채팅방 영구 삭제 작업 진행 상황 조회"""
+    return purge_job.status()
+
+
+@router.post("/api/admin/data-cache/invalidate")
+async def invalidate_data_cache(
+    generator: Optional[str] = Query(None, description="비울 생성 함수 이름 (예: generate_inline_trend_followup_data), 없으면 전체"),
+    admin_id: str = Depends(get_admin_user)
+):
+    """데이터 생성 결과 캐시 비우기"""
+    removed = result_cache.invalidate(generator)
+    return {"invalidated": removed, "generator": generator, "cache": result_cache.get_stats()}
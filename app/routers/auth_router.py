@@ -10,7 +10,7 @@ import requests
 
 from app.models import SSOLoginRequest
 from app.services import AuthService
-from app.repositories import UserStorage
+from app.repositories import UserStorage, AsyncUserStorage
 
 router = APIRouter()
 
@@ -25,8 +25,8 @@ auth_service = None
 def set_auth_dependencies(storage: UserStorage):
     """Set dependencies for the auth router"""
     global user_storage, auth_service
-    user_storage = storage
-    auth_service = AuthService(storage)
+    user_storage = AsyncUserStorage(storage)
+    auth_service = AuthService(user_storage)
 
 
 @router.get("/")
@@ -114,7 +114,7 @@ async def sso_redirect(user_id: str = "user123"):
         
         # SSO 서버에 로그인 요청 (내부 API 호출)
         sso_request = SSOLoginRequest(userId=user_id)
-        sso_result = auth_service.process_sso_login(sso_request)
+        sso_result = await auth_service.process_sso_login(sso_request)
         
         if sso_result.success:
             print(f"SSO 로그인 성공: {sso_result.userId}")
@@ -137,7 +137,7 @@ async def sso_login(request: SSOLoginRequest):
     """
     print(f"SSO 로그인 API 호출: {request}")
     try:
-        result = auth_service.process_sso_login(request)
+        result = await auth_service.process_sso_login(request)
         return result
         
     except ValueError as e:
@@ -220,7 +220,7 @@ async def refresh_token(credentials: HTTPAuthorizationCredentials = Depends(secu
 async def logout(session_id: str):
     """로그아웃 API"""
     try:
-        success = auth_service.logout_user(session_id)
+        success = await auth_service.logout_user(session_id)
         if success:
             return {
                 "success": True,
@@ -254,7 +254,7 @@ async def get_user_sessions(user_id: str, credentials: HTTPAuthorizationCredenti
                 detail="다른 사용자의 세션을 조회할 권한이 없습니다."
             )
         
-        sessions = auth_service.get_user_sessions(user_id)
+        sessions = await auth_service.get_user_sessions(user_id)
         return {
             "success": True,
             "userId": user_id,
@@ -283,7 +283,7 @@ async def cleanup_expired_sessions(credentials: HTTPAuthorizationCredentials = D
         token = credentials.credentials
         user_info = auth_service.validate_user_permissions(token, required_role="admin")
         
-        cleaned_count = auth_service.cleanup_expired_sessions()
+        cleaned_count = await auth_service.cleanup_expired_sessions()
         return {
             "success": True,
             "message": f"{cleaned_count}개의 만료된 세션이 정리되었습니다.",
@@ -2,11 +2,15 @@
 Chat router - Handles all chat-related API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from datetime import datetime
+from typing import Optional
 import json
+import logging
+
+from app.config import settings
 
 from app.models import (
     ChatRequest, EditMessageRequest, UpdateChatRoomNameRequest
@@ -14,10 +18,12 @@ from app.models import (
 from app.models.chat_models import ExcelAnalysisRequest
 from app.services import ChatService
 from app.services.excel_analysis_service import ExcelAnalysisService
-from app.repositories import ChatStorage
+from app.repositories import ChatStorage, AsyncChatStorage
+from app.repositories.write_behind import write_behind_queue
 from app.utils.jwt_utils import get_user_id_from_token
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # HTTP Bearer 토큰 검증용
 security = HTTPBearer(auto_error=False)
@@ -33,33 +39,33 @@ chat_service = None
 # OPTIONS 요청을 제외하는 의존성 함수
 async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
     """현재 사용자 정보를 가져오는 의존성 (OPTIONS 요청 제외)"""
-    print(f"🔍 get_current_user called: method={request.method}, credentials={credentials is not None}")
-    
     # OPTIONS 요청인 경우 None 반환
     if request.method == "OPTIONS":
-        print("✅ OPTIONS request detected, skipping authentication")
         return None
     
     # Authorization 헤더가 없는 경우
     if not credentials:
-        print("❌ No credentials provided")
+        logger.debug("No credentials provided for %s %s", request.method, request.url.path)
         raise HTTPException(status_code=401, detail="인증이 필요합니다.")
     
     # JWT 토큰에서 user_id 추출
     user_id = get_user_id_from_token(credentials.credentials)
     if not user_id:
-        print("❌ Invalid token")
+        logger.info("Invalid token for %s %s", request.method, request.url.path)
         raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다.")
     
-    print(f"✅ User authenticated: {user_id}")
+    logger.debug("User authenticated: %s", user_id)
     return user_id
 
 
 def set_dependencies(storage: ChatStorage):
     """Set dependencies for the router"""
     global chat_storage, chat_service
-    chat_storage = storage
-    chat_service = ChatService(storage)
+    chat_storage = AsyncChatStorage(storage)
+    chat_service = ChatService(
+        chat_storage,
+        write_behind=write_behind_queue if settings.CHAT_WRITE_BEHIND_ENABLED else None
+    )
 
 
 # OPTIONS 요청을 명시적으로 처리하는 엔드포인트들
@@ -91,7 +97,7 @@ async def options_edit_message():
 async def create_chatroom(user_id: str = Depends(get_current_user)):
     """새 채팅방 생성 (JWT 토큰에서 user_id 추출)"""
     try:
-        chatroom = chat_storage.create_chatroom(user_id)
+        chatroom = await chat_storage.create_chatroom(user_id)
         return chatroom  # 직접 chatroom 객체 반환
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"채팅방 생성 실패: {str(e)}")
@@ -101,20 +107,45 @@ async def create_chatroom(user_id: str = Depends(get_current_user)):
 async def get_chatrooms(user_id: str = Depends(get_current_user)):
     """특정 유저의 모든 채팅방 조회 (JWT 토큰에서 user_id 추출)"""
     try:
-        print(f"🔍 Getting chatrooms for user: {user_id}. Total chatrooms in storage: {len(chat_storage.chatrooms)}")
-        chatrooms = chat_storage.get_all_chatrooms(user_id)
-        print(f"📋 Returning {len(chatrooms)} chatrooms for user {user_id}: {chatrooms}")
+        chatrooms = await chat_storage.get_all_chatrooms(user_id)
+        logger.debug("Returning %d chatrooms for user %s", len(chatrooms), user_id)
         return {"chatrooms": chatrooms}
     except Exception as e:
-        print(f"❌ Error getting chatrooms: {e}")
+        logger.error(f"Error getting chatrooms: {e}")
         raise HTTPException(status_code=500, detail=f"채팅방 조회 실패: {str(e)}")
 
 
 @router.get("/chatrooms/{chatroom_id}/history")
-async def get_chatroom_history(chatroom_id: int, user_id: str = Depends(get_current_user)):
-    """채팅방 히스토리 조회 (JWT 토큰에서 user_id 추출하여 권한 확인)"""
+async def get_chatroom_history(
+    chatroom_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=settings.HISTORY_PAGE_MAX_LIMIT),
+    before: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, pattern="^ids$"),
+    user_id: str = Depends(get_current_user)
+):
+    """채팅방 히스토리 조회 (JWT 토큰에서 user_id 추출하여 권한 확인)
+
+    limit / before / fields 중 하나라도 주어지면 최신순 페이지 단위로 조회한다.
+    - limit: 페이지 크기 (기본 HISTORY_PAGE_DEFAULT_LIMIT)
+    - before: 이전 페이지 응답의 next_cursor
+    - fields=ids: 메시지 본문 없이 id와 시간만 반환
+    """
     try:
-        history = chat_storage.get_chatroom_history(chatroom_id, user_id)
+        if limit is not None or before is not None or fields is not None:
+            try:
+                page = await chat_storage.get_chatroom_history_page(
+                    chatroom_id, user_id,
+                    limit or settings.HISTORY_PAGE_DEFAULT_LIMIT,
+                    before=before,
+                    ids_only=fields == "ids"
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            if not page:
+                raise HTTPException(status_code=404, detail="채팅방을 찾을 수 없거나 접근 권한이 없습니다.")
+            return page
+
+        history = await chat_storage.get_chatroom_history(chatroom_id, user_id)
         if not history:
             raise HTTPException(status_code=404, detail="채팅방을 찾을 수 없거나 접근 권한이 없습니다.")
         
@@ -129,7 +160,7 @@ async def get_chatroom_history(chatroom_id: int, user_id: str = Depends(get_curr
 async def delete_chatroom(chatroom_id: int, user_id: str = Depends(get_current_user)):
     """채팅방 삭제 (JWT 토큰에서 user_id 추출하여 권한 확인)"""
     try:
-        success = chat_storage.delete_chatroom(chatroom_id, user_id)
+        success = await chat_storage.delete_chatroom(chatroom_id, user_id)
         if not success:
             raise HTTPException(status_code=404, detail="채팅방을 찾을 수 없거나 삭제 권한이 없습니다.")
         
@@ -144,7 +175,7 @@ async def delete_chatroom(chatroom_id: int, user_id: str = Depends(get_current_u
 async def update_chatroom_name(chatroom_id: int, request: UpdateChatRoomNameRequest, user_id: str = Depends(get_current_user)):
     """채팅방 이름 수정 (JWT 토큰에서 user_id 추출하여 권한 확인)"""
     try:
-        updated_chatroom = chat_storage.update_chatroom_name(chatroom_id, request.name, user_id)
+        updated_chatroom = await chat_storage.update_chatroom_name(chatroom_id, request.name, user_id)
         if not updated_chatroom:
             raise HTTPException(status_code=404, detail="채팅방을 찾을 수 없거나 수정 권한이 없습니다.")
         
@@ -160,7 +191,11 @@ async def chat_endpoint(request: ChatRequest, user_id: str = Depends(get_current
     """스트리밍 채팅 API 엔드포인트 (JWT 토큰에서 user_id 추출)"""
     async def generate():
         try:
-            async for chunk in chat_service.process_chat_request(request.choice, request.message, request.chatroom_id, user_id):
+            async for chunk in chat_service.process_chat_request(
+                request.choice, request.message, request.chatroom_id, user_id,
+                progress=request.progress, stream_rows=request.stream_rows, aggregate=request.aggregate,
+                real_data_format=request.real_data_format
+            ):
                 yield chunk
         except Exception as e:
             import json
@@ -180,22 +215,35 @@ async def chat_endpoint(request: ChatRequest, user_id: str = Depends(get_current
 
 @router.post("/edit_message")
 async def edit_message_endpoint(request: EditMessageRequest, user_id: str = Depends(get_current_user)):
-    """메시지 수정 API 엔드포인트 (JWT 토큰에서 user_id 추출)"""
-    try:
-        result = chat_service.process_edit_request(
-            request.choice, 
-            request.message, 
-            request.chatroom_id, 
-            request.original_chat_id,
-            user_id
-        )
-        return result
-    except HTTPException:
-        raise
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"메시지 수정 실패: {str(e)}")
+    """메시지 수정 API 엔드포인트 (JWT 토큰에서 user_id 추출) - /chat과 같은 형식으로 스트리밍"""
+    async def generate():
+        try:
+            async for chunk in chat_service.process_edit_request(
+                request.choice,
+                request.message,
+                request.chatroom_id,
+                request.original_chat_id,
+                user_id,
+                progress=request.progress,
+                stream_rows=request.stream_rows,
+                aggregate=request.aggregate,
+                real_data_format=request.real_data_format
+            ):
+                yield chunk
+        except Exception as e:
+            import json
+            error_response = {"msg": f"메시지 수정 실패: {str(e)}"}
+            yield f"data: {json.dumps(error_response)}\n\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
 
 
 @router.post("/excel_analysis_stream")
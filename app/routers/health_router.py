@@ -3,11 +3,15 @@ Health router - Handles health check and utility endpoints
 """
 
 import os
-import pandas as pd
 from fastapi import APIRouter
 from datetime import datetime
 
-from app.services.data_generators import DataGenerators
+from app.services.dataset_registry import DATASET_MASKING, dataset_registry
+from app.services.generator_executor import generator_executor
+from app.services.result_cache import result_cache
+from app.services.single_flight import data_single_flight
+from app.database import db_connection
+from app.repositories.write_behind import write_behind_queue
 
 router = APIRouter()
 
@@ -32,24 +36,59 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 
+@router.get("/api/metrics/db-pool")
+async def get_db_pool_metrics():
+    """데이터베이스 연결 풀 통계 조회"""
+    return {"pool": db_connection.get_pool_stats(), "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/api/metrics/statements")
+async def get_statement_metrics():
+    """저장소 쿼리별 호출 수/실행 시간 통계 조회 (총 실행 시간이 큰 순)"""
+    return {"statements": db_connection.get_statement_stats(), "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/api/metrics/write-behind")
+async def get_write_behind_metrics():
+    """채팅 턴 write-behind 배처 통계 조회 (큐 깊이, 플러시 지연)"""
+    return {"write_behind": write_behind_queue.get_stats(), "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/api/metrics/data-generators")
+async def get_data_generator_metrics():
+    """데이터 생성 스레드풀 통계 조회 (대기열 깊이, 대기/실행 시간)"""
+    return {"executor": generator_executor.get_stats(), "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/api/metrics/data-cache")
+async def get_data_cache_metrics():
+    """데이터 생성 결과 캐시 통계 조회 (적중률, 사용 메모리, 제거 수)"""
+    return {"cache": result_cache.get_stats(), "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/api/metrics/data-coalescing")
+async def get_data_coalescing_metrics():
+    """동시 동일 데이터 생성 요청 병합 통계 조회 (진행 중인 계산, 결과를 공유받은 요청 수)"""
+    return {"single_flight": data_single_flight.get_stats(), "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/api/metrics/datasets")
+async def get_dataset_metrics():
+    """엑셀 데이터셋 레지스트리 상태 조회 (로드 시각, 크기, 로드 횟수)"""
+    return {"registry": dataset_registry.get_stats(), "timestamp": datetime.now().isoformat()}
+
+
 @router.get("/api/masking-data-info")
 async def get_masking_data_info():
     """마스킹된 데이터 정보 조회"""
-    # 마스킹된 엑셀 데이터 로드 시도
-    DataGenerators.load_masking_data(excel_name='masking_df.xlsx')
-    
-    # Note: We'd need to access the global masking_df from data_generators
-    # This is a simplified version
-    try:
-        masking_df = pd.read_excel('masking_df.xlsx')
-    except:
-        masking_df = None
+    # 레지스트리에 올라와 있는 DataFrame 사용 (파일이 바뀌었을 때만 다시 읽음)
+    masking_df = await generator_executor.run(dataset_registry.get, DATASET_MASKING)
     
     if masking_df is None:
         return {
             "status": "no_data",
             "message": "마스킹된 엑셀 파일이 로드되지 않았습니다",
-            "file_exists": os.path.exists('masking_df.xlsx')
+            "file_exists": os.path.exists(dataset_registry.path(DATASET_MASKING))
         }
     
     if masking_df.empty:
@@ -85,22 +124,16 @@ async def get_masking_data_info():
 @router.post("/api/reload-masking-data")
 async def reload_masking_data():
     """마스킹된 엑셀 데이터 다시 로드"""
-    success = DataGenerators.load_masking_data(excel_name='masking_df.xlsx')
+    masking_df = await generator_executor.run(dataset_registry.reload, DATASET_MASKING)
     
-    if success:
-        try:
-            masking_df = pd.read_excel('masking_df.xlsx')
-            shape_info = {
-                "rows": int(masking_df.shape[0]),
-                "columns": int(masking_df.shape[1])
-            }
-        except:
-            shape_info = None
-            
+    if masking_df is not None:
         return {
             "status": "success",
             "message": "마스킹된 데이터를 성공적으로 다시 로드했습니다",
-            "shape": shape_info
+            "shape": {
+                "rows": int(masking_df.shape[0]),
+                "columns": int(masking_df.shape[1])
+            }
         }
     else:
         return {
@@ -9,7 +9,7 @@ from app.models import (
     SSOLoginRequest, SSOLoginResponse, TokenVerificationResponse, 
     TokenRefreshResponse, UserInfo
 )
-from app.repositories import UserStorage
+from app.repositories import AsyncUserStorage
 from app.utils.jwt_utils import create_jwt_token, verify_jwt_token, refresh_token
 from app.config import settings
 
@@ -17,10 +17,10 @@ from app.config import settings
 class AuthService:
     """인증 서비스"""
     
-    def __init__(self, user_storage: UserStorage):
+    def __init__(self, user_storage: AsyncUserStorage):
         self.user_storage = user_storage
     
-    def process_sso_login(self, request: SSOLoginRequest) -> SSOLoginResponse:
+    async def process_sso_login(self, request: SSOLoginRequest) -> SSOLoginResponse:
         """SSO 로그인 처리"""
 
         print(f"SSO 로그인 요청 수신: {request}")
@@ -42,7 +42,7 @@ class AuthService:
         session_id = f"sso_{int(datetime.datetime.now().timestamp())}_{request.userId}"
         
         # 세션 저장
-        self.user_storage.create_session(session_id, user_data, None)
+        await self.user_storage.create_session(session_id, user_data, None)
         
         print(f"JWT 토큰 생성 완료: sessionId={session_id}, userId={request.userId}")
         
@@ -89,17 +89,17 @@ class AuthService:
             userId=payload["userId"]
         )
     
-    def logout_user(self, session_id: str) -> bool:
+    async def logout_user(self, session_id: str) -> bool:
         """사용자 로그아웃 (세션 삭제)"""
-        return self.user_storage.delete_session(session_id)
+        return await self.user_storage.delete_session(session_id)
     
-    def get_user_sessions(self, user_id: str) -> list:
+    async def get_user_sessions(self, user_id: str) -> list:
         """사용자의 모든 세션 조회"""
-        return self.user_storage.get_user_sessions(user_id)
+        return await self.user_storage.get_user_sessions(user_id)
     
-    def cleanup_expired_sessions(self) -> int:
+    async def cleanup_expired_sessions(self) -> int:
         """만료된 세션 정리"""
-        return self.user_storage.cleanup_expired_sessions(settings.JWT_EXPIRATION_HOURS)
+        return await self.user_storage.cleanup_expired_sessions(settings.JWT_EXPIRATION_HOURS)
     
     def validate_user_permissions(self, token: str, required_role: str = None) -> Dict[str, Any]:
         """사용자 권한 검증"""
@@ -4,15 +4,24 @@ Simplified chat service - Handles chat processing business logic
 
 import json
 import asyncio
-import uuid
+import functools
+import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, Optional, Union
 
-from app.models import BotResponse
-from app.repositories import ChatStorage
+from app.config import settings
+from app.models import ChatTurnRecord, PendingChatTurn
+from app.repositories import AsyncChatStorage
+from app.repositories.write_behind import WriteBehindQueue
 from app.services.data_generators import DataGenerators
 from app.services.query_analyzer import QueryAnalyzer
 from app.services.conversation_manager import ConversationManager
+from app.services.stage_pipeline import StagePipeline
+from app.services.generator_executor import GeneratorExecutor, GeneratorQueueFullError, generator_executor
+from app.services.columnar_format import FORMAT_COLUMNAR, FORMAT_RECORDS, encode_real_data
+from app.services.response_chunker import can_chunk, chunk_response_frames
+from app.services.single_flight import CoalescedTimeoutError, SingleFlight, data_single_flight
+from app.utils import json_codec
 
 # Import plotly spec generator
 try:
@@ -21,36 +30,103 @@ except ImportError:
     def generate_plotly_spec(message):
         return {"error": "plotlyjs_spec_writer not available"}
 
+logger = logging.getLogger(__name__)
+
 
 class ChatService:
     """채팅 서비스"""
     
-    def __init__(self, chat_storage: ChatStorage):
+    def __init__(self, chat_storage: AsyncChatStorage, write_behind: Optional[WriteBehindQueue] = None,
+                 executor: Optional[GeneratorExecutor] = None, single_flight: Optional[SingleFlight] = None):
         self.chat_storage = chat_storage
+        self.generator_executor = executor or generator_executor
+        self.write_behind = write_behind  # 설정 시 턴 저장을 응답 이후로 미룸
         self.data_generators = DataGenerators()
+        # 같은 생성 함수/인자로 동시에 들어온 요청은 하나의 계산 결과를 공유 (이벤트 루프에서 합류)
+        self.single_flight = single_flight or data_single_flight
         self.query_analyzer = QueryAnalyzer()
         self.conversation_manager = ConversationManager()
 
-    async def process_chat_request(self, choice: str, message: str, chatroom_id: int, user_id: str):
-        """채팅 요청 처리 (user_id 파라미터 추가)"""
+    async def _generate(self, func: Callable[..., Any], *args) -> Any:
+        """데이터 생성 함수를 전용 스레드풀에서 실행
+
+        같은 (함수 이름, 인자)로 진행 중인 계산이 있으면 스레드풀에 다시 넣지 않고 그 결과를 기다린다.
+        """
+        key = (func.__name__, args)
+        return await self.single_flight.do(key, lambda: self.generator_executor.run(func, *args))
+
+    async def _persist_turn(self, chatroom_id: int, user_id: str, message: str, data_type: str,
+                            content: Union[Dict[str, Any], str], history_response: str,
+                            user_time: datetime, response_time: datetime,
+                            payload: Optional[str] = None) -> ChatTurnRecord:
+        """채팅 턴 저장 (write-behind 모드면 id만 예약하고 INSERT는 배처에 맡김)
+
+        content는 응답 dict 또는 이미 직렬화된 JSON 문자열 (문자열이면 다시 인코딩하지 않음)
+        payload는 service_payloads로 분리해 저장할 real_data JSON (이때 content에는 real_data가 없음)
+        """
+        if self.write_behind is None:
+            return await self.chat_storage.save_turn(
+                chatroom_id, user_id, message, data_type, content, history_response,
+                user_time=user_time, response_time=response_time, payload=payload
+            )
+        
+        message_id, response_id, chat_id = await self.write_behind.reserve_ids()
+        turn = PendingChatTurn(
+            message_id=str(message_id),
+            response_id=str(response_id),
+            chat_id=chat_id,
+            chatroom_id=chatroom_id,
+            user_id=user_id,
+            chat_time=user_time,
+            response_time=response_time,
+            user_message=message,
+            data_type=data_type,
+            content=content if isinstance(content, str) else json_codec.dumps(content),
+            history_response=history_response,
+            payload=payload
+        )
+        await self.write_behind.enqueue(turn)
+        return turn
+
+    async def process_chat_request(self, choice: str, message: str, chatroom_id: int, user_id: str,
+                                   progress: bool = True, stream_rows: bool = False, aggregate: Optional[str] = None,
+                                   real_data_format: str = FORMAT_RECORDS):
+        """채팅 요청 처리 (user_id 파라미터 추가)
+
+        classify → load → transform → persist → render 단계를 실행하며, 각 단계의 실제 시작/종료 시점에
+        진행 프레임을 보낸다. progress=False이면 진행 프레임 없이 최종 응답만 보낸다.
+        stream_rows=True이면 real_data를 CHAT_STREAM_CHUNK_ROWS행씩 header/chunk/end 프레임으로 나눠 보낸다.
+        aggregate='box'이면 INLINE Trend real_data를 (FOR_KEY, key, criteria)별 박스 통계로 보낸다.
+        real_data_format='columnar'이면 real_data의 행 목록을 컬럼 형식으로 보낸다 (저장은 행 형식 그대로).
+        """
         # 채팅방 확인
-        chatroom = self.chat_storage.get_chatroom(chatroom_id)
+        chatroom = await self.chat_storage.get_chatroom(chatroom_id)
         if not chatroom:
             yield f"data: {json.dumps({'msg': '존재하지 않는 채팅방입니다.'})}\n\n"
             return
         
         # 먼저 대화 상태 전이/확인 응답을 처리
-        convo_response = self.conversation_manager.handle(chatroom_id, user_id, message)
+        convo_response = await self.conversation_manager.handle(chatroom_id, user_id, message)
         if convo_response.get('requires_confirmation') or convo_response.get('modification_mode'):
             yield f"data: {json.dumps({'msg': convo_response['response'], 'conversation': convo_response})}\n\n"
             return
         # 실행 준비 신호면 이후 데이터 처리로 진입
 
-        # choice 파라미터를 우선적으로 고려하여 질의 분석
+        pipeline = StagePipeline(progress=progress)
+        
+        # 사용자 메시지 시간 기록
+        user_message_time = datetime.now()
+        
+        # 1. classify - choice 파라미터를 우선적으로 고려하여 질의 분석
+        for frame in pipeline.begin('classify', '🔄 메시지를 분석하고 있습니다...'):
+            yield frame
         detected_type, command_type, error_msg = self.query_analyzer.analyze_query_with_choice(choice, message)
         
-        print(f"🔍 DEBUG: choice='{choice}', message='{message}'")
-        print(f"🔍 DEBUG: detected_type='{detected_type}', command_type='{command_type}', error_msg='{error_msg}'")
+        logger.debug("Analyzed query: choice=%r message=%r -> detected_type=%r command_type=%r error_msg=%r",
+                     choice, message, detected_type, command_type, error_msg)
+        # 분석이 끝났으면 결과와 관계없이 classify를 닫음 (아래 에러 응답으로 끝나도 단계가 열린 채 남지 않게)
+        for frame in pipeline.finish('classify'):
+            yield frame
         
         if error_msg:
             # 실패한 메시지는 저장하지 않고 에러만 반환
@@ -62,111 +138,164 @@ class ChatService:
             yield f"data: {json.dumps({'msg': '엑셀 파일 분석을 위해서는 파일 업로드가 필요합니다. /excel_analysis 엔드포인트를 사용해주세요.'})}\n\n"
             return
         
-        # 사용자 메시지 시간 기록
-        user_message_time = datetime.now()
-        
-        # 유효한 메시지만 저장 (user_id 파라미터 추가)
-        user_message = self.chat_storage.add_message(chatroom_id, user_id, message, 'user', detected_type)
-        
-        # 처리 시작 메시지
-        yield f"data: {json.dumps({'progress_message': '🔄 메시지를 처리하는 중...'})}\n\n"
-        await asyncio.sleep(0.3)
-        
-        # 분석 시작 메시지
-        yield f"data: {json.dumps({'progress_message': '⚙️ 데이터를 분석하고 있습니다...'})}\n\n"
-        await asyncio.sleep(0.2)
+        # 2~5. load → transform → persist → render
+        handlers = {
+            'pcm': self._process_pcm_type,
+            'two': self._process_two_tables_type,
+            'inline': self._process_inline_type,
+            'rag': self._process_rag_type
+        }
+        handler = handlers.get(detected_type)
+        if detected_type == 'inline':
+            handler = functools.partial(handler, aggregate=aggregate)
+        
+        async def persist(content: str, history_json: str, payload: Optional[str]) -> ChatTurnRecord:
+            # 메시지, 봇 응답, 히스토리(real_data 제외)를 한 트랜잭션으로 저장
+            bot_response_time = datetime.now()
+            turn = await self._persist_turn(
+                chatroom_id,
+                user_id,
+                message,
+                detected_type,
+                content,
+                history_json,
+                user_time=user_message_time,
+                response_time=bot_response_time,
+                payload=payload
+            )
+            logger.debug("Chat turn saved: chat_id=%s user_time=%s response_time=%s",
+                         turn.chat_id, user_message_time, bot_response_time)
+            return turn
+        
+        async for frame in self._run_stages(
+            pipeline, detected_type, command_type,
+            (lambda: handler(command_type, message, chatroom_id)) if handler else None,
+            persist, stream_rows, real_data_format=real_data_format
+        ):
+            yield frame
+
+    async def _run_stages(self, pipeline: StagePipeline, detected_type: str, command_type: str,
+                          generate: Optional[Callable[[], Awaitable[Optional[Dict[str, Any]]]]],
+                          persist: Callable[[str, str, Optional[str]], Awaitable[ChatTurnRecord]],
+                          stream_rows: bool, envelope_extra: Optional[Dict[str, Any]] = None,
+                          real_data_format: str = FORMAT_RECORDS):
+        """load → transform → persist → render 단계 실행 (/chat과 /edit_message 공용)
+
+        - generate: 응답을 만드는 코루틴 함수 (생성 함수 호출은 _generate로 전용 스레드풀에서 실행)
+        - persist: (content, history_json, payload)를 받아 턴을 저장하고 ChatTurnRecord를 반환하는 코루틴
+        - envelope_extra: 최종 응답 프레임에 함께 담을 값 (수정 성공 메시지 등)
+        - real_data_format: 'columnar'면 최종 프레임의 real_data만 컬럼 형식 (히스토리/저장은 행 형식 유지)
+        """
+        # 2. load - 백엔드가 결정한 데이터 타입별 데이터 생성/조회
+        load_messages = {
+            'pcm': f'📈 PCM {command_type.upper()} 데이터를 생성하고 있습니다...',
+            'two': '📊 TWO TABLES 데이터를 생성하고 있습니다...',
+            'inline': f'📊 INLINE {command_type.upper()} 데이터를 생성하고 있습니다...',
+            'rag': '🔍 RAG 데이터를 검색하고 있습니다...'
+        }
+        for frame in pipeline.begin('load', load_messages.get(detected_type, '⚙️ 데이터를 처리하고 있습니다...')):
+            yield frame
         
-        # 백엔드가 결정한 데이터 타입별 처리
+        # pandas 기반 생성 함수만 _generate로 전용 스레드풀에서 실행하고, 같은 계산을 기다리는 요청은
+        # 워커 스레드 없이 이벤트 루프에서 합류 (클라이언트가 연결을 끊으면 이 await가 취소되고,
+        # 결과를 기다리는 요청이 더 없으면 대기 중인 작업도 취소됨)
+        # 에러로 끝나는 경로는 pipeline.fail로 열린 단계(load/persist)를 닫은 뒤 에러 프레임을 보냄
         response = None
-        
         try:
-            if detected_type == 'pcm':
-                response = await self._process_pcm_type(command_type, message, chatroom_id)
-                
-            elif detected_type == 'two':
-                response = await self._process_two_tables_type(command_type, message, chatroom_id)
-                
-            elif detected_type == 'inline':
-                response = await self._process_inline_type(command_type, message, chatroom_id)
-                
-            elif detected_type == 'rag':
-                response = await self._process_rag_type(command_type, message, chatroom_id)
-                
-            # 각 타입별 진행 메시지 전송
-            if detected_type == 'pcm':
-                yield f"data: {json.dumps({'progress_message': f'📈 PCM {command_type.upper()} 데이터를 생성하고 있습니다...'})}\n\n"
-                await asyncio.sleep(0.3)
-            elif detected_type == 'two':
-                yield f"data: {json.dumps({'progress_message': '📊 TWO TABLES 데이터를 생성하고 있습니다...'})}\n\n"
-                await asyncio.sleep(0.3)
-            elif detected_type == 'inline':
-                yield f"data: {json.dumps({'progress_message': f'📊 INLINE {command_type.upper()} 데이터를 생성하고 있습니다...'})}\n\n"
-                await asyncio.sleep(0.3)
-            elif detected_type == 'rag':
-                yield f"data: {json.dumps({'progress_message': '🔍 RAG 데이터를 검색하고 있습니다...'})}\n\n"
-                await asyncio.sleep(0.3)
-                    
+            if generate:
+                response = await generate()
+        except (asyncio.TimeoutError, CoalescedTimeoutError):
+            for frame in pipeline.fail('데이터 생성 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.'):
+                yield frame
+            return
+        except GeneratorQueueFullError:
+            for frame in pipeline.fail('요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.'):
+                yield frame
+            return
         except Exception as e:
-            yield f"data: {json.dumps({'msg': f'데이터 처리 중 오류가 발생했습니다: {str(e)}'})}\n\n"
+            for frame in pipeline.fail(f'데이터 처리 중 오류가 발생했습니다: {str(e)}'):
+                yield frame
             return
         
         if response is None:
-            yield f"data: {json.dumps({'msg': '처리할 수 없는 요청입니다.'})}\n\n"
+            for frame in pipeline.fail('처리할 수 없는 요청입니다.'):
+                yield frame
             return
+        for frame in pipeline.finish('load'):
+            yield frame
+        
+        # 3. transform - real_data를 제외한 response 데이터 생성 (채팅 히스토리용)
+        for frame in pipeline.begin('transform', '⚙️ 응답 데이터를 정리하고 있습니다...'):
+            yield frame
+        # 각 페이로드는 여기서 한 번만 직렬화하고, 저장/최종 프레임에는 bytes를 이어 붙여 재사용
+        history_response = {key: value for key, value in response.items() if key != 'real_data'}
+        history_bytes = json_codec.dumps_bytes(history_response)
+        history_json = history_bytes.decode('utf-8')
+        real_data_members = {}
+        if 'real_data' in response:
+            real_data_members['real_data'] = json_codec.dumps_bytes(response['real_data'])
+        response_bytes = json_codec.splice_object(history_bytes, real_data_members)
+        
+        # 컬럼 형식은 전송용으로만 따로 직렬화 (기존 클라이언트가 읽는 히스토리는 행 형식 그대로)
+        wire_bytes = response_bytes
+        columnar = real_data_format == FORMAT_COLUMNAR and 'real_data' in response
+        if columnar:
+            wire_bytes = json_codec.splice_object(
+                json_codec.dumps_bytes({**history_response, 'real_data_format': FORMAT_COLUMNAR}),
+                {'real_data': json_codec.dumps_bytes(encode_real_data(response['real_data']))}
+            )
         
-        # 성공한 경우에만 저장 (user_id 파라미터 추가)
-        bot_response = self.chat_storage.add_response(user_message.id, chatroom_id, user_id, response)
-        
-        # real_data를 제외한 response 데이터 생성 (채팅 히스토리용)
-        history_response = response.copy()
-        if 'real_data' in history_response:
-            del history_response['real_data']
+        # 큰 real_data는 해시로 한 번만 저장 (봇 응답에는 real_data를 뺀 history_json과 payload_hash만 저장)
+        stored_content, payload = response_bytes.decode('utf-8'), None
+        if len(real_data_members.get('real_data', b'')) >= settings.CHAT_PAYLOAD_MIN_BYTES:
+            stored_content, payload = history_json, real_data_members['real_data'].decode('utf-8')
         
-        print(f"📝 Saving to chat history (real_data excluded): {json.dumps(history_response, indent=2)}")
-        print(f"📝 JSON string being saved: {json.dumps(history_response)}")
+        logger.debug("Saving to chat history (real_data excluded): %s", history_json)
+        for frame in pipeline.finish('transform'):
+            yield frame
         
-        # 봇 응답 시간 기록
-        bot_response_time = datetime.now()
+        # 4. persist
+        for frame in pipeline.begin('persist', '💾 대화를 저장하고 있습니다...'):
+            yield frame
+        try:
+            turn = await persist(stored_content, history_json, payload)
+        except Exception as e:
+            for frame in pipeline.fail(f'대화 저장 중 오류가 발생했습니다: {str(e)}'):
+                yield frame
+            return
+        for frame in pipeline.finish('persist'):
+            yield frame
+        
+        # 5. render - 최종 응답 직렬화 (실제 chat_id 사용)
+        envelope = dict(envelope_extra or {})
+        envelope.update({
+            'chat_id': turn.chat_id,  # 실제 생성된 chat_id 사용
+            'message_id': turn.message_id,
+            'response_id': turn.response_id
+        })
+        if stream_rows and not columnar and can_chunk(response):
+            # 행 청크 단위로 바로 흘려보내 클라이언트가 점진적으로 렌더링할 수 있게 함
+            logger.debug("Streaming %d rows in chunks for chat_id=%s", len(response['real_data']), turn.chat_id)
+            for frame in chunk_response_frames(envelope, response, settings.CHAT_STREAM_CHUNK_ROWS):
+                yield frame
+            return
         
-        # 채팅 히스토리에 추가 (real_data 제외) - 실제 시간 사용 (user_id 파라미터 추가)
-        chat_history = self.chat_storage.add_chat_history(
-            chatroom_id, 
-            user_id,
-            message, 
-            json.dumps(history_response),
-            user_time=user_message_time,
-            response_time=bot_response_time
+        pipeline.begin('render')
+        frame = json_codec.sse_frame(
+            json_codec.splice_object(json_codec.dumps_bytes(envelope), {'response': wire_bytes})
         )
-        print(f"📝 Chat history saved with chat_id: {chat_history.chat_id}")
-        print(f"📝 Bot response in chat history: {chat_history.bot_response}")
-        print(f"📅 User message time: {user_message_time}, Bot response time: {bot_response_time}")
-        
-        # 최종 응답 - 실제 chat_id 사용
-        chat_response = {
-            'chat_id': chat_history.chat_id,  # 실제 생성된 chat_id 사용
-            'message_id': user_message.id,
-            'response_id': bot_response.id,
-            'response': response
-        }
-        
-        print(f"📤 Sending chat response with chat_id: {chat_history.chat_id}")
+        pipeline.finish('render')
         
-        # 응답 데이터 크기 확인
-        response_json = json.dumps(chat_response)
-        print(f"📤 Response JSON size: {len(response_json)} characters")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending chat response: chat_id=%s size=%d bytes stage_timings=%s",
+                         turn.chat_id, len(frame), pipeline.summary())
         
-        # real_data 크기 확인
-        if 'real_data' in response and response['real_data']:
-            real_data_size = len(json.dumps(response['real_data']))
-            print(f"📤 Real data size: {real_data_size} characters")
-            print(f"📤 Real data records: {len(response['real_data'])}")
-        
-        yield f"data: {response_json}\n\n"
+        yield frame
 
     async def _process_pcm_type(self, command_type: str, message: str, chatroom_id: int) -> Dict[str, Any]:
         """PCM 타입 처리"""
         if command_type == 'trend':
-            data = self.data_generators.generate_pcm_trend_data()
+            data = await self._generate(self.data_generators.generate_pcm_trend_data)
             total_records = len(data) if isinstance(data, list) else 0
             device_types = []
             date_range = "N/A"
@@ -188,7 +317,7 @@ class ChatService:
             }
             
         elif command_type == 'commonality':
-            data, commonality_info = self.data_generators.generate_commonality_data()
+            data, commonality_info = await self._generate(self.data_generators.generate_commonality_data)
             success_message = f"✅ COMMONALITY 데이터를 성공적으로 받았습니다!\n• Result Type: commonality\n• Total Records: {len(data) if isinstance(data, list) else sum(len(v) if isinstance(v, list) else 0 for v in data.values()) if isinstance(data, dict) else 0}\n• Chat ID: {chatroom_id}"
             
             return {
@@ -201,7 +330,7 @@ class ChatService:
             }
             
         elif command_type == 'sameness':
-            data, _ = self.data_generators.generate_commonality_data()
+            data, _ = await self._generate(self.data_generators.generate_commonality_data)
             success_message = f"✅ SAMENESS 데이터를 성공적으로 받았습니다!\n• Result Type: sameness\n• Total Records: {len(data) if isinstance(data, list) else sum(len(v) if isinstance(v, list) else 0 for v in data.values()) if isinstance(data, dict) else 0}\n• Chat ID: {chatroom_id}"
             
             return {
@@ -213,7 +342,7 @@ class ChatService:
             }
             
         elif command_type == 'point':
-            data = self.data_generators.generate_pcm_point_data()
+            data = await self._generate(self.data_generators.generate_pcm_point_data)
             total_records = len(data) if isinstance(data, list) else 0
             pcm_sites = []
             date_range = "N/A"
@@ -235,7 +364,7 @@ class ChatService:
             }
             
         elif command_type in ['sameness_to_trend', 'commonality_to_trend', 'to_trend']:
-            data = self.data_generators.generate_pcm_to_trend_data()
+            data = await self._generate(self.data_generators.generate_pcm_to_trend_data)
             total_records = 0
             if isinstance(data, list):
                 total_records = len(data)
@@ -266,7 +395,7 @@ class ChatService:
             elif command_type == 'two_tables_empty_both':
                 test_scenario = 'both_empty'
             
-            data = self.data_generators.generate_two_tables_data(test_scenario)
+            data = await self._generate(self.data_generators.generate_two_tables_data, test_scenario)
             
             lot_hold_count = 0
             pe_confirm_count = 0
@@ -289,47 +418,48 @@ class ChatService:
         
         return None
 
-    async def _process_inline_type(self, command_type: str, message: str, chatroom_id: int) -> Dict[str, Any]:
-        """Inline 타입 처리"""
-        print(f"🎯 DEBUG: Processing inline type with command_type='{command_type}'")
+    async def _process_inline_type(self, command_type: str, message: str, chatroom_id: int,
+                                   aggregate: Optional[str] = None) -> Dict[str, Any]:
+        """Inline 타입 처리 (aggregate='box'면 Trend real_data를 박스 통계로)"""
+        logger.debug("Processing inline type with command_type=%r aggregate=%r", command_type, aggregate)
         
         if command_type == 'trend_initial':
-            data = self.data_generators.generate_inline_trend_initial_data()
+            data = await self._generate(self.data_generators.generate_inline_trend_initial_data, aggregate)
             success_message = f"✅ INLINE TREND INITIAL 데이터를 성공적으로 받았습니다!\n• Result Type: inline_trend_initial\n• Total Records: {len(data) if isinstance(data, list) else 0}\n• Chat ID: {chatroom_id}\n• Criteria: DEVICE"
             
             response = {
                 'result': 'inline_trend_initial',
                 'criteria': 'DEVICE',
-                'real_data': json.dumps(data),
+                'real_data': data,
                 'success_message': success_message
             }
-            print(f"🎯 DEBUG: Created inline_trend_initial response: {response.keys()}")
+            if aggregate:
+                response['aggregate'] = aggregate
             return response
             
         elif command_type == 'cpk_achieve_rate_initial':
             # CPK 달성률 초기 분석 데이터 생성
-            data = self.data_generators.generate_cpk_achieve_rate_data()
+            data = await self._generate(self.data_generators.generate_cpk_achieve_rate_data)
             table_count = len(data.get('table_data', []))
             graph_count = len(data.get('graph_data', []))
             success_message = f"✅ CPK 달성률 분석 데이터를 성공적으로 받았습니다!\n• Result Type: cpk_achieve_rate_initial\n• Table Records: {table_count}\n• Graph Points: {graph_count}\n• Chat ID: {chatroom_id}"
             
             response = {
                 'result': 'cpk_achieve_rate_initial',
-                'real_data': json.dumps(data),
+                'real_data': data,
                 'success_message': success_message
             }
-            print(f"🎯 DEBUG: Created cpk_achieve_rate_initial response: {response.keys()}")
             return response
             
         elif command_type == 'trend_followup':
             if "spec" in message.split(" "):
-                llm_spec = generate_plotly_spec(message)
-                print(f"🎯 DEBUG: LLM Spec: {llm_spec}")
-                data = self.data_generators.generate_inline_trend_initial_data()
+                llm_spec = await self.generator_executor.run(generate_plotly_spec, message)
+                logger.debug("LLM spec: %s", llm_spec)
+                data = await self._generate(self.data_generators.generate_inline_trend_initial_data)
                 success_message = f"✅ INLINE TREND FOLLOWUP Plotly Spec을 성공적으로 받았습니다!\n• Result Type: inline_trend_followup_spec\n• Chat ID: {chatroom_id}"
                 return {
                     'result': 'inline_trend_followup',
-                    'real_data': json.dumps(data),
+                    'real_data': data,
                     'llm_spec': json.dumps(llm_spec),
                     'success_message': success_message
                 }
@@ -350,20 +480,23 @@ class ChatService:
                 elif 'para' in message_lower:
                     criteria = 'PARA'
                 
-                print(f"🎯 Extracted criteria: {criteria} from message: {message}")
+                logger.debug("Extracted criteria %r from message %r", criteria, message)
                 
-                data = self.data_generators.generate_inline_trend_followup_data(criteria)
+                data = await self._generate(self.data_generators.generate_inline_trend_followup_data, criteria, aggregate)
                 success_message = f"✅ INLINE TREND FOLLOWUP 데이터를 성공적으로 받았습니다!\n• Result Type: inline_trend_followup\n• Total Records: {len(data) if isinstance(data, list) else 0}\n• Chat ID: {chatroom_id}\n• Criteria: {criteria}"
                 
-                return {
+                response = {
                     'result': 'inline_trend_followup',
                     'criteria': criteria,
-                    'real_data': json.dumps(data),
+                    'real_data': data,
                     'success_message': success_message
                 }
+                if aggregate:
+                    response['aggregate'] = aggregate
+                return response
                 
         elif command_type in ['analysis', 'performance']:
-            data = self.data_generators.generate_inline_analysis_data()
+            data = await self._generate(self.data_generators.generate_inline_analysis_data)
             result_type = f"inline_{command_type}"
             success_message = f"✅ INLINE {command_type.upper()} 데이터를 성공적으로 받았습니다!\n• Result Type: {result_type}\n• Total Records: {len(data) if isinstance(data, list) else 0}\n• Chat ID: {chatroom_id}"
             
@@ -380,7 +513,7 @@ class ChatService:
     async def _process_rag_type(self, command_type: str, message: str, chatroom_id: int) -> Dict[str, Any]:
         """RAG 타입 처리"""
         if command_type == 'search':
-            answer = self.data_generators.generate_rag_answer_data()
+            answer = await self._generate(self.data_generators.generate_rag_answer_data)
             success_message = f"✅ RAG 파일 검색이 완료되었습니다!\n• Result Type: rag\n• Found Files: {len(answer) if isinstance(answer, list) else 0}\n• Chat ID: {chatroom_id}"
             
             return {
@@ -402,84 +535,76 @@ class ChatService:
                 'success_message': success_message
             }
 
-    def process_edit_request(self, choice: str, message: str, chatroom_id: int, original_chat_id: int, user_id: str) -> Dict[str, Any]:
-        """메시지 수정 요청 처리 (user_id 파라미터 추가)"""
-        existing_chat_id = original_chat_id
-        print(f"🔧 Using existing chat_id: {existing_chat_id}")
+    async def process_edit_request(self, choice: str, message: str, chatroom_id: int, original_chat_id: int,
+                                   user_id: str, progress: bool = True, stream_rows: bool = False,
+                                   aggregate: Optional[str] = None, real_data_format: str = FORMAT_RECORDS):
+        """메시지 수정 요청 처리 - /chat과 같은 단계 파이프라인으로 다시 생성하고 SSE로 스트리밍
+
+        수정한 히스토리 갱신과 새 메시지/봇 응답 저장은 한 트랜잭션(save_edit_turn)으로 처리하며,
+        수정할 히스토리가 없으면 새 턴으로 저장한다.
+        """
+        logger.debug("Editing chat_id=%s", original_chat_id)
+        chatroom = await self.chat_storage.get_chatroom(chatroom_id)
+        if not chatroom:
+            yield f"data: {json.dumps({'msg': '존재하지 않는 채팅방입니다.'})}\n\n"
+            return
         
+        pipeline = StagePipeline(progress=progress)
+        
+        # 1. classify
+        for frame in pipeline.begin('classify', '🔄 수정된 메시지를 분석하고 있습니다...'):
+            yield frame
         detected_type, command_type, error_msg = self.query_analyzer.analyze_query_with_choice(choice, message)
-        print(f"🔍 Edit message analysis - Type: {detected_type}, Command: {command_type}, Error: {error_msg}")
+        logger.debug("Edit message analysis: detected_type=%r command_type=%r error_msg=%r",
+                     detected_type, command_type, error_msg)
+        for frame in pipeline.finish('classify'):
+            yield frame
         
         if error_msg:
-            raise ValueError(error_msg)
-        
-        # 동기식으로 처리하기 위해 별도 메서드 사용
-        response = self._process_edit_sync(detected_type, command_type, message)
-        
-        if response is None:
-            raise ValueError("처리할 수 없는 요청입니다.")
-        
-        # 응답 저장 (user_id 파라미터 추가)
-        response_id = str(uuid.uuid4())
-        bot_response = BotResponse(
-            id=response_id,
-            message_id=str(existing_chat_id),
-            chatroom_id=chatroom_id,
-            user_id=user_id,
-            content=response,
-            timestamp=datetime.now()
-        )
-        self.chat_storage.responses[response_id] = bot_response
-        
-        # 히스토리 업데이트
-        history_response = response.copy()
-        if 'real_data' in history_response:
-            del history_response['real_data']
+            yield f"data: {json.dumps({'msg': error_msg})}\n\n"
+            return
         
-        existing_history = self.chat_storage.edit_chat_history(
-            chatroom_id, 
-            existing_chat_id, 
-            user_id,
-            message, 
-            json.dumps(history_response)
-        )
+        edit_time = datetime.now()
         
-        if not existing_history:
-            existing_history = self.chat_storage.add_chat_history(
-                chatroom_id,
-                user_id,
-                message,
-                json.dumps(history_response),
-                user_time=datetime.now(),
-                response_time=datetime.now()
+        async def persist(content: str, history_json: str, payload: Optional[str]) -> ChatTurnRecord:
+            turn = await self.chat_storage.save_edit_turn(
+                chatroom_id, original_chat_id, user_id, message, detected_type, content, history_json,
+                edit_time=edit_time, payload=payload
             )
-            existing_history.chat_id = existing_chat_id
-            print(f"✅ Created new chat history with existing chat_id: {existing_chat_id}")
-        
-        return {
-            'success': True,
-            'message': '메시지가 성공적으로 수정되었습니다.',
-            'chat_id': existing_chat_id,
-            'response_id': bot_response.id,
-            'response': response
-        }
+            if turn is None:
+                turn = await self._persist_turn(
+                    chatroom_id, user_id, message, detected_type, content, history_json,
+                    user_time=edit_time, response_time=datetime.now(), payload=payload
+                )
+                logger.info("Chat history %s not found, saved edit as new chat_id=%s", original_chat_id, turn.chat_id)
+            return turn
+        
+        async for frame in self._run_stages(
+            pipeline, detected_type, command_type,
+            lambda: self._process_edit(detected_type, command_type, message, aggregate),
+            persist, stream_rows,
+            envelope_extra={'success': True, 'message': '메시지가 성공적으로 수정되었습니다.'},
+            real_data_format=real_data_format
+        ):
+            yield frame
 
-    def _process_edit_sync(self, detected_type: str, command_type: str, message: str) -> Dict[str, Any]:
-        """동기식 편집 처리"""
+    async def _process_edit(self, detected_type: str, command_type: str, message: str,
+                            aggregate: Optional[str] = None) -> Dict[str, Any]:
+        """편집 처리 (타입별 수정 핸들러로 분기)"""
         if detected_type == 'pcm':
-            return self._process_pcm_edit_sync(command_type)
+            return await self._process_pcm_edit(command_type)
         elif detected_type == 'two':
-            return self._process_two_tables_edit_sync(command_type)
+            return await self._process_two_tables_edit(command_type)
         elif detected_type == 'inline':
-            return self._process_inline_edit_sync(command_type, message)
+            return await self._process_inline_edit(command_type, message, aggregate)
         elif detected_type == 'rag':
-            return self._process_rag_edit_sync(command_type, message)
+            return await self._process_rag_edit(command_type, message)
         return None
 
-    def _process_pcm_edit_sync(self, command_type: str) -> Dict[str, Any]:
-        """PCM 수정 동기 처리"""
+    async def _process_pcm_edit(self, command_type: str) -> Dict[str, Any]:
+        """PCM 수정 처리"""
         if command_type == 'trend':
-            data = self.data_generators.generate_pcm_trend_data()
+            data = await self._generate(self.data_generators.generate_pcm_trend_data)
             return {
                 'result': 'lot_start',
                 'real_data': data,
@@ -487,7 +612,7 @@ class ChatService:
                 'timestamp': datetime.now().isoformat()
             }
         elif command_type == 'commonality':
-            data, commonality = self.data_generators.generate_commonality_data()
+            data, commonality = await self._generate(self.data_generators.generate_commonality_data)
             return {
                 'result': 'commonality_start',
                 'real_data': data,
@@ -498,8 +623,8 @@ class ChatService:
         # ... Add other PCM command types as needed
         return None
 
-    def _process_two_tables_edit_sync(self, command_type: str) -> Dict[str, Any]:
-        """Two Tables 수정 동기 처리"""
+    async def _process_two_tables_edit(self, command_type: str) -> Dict[str, Any]:
+        """Two Tables 수정 처리"""
         if command_type in ['two_tables', 'two_tables_empty_lot', 'two_tables_empty_pe', 'two_tables_empty_both']:
             test_scenario = None
             if command_type == 'two_tables_empty_lot':
@@ -509,7 +634,7 @@ class ChatService:
             elif command_type == 'two_tables_empty_both':
                 test_scenario = 'both_empty'
             
-            data = self.data_generators.generate_two_tables_data(test_scenario)
+            data = await self._generate(self.data_generators.generate_two_tables_data, test_scenario)
             return {
                 'result': 'lot_hold_pe_confirm_module',
                 'real_data': data['real_data'],
@@ -518,23 +643,27 @@ class ChatService:
             }
         return None
 
-    def _process_inline_edit_sync(self, command_type: str, message: str) -> Dict[str, Any]:
-        """Inline 수정 동기 처리"""
+    async def _process_inline_edit(self, command_type: str, message: str,
+                                   aggregate: Optional[str] = None) -> Dict[str, Any]:
+        """Inline 수정 처리"""
         if command_type == 'trend_initial':
-            data = self.data_generators.generate_inline_trend_initial_data()
-            return {
+            data = await self._generate(self.data_generators.generate_inline_trend_initial_data, aggregate)
+            response = {
                 'result': 'inline_trend_initial',
                 'criteria': 'DEVICE',
-                'real_data': json.dumps(data),
+                'real_data': data,
                 'success_message': f"✅ INLINE TREND INITIAL 데이터를 성공적으로 받았습니다! (Edit Mode)"
             }
+            if aggregate:
+                response['aggregate'] = aggregate
+            return response
         elif command_type == 'cpk_achieve_rate_initial':
-            data = self.data_generators.generate_cpk_achieve_rate_data()
+            data = await self._generate(self.data_generators.generate_cpk_achieve_rate_data)
             table_count = len(data.get('table_data', []))
             graph_count = len(data.get('graph_data', []))
             return {
                 'result': 'cpk_achieve_rate_initial',
-                'real_data': json.dumps(data),
+                'real_data': data,
                 'success_message': f"✅ CPK 달성률 분석 데이터를 성공적으로 받았습니다! (Edit Mode)\n• Table Records: {table_count}\n• Graph Points: {graph_count}"
             }
         elif command_type == 'trend_followup':
@@ -546,20 +675,23 @@ class ChatService:
             elif 'oper' in message.lower():
                 criteria = 'OPER'
             
-            data = self.data_generators.generate_inline_trend_followup_data(criteria)
-            return {
+            data = await self._generate(self.data_generators.generate_inline_trend_followup_data, criteria, aggregate)
+            response = {
                 'result': 'inline_trend_followup',
                 'criteria': criteria,
-                'real_data': json.dumps(data),
+                'real_data': data,
                 'success_message': f"✅ INLINE TREND FOLLOWUP 데이터를 성공적으로 받았습니다! (Edit Mode)"
             }
+            if aggregate:
+                response['aggregate'] = aggregate
+            return response
         # ... Add other inline command types as needed
         return None
 
-    def _process_rag_edit_sync(self, command_type: str, message: str) -> Dict[str, Any]:
-        """RAG 수정 동기 처리"""
+    async def _process_rag_edit(self, command_type: str, message: str) -> Dict[str, Any]:
+        """RAG 수정 처리"""
         if command_type == 'search':
-            answer = self.data_generators.generate_rag_answer_data()
+            answer = await self._generate(self.data_generators.generate_rag_answer_data)
             return {
                 'result': 'rag',
                 'files': answer,
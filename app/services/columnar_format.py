@@ -0,0 +1,82 @@
+"""
+Columnar format - Column-oriented encoding of real_data record lists for the response wire
+"""
+
+from typing import Any, Dict, List
+
+# 요청 플래그 값 (real_data_format)
+FORMAT_RECORDS = 'records'
+FORMAT_COLUMNAR = 'columnar'
+SUPPORTED_FORMATS = (FORMAT_RECORDS, FORMAT_COLUMNAR)
+
+
+def is_record_list(value: Any) -> bool:
+    """dict 행 목록인지 (첫 행에 스칼라 값이 하나라도 있어야 행으로 봄)
+
+    [{'lot_hold_module': [...]}, {'pe_confirm_module': [...]}]처럼 표를 담는 컨테이너 목록은 행이 아님.
+    """
+    if not isinstance(value, list) or not value or not isinstance(value[0], dict):
+        return False
+    if not all(isinstance(row, dict) for row in value):
+        return False
+    return any(not isinstance(v, (list, dict)) for v in value[0].values())
+
+
+def _is_constant(values: List[Any]) -> bool:
+    first = values[0]
+    # 대부분의 컬럼은 마지막 값만 봐도 상수가 아님
+    if values[-1] != first or values.count(first) != len(values):
+        return False
+    # 1 == 1.0 == True처럼 ==로는 같아도 타입이 다르면 원래 값을 되살릴 수 없음
+    first_type = type(first)
+    return all(type(v) is first_type for v in values)
+
+
+def to_columnar(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """행 목록 → {format, length, columns, values, constants}
+
+    - columns: 행마다 값이 달라지는 컬럼 이름 (처음 나온 순서), values: 같은 순서의 컬럼별 값 배열
+    - constants: 모든 행에서 값이 같은 컬럼 (USL/TGT/LSL 등)은 배열 대신 값 하나만 보냄
+    - 어떤 행에 없는 컬럼은 그 행 값을 None으로 채움
+    """
+    if not rows:
+        return {'format': FORMAT_COLUMNAR, 'length': 0, 'columns': [], 'values': [], 'constants': {}}
+
+    # 보통 모든 행의 키가 같으므로 키 집합 비교만 하고, 다를 때만 컬럼을 합침
+    first_keys = rows[0].keys()
+    columns = dict.fromkeys(first_keys)
+    uniform = all(map(first_keys.__eq__, map(dict.keys, rows)))
+    if not uniform:
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+
+    if uniform:
+        column_values = [[row[name] for row in rows] for name in columns]
+    else:
+        column_values = [[row.get(name) for row in rows] for name in columns]
+
+    varying, values, constants = [], [], {}
+    for name, column in zip(columns, column_values):
+        if len(rows) > 1 and _is_constant(column):
+            constants[name] = column[0]
+        else:
+            varying.append(name)
+            values.append(column)
+    return {
+        'format': FORMAT_COLUMNAR,
+        'length': len(rows),
+        'columns': varying,
+        'values': values,
+        'constants': constants,
+    }
+
+
+def encode_real_data(real_data: Any) -> Any:
+    """real_data 안의 행 목록을 모두 컬럼 형식으로 바꾼 사본 (dict/컨테이너 목록은 안쪽까지 따라감)"""
+    if is_record_list(real_data):
+        return to_columnar(real_data)
+    if isinstance(real_data, dict):
+        return {key: encode_real_data(value) for key, value in real_data.items()}
+    if isinstance(real_data, list):
+        return [encode_real_data(value) for value in real_data]
+    return real_data
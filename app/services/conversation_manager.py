@@ -1,18 +1,18 @@
 from typing import Dict, Any
 
 from app.models.conversation_models import ConversationState, SessionContext
-from app.repositories.conversation_session import ConversationSessionRepo
+from app.repositories.async_repositories import AsyncConversationSessionRepo
 
 
 class ConversationManager:
     """대화 상태 전이 및 영속화를 담당하는 매니저"""
 
-    def __init__(self, repo: ConversationSessionRepo | None = None):
-        self.repo = repo or ConversationSessionRepo()
+    def __init__(self, repo: AsyncConversationSessionRepo | None = None):
+        self.repo = repo or AsyncConversationSessionRepo()
 
-    def handle(self, chatroom_id: int, user_id: str, message: str) -> Dict[str, Any]:
+    async def handle(self, chatroom_id: int, user_id: str, message: str) -> Dict[str, Any]:
         """상태 로드→전이→저장까지 수행하고 응답 반환"""
-        context, version = self.repo.get_or_create(chatroom_id, user_id)
+        context, version = await self.repo.get_or_create(chatroom_id, user_id)
 
         # 간단한 상태머신: INITIAL에서만 파라미터 확인으로 이동하는 예시
         if context.state == ConversationState.INITIAL:
@@ -50,7 +50,7 @@ class ConversationManager:
             context.state = ConversationState.INITIAL
             response = {"response": "초기화되었습니다."}
 
-        self.repo.save(chatroom_id, user_id, context, expected_version=version)
+        await self.repo.save(chatroom_id, user_id, context, expected_version=version)
         return response
 
 
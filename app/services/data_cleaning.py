@@ -0,0 +1,84 @@
+"""
+Data cleaning - Vectorized JSON-safe cleaning of source DataFrames before record conversion
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# 측정값 컬럼(NO_VAL1..5)에서 결측을 뜻하는 값
+NO_VAL_PREFIX = 'NO_VAL'
+NO_VAL_SENTINEL = 9
+
+# pd.api.types.infer_dtype 결과 중 날짜/시간 값만 담긴 object 컬럼
+_DATETIME_INFERRED = {'datetime', 'datetime64', 'date'}
+
+
+def _format_datetime64(values: pd.Series) -> pd.Series:
+    """datetime64 컬럼 → 문자열 (Series.dt.strftime보다 빠른 numpy 변환, NaT는 NaN)"""
+    if values.dt.tz is not None:
+        values = values.dt.tz_localize(None)
+    text = np.datetime_as_string(values.to_numpy(dtype='datetime64[s]'), unit='s')
+    return pd.Series(text, index=values.index).str.replace('T', ' ', regex=False).where(values.notna())
+
+
+def _format_object_datetimes(values: pd.Series) -> pd.Series:
+    """object 컬럼 안의 Timestamp/datetime 값만 문자열로 (다른 값은 그대로)"""
+    inferred = pd.api.types.infer_dtype(values, skipna=True)
+    if inferred in _DATETIME_INFERRED:
+        return _format_datetime64(pd.to_datetime(values, errors='coerce')).where(values.notna(), None)
+    if inferred != 'mixed':
+        # 문자열/숫자만 있는 컬럼 (가장 흔한 경우)은 값마다 검사하지 않음
+        return values
+    is_datetime = values.map(lambda v: isinstance(v, (datetime, date)))
+    if not is_datetime.any():
+        return values
+    formatted = _format_datetime64(pd.to_datetime(values[is_datetime], errors='coerce'))
+    values = values.copy()
+    values[is_datetime] = formatted
+    return values
+
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 DataFrame을 JSON으로 보낼 수 있게 컬럼 단위로 정리한 새 DataFrame (원본은 수정하지 않음)
+
+    - datetime64 컬럼과 object 컬럼 안의 Timestamp/datetime → 'YYYY-MM-DD HH:MM:SS' 문자열
+    - float 컬럼의 inf/-inf → NaN (to_records에서 None)
+    - NO_VAL* 컬럼의 결측 코드(9) → NaN
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = _format_datetime64(values)
+        elif values.dtype == object:
+            values = _format_object_datetimes(values)
+        elif pd.api.types.is_float_dtype(values):
+            values = values.where(np.isfinite(values))
+
+        if isinstance(col, str) and col.startswith(NO_VAL_PREFIX):
+            values = values.mask(values == NO_VAL_SENTINEL)
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """clean_frame 결과를 레코드 목록으로 변환 (NaN/NA → None, numpy 스칼라 → Python 기본 타입)
+
+    DataFrame.to_dict(orient='records')는 값마다 타입을 변환하므로, 컬럼마다 tolist()로 한 번에
+    Python 값 목록을 만든 뒤 행 단위로 묶는다.
+    """
+    columns = list(df.columns)
+    column_values = []
+    for col in columns:
+        values = df[col]
+        missing = values.isna().to_numpy()
+        if missing.any():
+            array = values.astype(object).to_numpy(copy=True)
+            array[missing] = None
+            column_values.append(array.tolist())
+        else:
+            column_values.append(values.tolist())
+    return [dict(zip(columns, row)) for row in zip(*column_values)]
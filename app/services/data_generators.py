@@ -3,36 +3,29 @@ Data generators service - Handles generation of sample and real data
 """
 
 import pandas as pd
-import numpy as np
 import random
-import math
-import json
+import logging
 import os
-from datetime import datetime
 from typing import Dict, List, Tuple, Any, Optional
 
-# 전역 변수로 마스킹된 데이터프레임 저장
-masking_df = None
+from app.services.data_cleaning import clean_frame, to_records
+from app.services.dataset_registry import DATASET_IQC, DATASET_MASKING, dataset_registry
+from app.services.result_cache import result_cache, uncached
+from app.services.trend_aggregation import AGGREGATE_BOX, box_plot_stats
+
+logger = logging.getLogger(__name__)
 
 
 class DataGenerators:
     """데이터 생성 서비스"""
     
     @staticmethod
-    def load_masking_data(excel_name: str = 'masking_df.xlsx') -> bool:
-        """마스킹된 엑셀 데이터 로드"""
-        global masking_df
-        try:
-            masking_df = pd.read_excel(excel_name)
-            print(f"📊 마스킹 데이터 로드 완료: {masking_df.shape[0]}행 {masking_df.shape[1]}열")
-            print(f"📊 컬럼 목록: {list(masking_df.columns)}")
-            return True
-        except FileNotFoundError:
-            print("⚠️ masking_df.xlsx 파일을 찾을 수 없습니다. 샘플 데이터를 사용합니다.")
-            return False
-        except Exception as e:
-            print(f"❌ 마스킹 데이터 로드 오류: {e}")
-            return False
+    def _inline_trend_records(df: pd.DataFrame, criteria: str, aggregate: Optional[str]) -> List:
+        """INLINE Trend real_data - 원본 행, aggregate='box'면 (FOR_KEY, key, criteria)별 박스 통계"""
+        if aggregate != AGGREGATE_BOX:
+            return to_records(df)
+        group_columns = [c for c in ('FOR_KEY', 'key', criteria) if c in df.columns]
+        return to_records(box_plot_stats(df, group_columns))
 
     @staticmethod
     def generate_pcm_trend_data() -> dict:
@@ -65,8 +58,8 @@ class DataGenerators:
         # 테이블용 배열 데이터 생성 (PCM 트렌드 데이터를 배열로 변환)
         pcm_data = DataGenerators.generate_pcm_trend_data()
         
-        print(f"🔍 generate_commonality_data: pcm_data type = {type(pcm_data)}")
-        print(f"🔍 generate_commonality_data: pcm_data keys = {list(pcm_data.keys()) if isinstance(pcm_data, dict) else 'not dict'}")
+        logger.debug("generate_commonality_data: pcm_data type=%s keys=%s", type(pcm_data),
+                     list(pcm_data.keys()) if isinstance(pcm_data, dict) else None)
         
         # PARA별 객체를 배열로 변환
         table_data = []
@@ -77,9 +70,8 @@ class DataGenerators:
                     'PARA': para_name
                 })
         
-        print(f"🔍 generate_commonality_data: table_data type = {type(table_data)}")
-        print(f"🔍 generate_commonality_data: table_data length = {len(table_data)}")
-        print(f"🔍 generate_commonality_data: table_data sample = {table_data[:2] if table_data else 'empty'}")
+        logger.debug("generate_commonality_data: %d table rows, sample=%s",
+                     len(table_data), table_data[:2])
         
         # Commonality 정보
         commonality = {
@@ -123,87 +115,31 @@ class DataGenerators:
         ]
 
     @staticmethod
+    @result_cache.cached(dataset=DATASET_IQC)
     def generate_inline_analysis_data() -> List:
         """INLINE 분석 데이터 생성"""
-        # 마스킹된 엑셀 데이터 로드 시도
-        DataGenerators.load_masking_data(excel_name='iqc_data.xlsx')
-        global masking_df
+        # 공유 DataFrame이므로 읽기만 함 - clean_frame이 정리된 새 DataFrame을 만듦 (파일이 바뀌었을 때만 다시 읽음)
+        masking_df = dataset_registry.get(DATASET_IQC)
 
         # 실제 엑셀 데이터가 있으면 사용
         if masking_df is not None and not masking_df.empty:
             try:
-                print("📊 실제 마스킹 데이터 사용")
-                
-                # 데이터프레임 복사 후 정리
-                df_clean = masking_df.copy()
+                logger.debug("Using real data from iqc_data.xlsx")
                 
-                # 1. datetime/timestamp 컬럼들을 문자열로 변환
-                for col in df_clean.columns:
-                    if df_clean[col].dtype == 'datetime64[ns]' or pd.api.types.is_datetime64_any_dtype(df_clean[col]):
-                        df_clean[col] = df_clean[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-                        print(f"📅 날짜 컬럼 변환: {col}")
-                    elif df_clean[col].dtype == 'object':
-                        # object 타입 컬럼에서 숨겨진 Timestamp 찾기
-                        sample_val = df_clean[col].dropna().iloc[0] if len(df_clean[col].dropna()) > 0 else None
-                        if sample_val is not None and isinstance(sample_val, (pd.Timestamp, datetime)):
-                            df_clean[col] = df_clean[col].apply(
-                                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) and isinstance(x, (pd.Timestamp, datetime)) else x
-                            )
-                            print(f"📅 숨겨진 날짜 컬럼 변환: {col}")
+                # 날짜 → 문자열, inf/NaN·NO_VAL 결측 코드 → None (컬럼 단위로 한 번에 처리)
+                df_clean = clean_frame(masking_df)
+                data = to_records(df_clean)
                 
-                # 2. NaN, inf, -inf 값들을 None으로 변환 (중요!)
-                df_clean = df_clean.replace([np.nan, np.inf, -np.inf], None)
-                
-                # 3. numpy 타입들을 Python 기본 타입으로 변환
-                for col in df_clean.columns:
-                    if df_clean[col].dtype == 'int64':
-                        df_clean[col] = df_clean[col].astype('Int64')  # nullable integer
-                    elif df_clean[col].dtype == 'float64':
-                        pass  # float은 그대로
-
-                # 4. 딕셔너리로 변환
-                data = df_clean.to_dict(orient='records')
-                
-                # 5. 각 레코드에서 모든 Timestamp 객체를 문자열로 변환
-                for record in data:
-                    for key, value in list(record.items()):
-                        if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                            record[key] = None
-                        elif isinstance(value, (pd.Timestamp, datetime)):
-                            record[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                            print(f"🚨 레코드 내 Timestamp 변환: {key}")
-                        elif key.startswith('NO_VAL') and value == 9:
-                            record[key] = None
-                        elif hasattr(value, 'item'):  # numpy scalar types
-                            record[key] = value.item()
-                
-                # 6. JSON 직렬화 테스트
-                try:
-                    json.dumps(data[0] if data else {}, default=str)
-                    print("✅ JSON 직렬화 테스트 통과")
-                except Exception as json_error:
-                    print(f"🚨 JSON 직렬화 테스트 실패: {json_error}")
-                    # 문제가 있는 값들을 모두 문자열로 변환
-                    for record in data:
-                        for key, value in list(record.items()):
-                            try:
-                                json.dumps(value)
-                            except:
-                                print(f"🔧 문제 값 수정: {key} = {type(value)} -> str")
-                                record[key] = str(value) if value is not None else None
-                
-                print(f"✅ 데이터 변환 완료: {len(data)}개 레코드")
-                print(f"📊 실제 데이터 컬럼: {list(df_clean.columns)}")
+                logger.debug("Converted %d records, columns=%s", len(data), list(df_clean.columns))
                 if len(data) > 0:
-                    print(f"📊 첫 번째 행 샘플: {data[0]}")
+                    logger.debug("First record: %s", data[0])
                 
                 return data
                 
             except Exception as e:
-                print(f"❌ 실제 데이터 처리 오류: {e}")
-                print("📊 샘플 데이터로 대체합니다.")
+                logger.warning("Failed to process real data, using sample data: %s", e)
         
-        print("📊 샘플 데이터 생성 (엑셀 파일 없음)")
+        logger.debug("Generating sample inline analysis data")
         data = []
         for i in range(1, 16):
             data.append({
@@ -213,78 +149,55 @@ class DataGenerators:
                 'bottleneck_count': random.randint(1, 5),
                 'optimization_potential': round(random.uniform(0.1, 0.3), 3)
             })
-        return data
+        # 랜덤 샘플은 원본을 다시 읽을 수 있게 되면 바로 바뀌어야 하므로 캐시하지 않음
+        return uncached(data)
 
     @staticmethod
-    def generate_inline_trend_initial_data() -> List:
-        """INLINE Trend Initial 데이터 생성 (DEVICE 기준)"""
-        DataGenerators.load_masking_data(excel_name='iqc_data.xlsx')
-        global masking_df
+    @result_cache.cached(dataset=DATASET_IQC)
+    def generate_inline_trend_initial_data(aggregate: Optional[str] = None) -> List:
+        """INLINE Trend Initial 데이터 생성 (DEVICE 기준, aggregate='box'면 박스 통계)"""
+        # 공유 DataFrame이므로 읽기만 함 - clean_frame이 정리된 새 DataFrame을 만듦 (파일이 바뀌었을 때만 다시 읽음)
+        masking_df = dataset_registry.get(DATASET_IQC)
 
         # 실제 엑셀 데이터가 있으면 사용
         if masking_df is not None and not masking_df.empty:
             try:
-                print("📊 실제 마스킹 데이터 사용")
-                
-                # 데이터프레임 복사 후 정리
-                df_clean = masking_df.copy()
+                logger.debug("Using real data from iqc_data.xlsx")
                 
-                # 1. datetime/timestamp 컬럼들을 문자열로 변환
-                for col in df_clean.columns:
-                    if df_clean[col].dtype == 'datetime64[ns]' or pd.api.types.is_datetime64_any_dtype(df_clean[col]):
-                        df_clean[col] = df_clean[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-                        print(f"📅 날짜 컬럼 변환: {col}")
-                
-                # 2. NaN, inf, -inf 값들을 None으로 변환 (중요!)
-                df_clean = df_clean.replace([np.nan, np.inf, -np.inf], None)
-                
-                # 3. numpy 타입들을 Python 기본 타입으로 변환
-                for col in df_clean.columns:
-                    if df_clean[col].dtype == 'int64':
-                        df_clean[col] = df_clean[col].astype('Int64')  # nullable integer
-                    elif df_clean[col].dtype == 'float64':
-                        pass  # float은 그대로
+                # 1. 날짜 → 문자열, inf/NaN·NO_VAL 결측 코드 → NaN (컬럼 단위로 한 번에 처리)
+                df_clean = clean_frame(masking_df)
 
-                # 4. (수정) FOR_KEY 단일 필터링 제거 — 모든 FOR_KEY 유지
+                # 2. (수정) FOR_KEY 단일 필터링 제거 — 모든 FOR_KEY 유지
                 if 'FOR_KEY' in df_clean.columns:
-                    df_clean['FOR_KEY'] = df_clean['FOR_KEY'].astype(str).str.strip()
+                    for_key = df_clean['FOR_KEY']
+                    df_clean['FOR_KEY'] = for_key.astype(str).str.strip().where(for_key.notna())
                     uniq = df_clean['FOR_KEY'].dropna().unique().tolist()
-                    print(f"📝 FOR_KEY 고유값 수: {len(uniq)} | 예시: {uniq[:5]}")
+                    logger.debug("FOR_KEY unique values: %d, e.g. %s", len(uniq), uniq[:5])
 
-                # 5. x축용 key 컬럼 생성
+                # 3. x축용 key 컬럼 생성
                 if 'TRANS_DATE' in df_clean.columns:
                     df_clean['_sort_ts'] = pd.to_datetime(df_clean['TRANS_DATE'], errors='coerce')
                     df_clean = df_clean.sort_values('_sort_ts')
                     df_clean['key'] = df_clean['_sort_ts'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna(df_clean['TRANS_DATE'].astype(str))
                     df_clean = df_clean.drop(columns=['_sort_ts'])
-                    print("📝 TRANS_DATE를 key로 사용")
-                
-                # 6. 딕셔너리로 변환 후 다시 한번 NaN 체크
-                data = df_clean.to_dict(orient='records')
+                    logger.debug("Using TRANS_DATE as key")
                 
-                # 7. 각 레코드에서 NaN/inf/결측코드 처리 및 key 문자열 보장
-                for record in data:
-                    for key, value in record.items():
-                        if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                            record[key] = None
-                        elif key.startswith('NO_VAL') and value == 9:
-                            record[key] = None
-                    if 'key' in record and record['key'] is not None:
-                        record['key'] = str(record['key'])
+                # 4. 레코드 변환 (NaN → None, key는 문자열)
+                if 'key' in df_clean.columns:
+                    df_clean['key'] = df_clean['key'].astype(str).where(df_clean['key'].notna())
+                data = DataGenerators._inline_trend_records(df_clean, 'DEVICE', aggregate)
                 
-                print(f"✅ 데이터 변환 완료: {len(data)}개 레코드")
-                print(f"📊 실제 데이터 컬럼: {list(df_clean.columns)}")
+                logger.debug("Converted %d records (aggregate=%s), columns=%s", len(data), aggregate, list(df_clean.columns))
                 if len(data) > 0:
-                    print(f"📊 첫 번째 행 샘플: {data[0]}")
+                    logger.debug("First record: %s", data[0])
                 
                 return data
                 
             except Exception as e:
-                print(f"❌ 실제 데이터 처리 오류: {e}")
-                print("📊 샘플 데이터로 대체합니다.")
+                logger.warning("Failed to process real data, using sample data: %s", e)
         
         # (샘플 데이터 생성부는 기존 그대로 둠)
-        print("📊 박스플롯용 샘플 데이터 생성")
+        logger.debug("Generating sample inline trend data")
         data = []
         devices = ['DEVICE_A', 'DEVICE_B', 'DEVICE_C']
         for i, device in enumerate(devices):
@@ -306,152 +219,85 @@ class DataGenerators:
                     'UCL': 500,
                     'LCL': 350
                 })
-        return data
+        if aggregate == AGGREGATE_BOX:
+            data = DataGenerators._inline_trend_records(pd.DataFrame(data), 'DEVICE', aggregate)
+        return uncached(data)
 
     @staticmethod
-    def generate_inline_trend_followup_data(criteria: str) -> List:
-        """INLINE Trend Followup 데이터 생성 (다양한 criteria 기준)"""
-        DataGenerators.load_masking_data(excel_name='iqc_data.xlsx')
-        global masking_df
+    @result_cache.cached(dataset=DATASET_IQC)
+    def generate_inline_trend_followup_data(criteria: str, aggregate: Optional[str] = None) -> List:
+        """INLINE Trend Followup 데이터 생성 (다양한 criteria 기준, aggregate='box'면 박스 통계)"""
+        # 공유 DataFrame이므로 읽기만 함 - clean_frame이 정리된 새 DataFrame을 만듦 (파일이 바뀌었을 때만 다시 읽음)
+        masking_df = dataset_registry.get(DATASET_IQC)
 
         # 실제 엑셀 데이터가 있으면 사용
         if masking_df is not None and not masking_df.empty:
             try:
-                print(f"📊 실제 마스킹 데이터 사용 (criteria: {criteria})")
-                
-                df_clean = masking_df.copy()
-                
-                # 1. datetime/timestamp 컬럼들을 문자열로 변환 (강화)
-                for col in df_clean.columns:
-                    if df_clean[col].dtype == 'datetime64[ns]' or pd.api.types.is_datetime64_any_dtype(df_clean[col]):
-                        df_clean[col] = df_clean[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-                        print(f"📅 날짜 컬럼 변환: {col}")
-                    elif df_clean[col].dtype == 'object':
-                        sample_val = df_clean[col].dropna().iloc[0] if len(df_clean[col].dropna()) > 0 else None
-                        if sample_val is not None and isinstance(sample_val, (pd.Timestamp, datetime)):
-                            df_clean[col] = df_clean[col].apply(
-                                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) and isinstance(x, (pd.Timestamp, datetime)) else x
-                            )
-                            print(f"📅 숨겨진 날짜 컬럼 변환: {col}")
-                
-                # 2. NaN, inf, -inf → None
-                df_clean = df_clean.replace([np.nan, np.inf, -np.inf], None)
+                logger.debug("Using real data from iqc_data.xlsx (criteria=%s)", criteria)
                 
-                # 3. numpy 스칼라 타입 처리
-                for col in df_clean.columns:
-                    if df_clean[col].dtype == 'int64':
-                        df_clean[col] = df_clean[col].astype('Int64')
-                    elif df_clean[col].dtype == 'float64':
-                        pass
+                # 1. 날짜 → 문자열 (criteria 컬럼 포함), inf/NaN·NO_VAL 결측 코드 → NaN
+                df_clean = clean_frame(masking_df)
 
-                # 4. criteria 보정
+                # 2. criteria 보정
                 if criteria not in df_clean.columns:
-                    print(f"⚠️ criteria '{criteria}' 컬럼이 없습니다. 사용 가능한 컬럼: {list(df_clean.columns)}")
+                    logger.warning("Criteria column %r not found, available columns: %s", criteria, list(df_clean.columns))
                     available_criteria = ['MAIN_EQ', 'DEVICE', 'PARA', 'EQ_CHAM', 'LOT_ID', 'OPER', 'ROUTE']
                     for alt_criteria in available_criteria:
                         if alt_criteria in df_clean.columns:
-                            print(f"📝 대체 criteria 사용: {alt_criteria}")
+                            logger.debug("Using fallback criteria %s", alt_criteria)
                             criteria = alt_criteria
                             break
                     else:
                         raise ValueError("No valid criteria found")
                 
-                # 5. (수정) FOR_KEY 단일 필터링 제거 — 모든 FOR_KEY 유지
+                # 3. (수정) FOR_KEY 단일 필터링 제거 — 모든 FOR_KEY 유지
                 if 'FOR_KEY' in df_clean.columns:
-                    df_clean['FOR_KEY'] = df_clean['FOR_KEY'].astype(str).str.strip()
+                    for_key = df_clean['FOR_KEY']
+                    df_clean['FOR_KEY'] = for_key.astype(str).str.strip().where(for_key.notna())
                     uniq = df_clean['FOR_KEY'].dropna().unique().tolist()
-                    print(f"📝 FOR_KEY 고유값 수: {len(uniq)} | 예시: {uniq[:5]}")
+                    logger.debug("FOR_KEY unique values: %d, e.g. %s", len(uniq), uniq[:5])
 
-                # 6. x축용 key 컬럼 생성
+                # 4. x축용 key 컬럼 생성
                 if 'TRANS_DATE' in df_clean.columns:
                     df_clean['_sort_ts'] = pd.to_datetime(df_clean['TRANS_DATE'], errors='coerce')
                     df_clean = df_clean.sort_values('_sort_ts')
                     df_clean['key'] = df_clean['_sort_ts'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna(df_clean['TRANS_DATE'].astype(str))
                     df_clean = df_clean.drop(columns=['_sort_ts'])
-                    print("📝 TRANS_DATE를 key로 사용")
+                    logger.debug("Using TRANS_DATE as key")
                 elif 'LOT_NO' in df_clean.columns:
                     df_clean['key'] = df_clean['LOT_NO'].astype(str)
-                    print("📝 LOT_NO를 key로 사용")
+                    logger.debug("Using LOT_NO as key")
                 elif 'WAFER_ID' in df_clean.columns:
                     df_clean['key'] = df_clean['WAFER_ID'].astype(str)
-                    print("📝 WAFER_ID를 key로 사용")
+                    logger.debug("Using WAFER_ID as key")
                 elif 'FOR_KEY' in df_clean.columns:
                     df_clean['key'] = df_clean['FOR_KEY'].astype(str)
-                    print("📝 FOR_KEY를 key로 사용")
+                    logger.debug("Using FOR_KEY as key")
                 else:
                     df_clean['key'] = df_clean.reset_index().index.astype(str)
-                    print("📝 인덱스를 key로 사용")
+                    logger.debug("Using index as key")
                 
-                # 🚨 criteria 컬럼 Timestamp 특별 처리
-                if criteria in df_clean.columns:
-                    print(f"🔍 criteria '{criteria}' 컬럼 타입: {df_clean[criteria].dtype}")
-                    sample_vals = df_clean[criteria].dropna().head(3).tolist()
-                    print(f"🔍 criteria 샘플 값들: {sample_vals}")
-                    for i, val in enumerate(sample_vals):
-                        print(f"  {i}: {val} (type: {type(val)})")
-                        if isinstance(val, (pd.Timestamp, datetime)):
-                            df_clean[criteria] = df_clean[criteria].apply(
-                                lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) and isinstance(x, (pd.Timestamp, datetime)) else x
-                            )
-                            print(f"✅ criteria '{criteria}' Timestamp → 문자열 변환 완료")
-                            break
-                
-                # 7. 정렬
+                # 5. 정렬
                 try:
-                    print(f"📊 정렬 전 criteria '{criteria}' 고유값: {df_clean[criteria].nunique()}개")
-                    for idx, val in df_clean[criteria].items():
-                        if isinstance(val, (pd.Timestamp, datetime)):
-                            df_clean.at[idx, criteria] = val.strftime('%Y-%m-%d %H:%M:%S')
-                            print(f"🔧 정렬 전 추가 Timestamp 수정: {idx}")
                     df_clean = df_clean.sort_values([criteria, 'key'])
-                    print(f"📊 {criteria} 기준 정렬 완료")
+                    logger.debug("Sorted by %s", criteria)
                 except Exception as e:
-                    print(f"⚠️ 정렬 실패: {e}, 기본 순서 유지")
-                
-                # 8. 딕셔너리 변환
-                data = df_clean.to_dict(orient='records')
+                    logger.warning("Sort by %s failed, keeping original order: %s", criteria, e)
                 
-                # 9. JSON 비호환 값 정리
-                for record in data:
-                    for key, value in list(record.items()):
-                        if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                            record[key] = None
-                        elif isinstance(value, (pd.Timestamp, datetime)):
-                            record[key] = value.strftime('%Y-%m-%d %H:%M:%S')
-                            print(f"🚨 늦게 발견된 Timestamp 변환: {key}")
-                        elif key.startswith('NO_VAL') and value == 9:
-                            record[key] = None
-                        elif hasattr(value, 'item'):
-                            record[key] = value.item()
-                    if 'key' in record and record['key'] is not None:
-                        record['key'] = str(record['key'])
+                # 6. 레코드 변환 (NaN → None, key는 문자열)
+                df_clean['key'] = df_clean['key'].astype(str).where(df_clean['key'].notna())
+                data = DataGenerators._inline_trend_records(df_clean, criteria, aggregate)
                 
-                print(f"✅ 데이터 변환 완료: {len(data)}개 레코드")
-                print(f"📊 사용된 criteria: {criteria}")
-                
-                # JSON 직렬화 테스트
-                try:
-                    json.dumps(data[0] if data else {}, default=str)
-                    print("✅ JSON 직렬화 테스트 통과")
-                except Exception as json_error:
-                    print(f"🚨 JSON 직렬화 테스트 실패: {json_error}")
-                    for record in data:
-                        for key, value in list(record.items()):
-                            try:
-                                json.dumps(value)
-                            except:
-                                print(f"🔧 문제 값 수정: {key} = {type(value)} -> str")
-                                record[key] = str(value) if value is not None else None
-                
-                print(f"📊 {criteria} 고유값: {sorted(list(set([r[criteria] for r in data if r.get(criteria) is not None])))}")
+                logger.debug("Converted %d records (criteria=%s, aggregate=%s)", len(data), criteria, aggregate)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("%s unique values: %s", criteria, df_clean[criteria].dropna().unique().tolist())
                 return data
                 
             except Exception as e:
-                print(f"❌ 실제 데이터 처리 오류: {e}")
-                print("📊 샘플 데이터로 대체합니다.")
+                logger.warning("Failed to process real data, using sample data: %s", e)
         
         # (샘플 데이터 생성부는 기존 그대로 둠)
-        print(f"📊 박스플롯용 샘플 데이터 생성 중 (criteria: {criteria})")
+        logger.debug("Generating sample inline trend data (criteria=%s)", criteria)
         data = []
         if criteria == "MAIN_EQ":
             criteria_values = ['EQ_001', 'EQ_002', 'EQ_003', 'EQ_004']
@@ -485,7 +331,9 @@ class DataGenerators:
                     'UCL': 500,
                     'LCL': 350
                 })
-        return data
+        if aggregate == AGGREGATE_BOX:
+            data = DataGenerators._inline_trend_records(pd.DataFrame(data), criteria, aggregate)
+        return uncached(data)
 
     @staticmethod
     def generate_rag_search_data() -> Dict:
@@ -522,16 +370,15 @@ class DataGenerators:
         ]
 
     @staticmethod
+    @result_cache.cached(dataset=DATASET_MASKING)
     def generate_pcm_to_trend_data() -> Dict:
         """PCM To Trend 데이터 생성 (실제 마스킹된 엑셀 데이터 또는 샘플 데이터 사용)"""
-        # 마스킹된 엑셀 데이터 로드 시도
-        DataGenerators.load_masking_data(excel_name='masking_df.xlsx')
-        
-        global masking_df
+        # 공유 DataFrame이므로 읽기만 함 (파일이 바뀌었을 때만 다시 읽음)
+        masking_df = dataset_registry.get(DATASET_MASKING)
         
         # 실제 엑셀 데이터가 있으면 사용
         if masking_df is not None and not masking_df.empty:
-            print("📊 실제 마스킹 데이터 사용")
+            logger.debug("Using real data from masking_df.xlsx")
             data = {}
             
             # PARA 컬럼이 있는지 확인
@@ -541,16 +388,16 @@ class DataGenerators:
                 for para_name, para_data in para_groups:
                     # 데이터프레임을 딕셔너리 리스트로 변환
                     data[para_name] = para_data.to_dict('records')
-                    print(f"📊 PARA {para_name}: {len(para_data)}개 레코드")
+                    logger.debug("PARA %s: %d records", para_name, len(para_data))
             else:
                 # PARA 컬럼이 없으면 전체 데이터를 하나의 그룹으로 처리
                 data['ALL_DATA'] = masking_df.to_dict('records')
-                print(f"📊 전체 데이터: {len(masking_df)}개 레코드")
+                logger.debug("ALL_DATA: %d records", len(masking_df))
             
             return data
         
         # 엑셀 파일이 없으면 샘플 데이터 생성
-        print("📊 샘플 데이터 생성 (엑셀 파일 없음)")
+        logger.debug("Generating sample PCM to trend data")
         data = {}
         para_list = ["PARA_A", "PARA_B", "PARA_C"]
         route_list = ["route1", "route2", "route3"]
@@ -594,15 +441,14 @@ class DataGenerators:
                 })
             data[para] = single
         
-        # PARA별로 분리된 데이터 반환
-        return data
+        # PARA별로 분리된 데이터 반환 (샘플이므로 캐시하지 않음)
+        return uncached(data)
 
     @staticmethod
     def generate_two_tables_data(test_empty_scenario: str = None) -> Dict:
         """Two Tables 데이터 생성 - 서로 다른 컬럼과 데이터를 가진 두 개의 테이블"""
-        # 마스킹된 엑셀 데이터 로드 시도
-        DataGenerators.load_masking_data(excel_name='masking_df.xlsx')
-        global masking_df
+        # 공유 DataFrame이므로 읽기만 함 (파일이 바뀌었을 때만 다시 읽음)
+        masking_df = dataset_registry.get(DATASET_MASKING)
         
         # 첫 번째 테이블: Lot Hold 데이터 (가상의 lot hold 정보)
         lot_hold_data = []
@@ -638,22 +484,22 @@ class DataGenerators:
             # 실제 데이터의 일부를 첫 번째 테이블로 사용 (최대 10개 레코드)
             sample_size = min(10, len(masking_df))
             lot_hold_data = masking_df.head(sample_size).to_dict('records')
-            print(f"📊 Using real data for lot_hold: {sample_size} records")
+            logger.debug("Using real data for lot_hold: %d records", sample_size)
         
         # 테스트 시나리오 처리 (특별한 경우에만)
         if test_empty_scenario:
             if test_empty_scenario == 'empty_lot_hold':
                 lot_hold_data = []
-                print("🔄 Test scenario: Empty lot_hold data")
+                logger.debug("Test scenario: empty lot_hold data")
             elif test_empty_scenario == 'empty_pe_confirm':
                 pe_confirm_data = []
-                print("🔄 Test scenario: Empty pe_confirm data")
+                logger.debug("Test scenario: empty pe_confirm data")
             elif test_empty_scenario == 'both_empty':
                 lot_hold_data = []
                 pe_confirm_data = []
-                print("🔄 Test scenario: Both tables empty")
+                logger.debug("Test scenario: both tables empty")
         
-        print(f"📊 Generated data - Lot Hold: {len(lot_hold_data)} records, PE Confirm: {len(pe_confirm_data)} records")
+        logger.debug("Generated two tables data: lot_hold=%d pe_confirm=%d", len(lot_hold_data), len(pe_confirm_data))
         
         return {
             "result": "lot_hold_pe_confirm_module",
@@ -764,7 +610,7 @@ class DataGenerators:
                     'area': area
                 })
         
-        print(f"📊 Generated CPK achieve rate data: {len(table_data)} table rows, {len(graph_data)} graph points")
+        logger.debug("Generated CPK achieve rate data: %d table rows, %d graph points", len(table_data), len(graph_data))
         
         return {
             'table_data': table_data,
@@ -0,0 +1,158 @@
+"""
+Dataset registry - Loads each Excel data source once and reloads it only when the file changes
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.config import settings
+from app.services.dataset_sidecar import dataset_sidecar
+
+logger = logging.getLogger(__name__)
+
+# 데이터셋 이름 → 파일 경로 (설정의 IQC_DATA_FILE / MASKING_DATA_FILE)
+DATASET_IQC = "iqc"
+DATASET_MASKING = "masking"
+DEFAULT_SOURCES = {
+    DATASET_IQC: settings.IQC_DATA_FILE,
+    DATASET_MASKING: settings.MASKING_DATA_FILE,
+}
+
+Fingerprint = Tuple[str, int, int]
+
+
+def source_fingerprint(path: str) -> Optional[Fingerprint]:
+    """원본 파일 지문 (경로, mtime_ns, 크기), 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class _Dataset:
+    __slots__ = ("frame", "fingerprint", "loaded_at", "load_seconds")
+
+    def __init__(self, frame: pd.DataFrame, fingerprint: Fingerprint, load_seconds: float):
+        self.frame = frame
+        self.fingerprint = fingerprint
+        self.loaded_at = datetime.now()
+        self.load_seconds = load_seconds
+
+
+class DatasetRegistry:
+    """데이터 소스별 DataFrame 상주 캐시
+
+    - get(name)은 파일의 (mtime, 크기)가 마지막 로드 때와 같으면 메모리의 DataFrame을 그대로 반환하고,
+      바뀌었을 때만 다시 읽는다. 파일이 없으면 None.
+    - 데이터셋마다 별도 락으로 로드하므로 같은 파일은 한 번만 읽고, 다른 파일 로드는 서로 막지 않는다.
+    - 반환한 DataFrame은 모든 요청이 공유하므로 읽기 전용으로 다룬다 (수정하려면 copy() 후 사용).
+    - loader는 경로를 받아 DataFrame을 반환하는 함수
+      (기본: dataset_sidecar.load - 최신 Parquet/Arrow 사본이 있으면 Excel 대신 사본을 읽음)
+    """
+
+    def __init__(self, sources: Optional[Dict[str, str]] = None,
+                 loader: Optional[Callable[[str], pd.DataFrame]] = None):
+        self.sources = dict(sources or DEFAULT_SOURCES)
+        self.loader = loader or dataset_sidecar.load
+        self._datasets: Dict[str, _Dataset] = {}
+        self._load_locks = {name: threading.Lock() for name in self.sources}
+        self._lock = threading.Lock()
+        self._missing = set()
+
+        self._hits = 0
+        self._loads = 0
+        self._failures = 0
+
+    def path(self, name: str) -> str:
+        """데이터셋 파일 경로 (등록되지 않은 이름이면 KeyError)"""
+        return self.sources[name]
+
+    def fingerprint(self, name: str) -> Optional[Fingerprint]:
+        """데이터셋 파일의 현재 지문, 파일이 없으면 None"""
+        return source_fingerprint(self.path(name))
+
+    def get(self, name: str) -> Optional[pd.DataFrame]:
+        """데이터셋 DataFrame (파일이 바뀌었으면 다시 로드), 파일이 없거나 읽지 못하면 None"""
+        path = self.path(name)
+        fingerprint = source_fingerprint(path)
+        if fingerprint is None:
+            with self._lock:
+                self._datasets.pop(name, None)
+                first = name not in self._missing
+                self._missing.add(name)
+            if first:
+                logger.warning(f"Dataset {name} not found at {path}, generators will use sample data")
+            return None
+
+        with self._lock:
+            self._missing.discard(name)
+            dataset = self._datasets.get(name)
+            if dataset is not None and dataset.fingerprint == fingerprint:
+                self._hits += 1
+                return dataset.frame
+
+        with self._load_locks[name]:
+            # 락을 기다리는 동안 다른 스레드가 이미 읽었을 수 있음
+            with self._lock:
+                dataset = self._datasets.get(name)
+                if dataset is not None and dataset.fingerprint == fingerprint:
+                    self._hits += 1
+                    return dataset.frame
+            return self._load(name, path, fingerprint)
+
+    def _load(self, name: str, path: str, fingerprint: Fingerprint) -> Optional[pd.DataFrame]:
+        started = time.monotonic()
+        try:
+            frame = self.loader(path)
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+            logger.error(f"Failed to load dataset {name} from {path}: {e}")
+            return None
+        elapsed = time.monotonic() - started
+
+        # 읽는 도중 파일이 바뀌었으면 다음 get에서 다시 읽도록 읽기 전 지문으로 기록
+        with self._lock:
+            self._datasets[name] = _Dataset(frame, fingerprint, elapsed)
+            self._loads += 1
+        logger.info(f"Loaded dataset {name} from {path}: {frame.shape[0]} rows x {frame.shape[1]} columns "
+                    f"in {elapsed * 1000:.1f}ms")
+        return frame
+
+    def reload(self, name: str) -> Optional[pd.DataFrame]:
+        """파일 변경 여부와 상관없이 다시 로드"""
+        with self._lock:
+            self._datasets.pop(name, None)
+        return self.get(name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """데이터셋별 로드 상태와 적중/로드 횟수"""
+        with self._lock:
+            datasets = {}
+            for name, path in self.sources.items():
+                dataset = self._datasets.get(name)
+                datasets[name] = {
+                    'path': path,
+                    'loaded': dataset is not None,
+                    'rows': int(dataset.frame.shape[0]) if dataset else None,
+                    'columns': int(dataset.frame.shape[1]) if dataset else None,
+                    'loaded_at': dataset.loaded_at.isoformat() if dataset else None,
+                    'load_ms': round(dataset.load_seconds * 1000, 3) if dataset else None,
+                }
+            return {
+                'datasets': datasets,
+                'hits': self._hits,
+                'loads': self._loads,
+                'failures': self._failures,
+            }
+
+
+# 전역 데이터셋 레지스트리
+dataset_registry = DatasetRegistry()
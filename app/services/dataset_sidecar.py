@@ -0,0 +1,218 @@
+"""
+Dataset sidecar - Columnar (Parquet / Arrow IPC) copies of the Excel data sources for fast loading
+
+Usage:
+    python -m app.services.dataset_sidecar                 # 설정된 모든 데이터셋 사이드카 생성 (배포 시)
+    python -m app.services.dataset_sidecar --dataset iqc --force
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from app.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = feather = pq = None
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+FORMAT_PARQUET = "parquet"
+FORMAT_ARROW = "arrow"
+SUPPORTED_FORMATS = (FORMAT_PARQUET, FORMAT_ARROW)
+
+# 사이드카 스키마 메타데이터에 원본 파일 지문을 기록해 원본이 바뀌었는지 확인
+_METADATA_KEY = b"dataset_source"
+
+
+def normalize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 DataFrame의 dtype을 한 번 정리 (사이드카 저장 가능 + 이후 정리 단계가 일정한 타입을 받도록)
+
+    - 값이 모두 Timestamp/datetime인 object 컬럼 → datetime64
+    - 숫자와 문자열이 섞인 object 컬럼 → 문자열 (결측은 그대로 None)
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col].dropna()
+        if values.empty:
+            continue
+        if values.map(lambda v: isinstance(v, (pd.Timestamp, datetime))).all():
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif values.map(type).nunique() > 1:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    # Excel 헤더가 숫자/빈 칸이면 컬럼 이름이 문자열이 아닐 수 있음
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+class DatasetSidecar:
+    """Excel 원본 옆에 컬럼 기반 사본을 두고 원본이 바뀌지 않았으면 사본을 읽는 로더
+
+    - 사본은 sidecar_dir/<원본 파일명>.<parquet|arrow>에 저장하며, 스키마 메타데이터에 원본 (mtime_ns, 크기)를 기록
+    - load(path)는 사본이 최신이면 사본을, 아니면 Excel을 읽어 dtype을 정리한 뒤 사본을 새로 쓰고 반환
+    - pyarrow가 없거나 enabled=False면 Excel을 읽어 dtype만 정리 (사본 없음)
+    - 사본 쓰기는 임시 파일 → os.replace로 교체하므로 다른 워커가 쓰다 만 파일을 읽지 않음
+    """
+
+    def __init__(self, sidecar_dir: str = settings.DATASET_SIDECAR_DIR,
+                 fmt: str = settings.DATASET_SIDECAR_FORMAT,
+                 enabled: bool = settings.DATASET_SIDECAR_ENABLED):
+        fmt = (fmt or FORMAT_PARQUET).lower()
+        if fmt not in SUPPORTED_FORMATS:
+            logger.warning(f"Unknown dataset sidecar format {fmt}, using {FORMAT_PARQUET}")
+            fmt = FORMAT_PARQUET
+        if enabled and not HAS_PYARROW:
+            logger.warning("pyarrow is not installed, dataset sidecars disabled (pip install pyarrow)")
+        self.sidecar_dir = sidecar_dir
+        self.format = fmt
+        self.enabled = enabled and HAS_PYARROW
+
+    def sidecar_path(self, path: str) -> str:
+        return os.path.join(self.sidecar_dir, f"{os.path.basename(path)}.{self.format}")
+
+    @staticmethod
+    def _source_stamp(path: str) -> Dict[str, int]:
+        stat = os.stat(path)
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _read_stamp(self, sidecar: str) -> Optional[Dict[str, Any]]:
+        try:
+            if self.format == FORMAT_PARQUET:
+                metadata = pq.read_schema(sidecar).metadata
+            else:
+                with pa.memory_map(sidecar) as source:
+                    metadata = pa.ipc.open_file(source).schema.metadata
+        except (OSError, pa.ArrowInvalid):
+            return None
+        if not metadata or _METADATA_KEY not in metadata:
+            return None
+        return json.loads(metadata[_METADATA_KEY])
+
+    def is_fresh(self, path: str) -> bool:
+        """사본이 있고 원본 파일의 현재 (mtime, 크기)로 만든 것인지"""
+        if not self.enabled:
+            return False
+        return self._read_stamp(self.sidecar_path(path)) == self._source_stamp(path)
+
+    def _read_sidecar(self, sidecar: str) -> pd.DataFrame:
+        if self.format == FORMAT_PARQUET:
+            return pq.read_table(sidecar).to_pandas()
+        return feather.read_table(sidecar, memory_map=True).to_pandas()
+
+    def _write_sidecar(self, df: pd.DataFrame, sidecar: str, stamp: Dict[str, int]) -> None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _METADATA_KEY: json.dumps(stamp).encode("utf-8"),
+        })
+        os.makedirs(self.sidecar_dir, exist_ok=True)
+        tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+        try:
+            if self.format == FORMAT_PARQUET:
+                pq.write_table(table, tmp_path)
+            else:
+                feather.write_feather(table, tmp_path)
+            os.replace(tmp_path, sidecar)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def build(self, path: str, force: bool = False) -> Dict[str, Any]:
+        """path의 사본 생성 (최신이면 건너뜀), 결과 요약 반환"""
+        sidecar = self.sidecar_path(path)
+        if not force and self.is_fresh(path):
+            return {"source": path, "sidecar": sidecar, "built": False}
+        started = time.monotonic()
+        stamp = self._source_stamp(path)
+        df = normalize_dtypes(pd.read_excel(path))
+        self._write_sidecar(df, sidecar, stamp)
+        return {
+            "source": path,
+            "sidecar": sidecar,
+            "built": True,
+            "rows": int(df.shape[0]),
+            "source_bytes": stamp["size"],
+            "sidecar_bytes": os.path.getsize(sidecar),
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+        }
+
+    def load(self, path: str) -> pd.DataFrame:
+        """DatasetRegistry 로더: 최신 사본이 있으면 사본을, 없으면 Excel을 읽고 사본 생성"""
+        if not self.enabled:
+            return normalize_dtypes(pd.read_excel(path))
+
+        sidecar = self.sidecar_path(path)
+        stamp = self._source_stamp(path)
+        if self._read_stamp(sidecar) == stamp:
+            try:
+                return self._read_sidecar(sidecar)
+            except Exception as e:
+                logger.warning(f"Failed to read dataset sidecar {sidecar}, falling back to Excel: {e}")
+
+        df = normalize_dtypes(pd.read_excel(path))
+        try:
+            self._write_sidecar(df, sidecar, stamp)
+            logger.info(f"Wrote dataset sidecar {sidecar} ({df.shape[0]} rows)")
+        except Exception as e:
+            logger.warning(f"Failed to write dataset sidecar {sidecar}: {e}")
+        return df
+
+
+# 전역 사이드카 로더 (DATASET_SIDECAR_* 설정 사용)
+dataset_sidecar = DatasetSidecar()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from app.services.dataset_registry import DEFAULT_SOURCES
+
+    parser = argparse.ArgumentParser(prog="python -m app.services.dataset_sidecar")
+    parser.add_argument("--dataset", choices=list(DEFAULT_SOURCES), action="append",
+                        help="대상 데이터셋 (여러 번 지정 가능, 기본: 전체)")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, default=settings.DATASET_SIDECAR_FORMAT)
+    parser.add_argument("--dir", default=settings.DATASET_SIDECAR_DIR, help="사본 저장 디렉터리")
+    parser.add_argument("--force", action="store_true", help="최신 사본이 있어도 다시 생성")
+    args = parser.parse_args(argv)
+
+    if not HAS_PYARROW:
+        print("pyarrow is not installed (pip install pyarrow)")
+        return 1
+
+    sidecar = DatasetSidecar(sidecar_dir=args.dir, fmt=args.format, enabled=True)
+    status = 0
+    for name in args.dataset or list(DEFAULT_SOURCES):
+        path = DEFAULT_SOURCES[name]
+        if not os.path.exists(path):
+            print(f"{name:<10} {path} not found, skipped")
+            continue
+        try:
+            result = sidecar.build(path, force=args.force)
+        except Exception as e:
+            print(f"{name:<10} failed: {e}")
+            status = 1
+            continue
+        if result["built"]:
+            print(f"{name:<10} {result['sidecar']} {result['rows']} rows, "
+                  f"{result['source_bytes']} → {result['sidecar_bytes']} bytes in {result['elapsed_seconds']}s")
+        else:
+            print(f"{name:<10} {result['sidecar']} up to date")
+    return status
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    sys.exit(main())
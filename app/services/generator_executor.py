@@ -0,0 +1,161 @@
+"""
+Generator executor - Runs blocking DataGenerators work on a bounded thread pool off the event loop
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GeneratorQueueFullError(RuntimeError):
+    """대기 중인 데이터 생성 작업이 max_queue를 넘었을 때"""
+
+
+class GeneratorExecutor:
+    """pandas 기반 데이터 생성 작업 전용 스레드풀
+
+    - max_workers: 동시에 실행할 작업 수 (DataGenerators는 전역 DataFrame을 공유하므로 프로세스가 아닌 스레드 사용)
+    - max_queue: 실행을 기다릴 수 있는 작업 수, 넘으면 GeneratorQueueFullError
+    - timeout: 요청당 제한 시간(초), 넘으면 asyncio.TimeoutError
+
+    SSE 클라이언트가 연결을 끊으면 스트림 태스크가 취소되고, 아직 시작하지 않은 작업은 큐에서 빠진다.
+    이미 실행 중인 스레드는 강제로 멈출 수 없으므로 끝날 때까지 돌고 결과만 버려진다 (abandoned).
+    """
+
+    def __init__(self, max_workers: int = settings.DATA_GENERATOR_WORKERS,
+                 max_queue: int = settings.DATA_GENERATOR_MAX_QUEUE,
+                 timeout: Optional[float] = settings.DATA_GENERATOR_TIMEOUT):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="data-generator")
+        self._lock = threading.Lock()
+
+        self._queued = 0
+        self._running = 0
+        self._started = 0
+        self._finished = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._cancelled = 0
+        self._abandoned = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    def _wrap(self, func: Callable[..., T], submitted_at: float, state: Dict[str, bool]) -> Callable[[], T]:
+        def task() -> T:
+            started = time.monotonic()
+            waited = started - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._started += 1
+                state['started'] = True
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return func()
+            finally:
+                elapsed = time.monotonic() - started
+                with self._lock:
+                    self._running -= 1
+                    self._finished += 1
+                    self._run_total += elapsed
+                    self._run_max = max(self._run_max, elapsed)
+        return task
+
+    async def run(self, func: Callable[..., T], *args, timeout: Optional[float] = None, **kwargs) -> T:
+        """func(*args, **kwargs)를 스레드풀에서 실행하고 결과를 await"""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise GeneratorQueueFullError(
+                    f"Too many pending data generation tasks (max_queue={self.max_queue})"
+                )
+            self._queued += 1
+
+        state = {'started': False}
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(self._wrap(functools.partial(func, *args, **kwargs), time.monotonic(), state))
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            raise
+
+        limit = self.timeout if timeout is None else timeout
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), limit)
+        except asyncio.TimeoutError:
+            self._abandon(future, state)
+            with self._lock:
+                self._timeouts += 1
+            logger.warning(f"Data generation {getattr(func, '__name__', func)} timed out after {limit}s")
+            raise
+        except asyncio.CancelledError:
+            self._abandon(future, state)
+            with self._lock:
+                self._cancelled += 1
+            raise
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def _abandon(self, future, state: Dict[str, bool]) -> None:
+        """대기 중이면 큐에서 제거, 실행 중이면 결과를 버림"""
+        if future.cancel():
+            with self._lock:
+                # 시작 전에 취소된 작업은 _wrap이 실행되지 않으므로 여기서 대기 수를 줄임
+                if not state['started']:
+                    self._queued -= 1
+        else:
+            with self._lock:
+                self._abandoned += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """실행기 통계 조회 (queue_depth: 실행을 기다리는 작업 수)"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'timeout_seconds': self.timeout,
+                'queue_depth': self._queued,
+                'running': self._running,
+                'completed': self._completed,
+                'failed': self._failed,
+                'timeouts': self._timeouts,
+                'cancelled': self._cancelled,
+                'abandoned': self._abandoned,
+                'rejected': self._rejected,
+                'wait_avg_ms': round(self._wait_total / self._started * 1000, 3) if self._started else 0.0,
+                'wait_max_ms': round(self._wait_max * 1000, 3),
+                'run_avg_ms': round(self._run_total / self._finished * 1000, 3) if self._finished else 0.0,
+                'run_max_ms': round(self._run_max * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        """스레드풀 종료 (실행 중인 작업은 끝까지 기다림)"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# 전역 데이터 생성 실행기
+generator_executor = GeneratorExecutor()
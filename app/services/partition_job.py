@@ -0,0 +1,62 @@
+"""
+Partition job - Periodically creates upcoming monthly partitions in the background
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.config import settings
+from app.database import db_connection
+from app.migrations.partitions import PartitionManager
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionJob:
+    """월 파티션 생성 주기 작업
+
+    시작할 때 한 번, 이후 interval초마다 PartitionManager.ensure_future_partitions를 실행한다.
+    서버가 재시작 없이 months_ahead개월 넘게 떠 있어도 새 달의 행이 default 파티션에 쌓이지 않게 하며,
+    이미 default 파티션에 들어간 행은 service_ensure_monthly_partitions가 새 파티션으로 옮긴다.
+    """
+
+    def __init__(self, manager: Optional[PartitionManager] = None,
+                 interval: float = settings.PARTITION_ENSURE_INTERVAL_SECONDS):
+        self.manager = manager or PartitionManager()
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """주기 작업 시작 (이벤트 루프 안에서 호출)"""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="ensure-monthly-partitions")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # 파티션 생성/행 이동은 DB 작업이므로 이벤트 루프 밖에서 실행
+                await db_connection.run_in_executor(self.manager.ensure_future_partitions)
+            except Exception as e:
+                logger.warning(f"Failed to ensure monthly partitions: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def stop(self) -> None:
+        """주기 작업 종료 (lifespan 종료 시 호출)"""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# 전역 파티션 생성 작업
+partition_job = PartitionJob()
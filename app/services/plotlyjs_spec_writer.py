@@ -1,11 +1,14 @@
 # app/services/plotlyjs_spec_writer.py
 import requests
 import json
+import logging
 import sys
 
 URL = "http://192.168.0.200:8002/v1/completions"   # vLLM OpenAI-compatible /v1/completions
 MODEL = "google/gemma-3-27b-it"
 
+logger = logging.getLogger(__name__)
+
 # 프론트가 아는 스키마(실데이터는 절대 포함 X)
 DEFAULT_FIELDS_META = {
     "x_field": "key",
@@ -210,16 +213,16 @@ def generate_plotly_spec(user_prompt: str, fields_meta: dict = None):
         data = res.json()
 
         raw_text = data["choices"][0]["text"]
-        print("Raw LLM Response:", raw_text)
+        logger.debug("Raw LLM response: %s", raw_text)
 
         json_text = extract_first_json(raw_text)
-        print("\nExtracted JSON:", json_text)
+        logger.debug("Extracted JSON: %s", json_text)
 
         spec = sanitize_spec(json_text, fields_meta)
-        print("\nSanitized Spec:", json.dumps(spec, ensure_ascii=False, indent=2))
+        logger.debug("Sanitized spec: %s", spec)
         return spec
     except Exception as e:
-        print(f"Error generating plotly spec: {e}")
+        logger.warning(f"Error generating plotly spec: {e}")
         # Return a default spec if LLM call fails
         return {
             "chart_type": "box",
@@ -0,0 +1,94 @@
+"""
+Purge job - Runs the batched purge of old deleted chatrooms in a background thread
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.repositories.data_preservation import DataPreservation
+
+logger = logging.getLogger(__name__)
+
+
+class PurgeJob:
+    """삭제된 채팅방 영구 삭제 백그라운드 작업 (한 번에 하나만 실행)
+
+    요청 스레드/이벤트 루프를 막지 않도록 전용 스레드에서 DataPreservation.purge_deleted_chatrooms를 실행하고,
+    배치마다 전달되는 진행 상황을 status()로 조회할 수 있게 보관한다.
+    time_budget으로 중단된 경우 다음 실행은 마지막으로 처리한 채팅방 다음부터 이어서 진행한다.
+    """
+
+    def __init__(self, data_preservation: Optional[DataPreservation] = None):
+        self.data_preservation = data_preservation or DataPreservation()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._status: Dict[str, Any] = {'state': 'idle'}
+        self._resume_after = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, days_old: int = 30, batch_size: int = 100, time_budget: Optional[float] = None) -> bool:
+        """작업 시작 (이미 실행 중이면 False)"""
+        with self._lock:
+            if self.running:
+                return False
+            self._status = {
+                'state': 'running',
+                'started_at': datetime.now().isoformat(),
+                'resumed_after': self._resume_after,
+                'progress': None
+            }
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(days_old, batch_size, time_budget, self._resume_after),
+                name="purge-deleted-chatrooms",
+                daemon=True
+            )
+            self._thread.start()
+            return True
+
+    def _on_progress(self, progress: Dict[str, Any]) -> None:
+        with self._lock:
+            self._status['progress'] = progress
+
+    def _run(self, days_old: int, batch_size: int, time_budget: Optional[float], after_id: int) -> None:
+        try:
+            result = self.data_preservation.purge_deleted_chatrooms(
+                days_old=days_old,
+                batch_size=batch_size,
+                time_budget=time_budget,
+                after_id=after_id,
+                progress_callback=self._on_progress
+            )
+            with self._lock:
+                # 끝까지 처리했으면 다음 실행은 처음부터, 아니면 이어서
+                self._resume_after = 0 if result['done'] else result['last_chatroom_id']
+                self._status.update({
+                    'state': 'completed' if result['done'] else 'paused',
+                    'finished_at': datetime.now().isoformat(),
+                    'progress': result
+                })
+        except Exception as e:
+            logger.error(f"Purge job failed: {e}")
+            with self._lock:
+                progress = self._status.get('progress')
+                if progress:
+                    self._resume_after = progress['last_chatroom_id']
+                self._status.update({
+                    'state': 'failed',
+                    'finished_at': datetime.now().isoformat(),
+                    'error': str(e)
+                })
+
+    def status(self) -> Dict[str, Any]:
+        """현재/마지막 작업 상태 조회"""
+        with self._lock:
+            return dict(self._status, resume_after=self._resume_after)
+
+
+# 전역 purge 작업 인스턴스
+purge_job = PurgeJob()
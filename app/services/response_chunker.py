@@ -0,0 +1,72 @@
+"""
+Response chunker - Splits a chat response's real_data into row-chunk SSE frames
+"""
+
+from typing import Any, Dict, Iterator, List
+
+from app.utils.json_codec import sse_frame
+
+# 청크 스트리밍 프레임 종류 ('stream' 키로 구분)
+STREAM_HEADER = 'header'
+STREAM_CHUNK = 'chunk'
+STREAM_END = 'end'
+
+
+def _column_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if value is None:
+        return 'null'
+    if isinstance(value, str):
+        return 'string'
+    return 'object'
+
+
+def describe_rows(rows: List[Any]) -> List[Dict[str, str]]:
+    """첫 행 기준 컬럼 스키마 [{name, type}] (dict 행이 아니면 빈 목록)"""
+    if not rows or not isinstance(rows[0], dict):
+        return []
+    return [{'name': name, 'type': _column_type(value)} for name, value in rows[0].items()]
+
+
+def can_chunk(response: Dict[str, Any]) -> bool:
+    """real_data가 행 목록일 때만 청크 전송 (문자열로 인코딩된 real_data 등은 단일 프레임)"""
+    return isinstance(response.get('real_data'), list)
+
+
+def chunk_response_frames(envelope: Dict[str, Any], response: Dict[str, Any], chunk_rows: int) -> Iterator[bytes]:
+    """header → chunk × N → end 순서의 SSE 프레임 생성
+
+    - header: envelope(chat_id 등) + real_data를 뺀 response + 스키마/행 수/청크 수
+    - chunk: seq 번호와 rows (chunk_rows개씩)
+    - end: 전송한 청크/행 수 (클라이언트가 누락 여부 확인)
+
+    header/chunk 프레임에는 'response' 키를 두지 않아 기존 단일 프레임 처리와 섞이지 않는다.
+    """
+    rows = response['real_data']
+    chunk_rows = max(1, chunk_rows)
+    total_chunks = (len(rows) + chunk_rows - 1) // chunk_rows
+    meta = {key: value for key, value in response.items() if key != 'real_data'}
+
+    header = dict(envelope)
+    header.update({
+        'stream': STREAM_HEADER,
+        'meta': meta,
+        'columns': describe_rows(rows),
+        'total_rows': len(rows),
+        'chunk_rows': chunk_rows,
+        'total_chunks': total_chunks
+    })
+    yield sse_frame(header)
+
+    for seq in range(total_chunks):
+        start = seq * chunk_rows
+        chunk = {'stream': STREAM_CHUNK, 'chat_id': envelope.get('chat_id'), 'seq': seq,
+                 'rows': rows[start:start + chunk_rows]}
+        yield sse_frame(chunk)
+
+    end = {'stream': STREAM_END, 'chat_id': envelope.get('chat_id'),
+           'total_chunks': total_chunks, 'total_rows': len(rows)}
+    yield sse_frame(end)
@@ -0,0 +1,216 @@
+"""
+Result cache - TTL + memory-budget LRU cache for file-backed DataGenerators outputs
+"""
+
+import functools
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.config import settings
+from app.services.dataset_registry import DatasetRegistry, dataset_registry
+
+logger = logging.getLogger(__name__)
+
+# 원본 파일이 없을 때 (샘플 데이터를 랜덤 생성하므로 캐시하지 않음)
+_MISSING = object()
+
+
+class Uncached:
+    """캐시하지 않을 결과 표시 - 데코레이터가 value만 꺼내 반환하고 저장하지 않음
+
+    원본 파일은 있지만 읽기/처리에 실패해 랜덤 샘플 데이터로 대신한 경우처럼
+    지문(fingerprint)은 그대로인데 결과를 재사용하면 안 될 때 생성 함수가 uncached(data)로 감싸 반환한다.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def uncached(value: Any) -> Uncached:
+    return Uncached(value)
+
+
+def estimate_size(value: Any) -> int:
+    """결과 객체의 대략적인 메모리 사용량 (bytes)
+
+    DataGenerators 결과는 dict/list/스칼라로만 구성되므로 컨테이너를 따라가며 sys.getsizeof를 더한다.
+    같은 객체를 여러 번 참조해도 한 번만 센다.
+    """
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return total
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "generator")
+
+    def __init__(self, value: Any, size: int, expires_at: float, generator: str):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.generator = generator
+
+
+class ResultCache:
+    """데이터 생성 결과 캐시
+
+    - 키: (생성 함수 이름, 인자, 원본 파일 지문) → 엑셀 파일이 바뀌면 (mtime/크기) 자동으로 다른 키가 됨
+    - ttl: 항목 유효 시간(초), 지나면 다음 조회 때 버림
+    - max_bytes: 결과 크기 합계 상한, 넘으면 가장 오래 쓰지 않은 항목부터 제거 (LRU)
+      한 항목이 max_bytes보다 크면 캐시하지 않음
+    - 생성 함수가 Uncached로 감싸 반환한 결과 (샘플 데이터 대체 등)는 저장하지 않음
+
+    캐시된 결과는 여러 요청이 같은 객체를 공유하므로 호출 측에서 수정하면 안 된다.
+    """
+
+    def __init__(self, max_bytes: int = settings.DATA_CACHE_MAX_BYTES,
+                 ttl: float = settings.DATA_CACHE_TTL_SECONDS,
+                 enabled: bool = settings.DATA_CACHE_ENABLED):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._uncached = 0
+        self._stores = 0
+        self._rejected = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def _remove(self, key: Hashable) -> _Entry:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        return entry
+
+    def get(self, key: Hashable) -> Any:
+        """캐시된 결과, 없거나 만료되었으면 _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return _MISSING
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, generator: str) -> None:
+        """결과 저장 후 max_bytes를 넘으면 LRU 순으로 제거"""
+        size = estimate_size(value)
+        with self._lock:
+            if size > self.max_bytes:
+                self._rejected += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(value, size, time.monotonic() + self.ttl, generator)
+            self._bytes += size
+            self._stores += 1
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+
+    def invalidate(self, generator: Optional[str] = None) -> int:
+        """캐시 비우기 (generator를 지정하면 해당 생성 함수의 항목만), 제거한 항목 수 반환"""
+        with self._lock:
+            if generator is None:
+                keys = list(self._entries)
+            else:
+                keys = [k for k, e in self._entries.items() if e.generator == generator]
+            for key in keys:
+                self._remove(key)
+            self._invalidations += len(keys)
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached data generator results"
+                        + (f" for {generator}" if generator else ""))
+        return len(keys)
+
+    def cached(self, dataset: str,
+               registry: DatasetRegistry = dataset_registry) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """dataset(DatasetRegistry 이름)을 읽는 데이터 생성 함수에 캐시를 적용하는 데코레이터"""
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            name = func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                fingerprint = registry.fingerprint(dataset) if self.enabled else None
+                if fingerprint is None:
+                    # 캐시를 껐거나 원본 파일이 없어 샘플 데이터를 만드는 경우
+                    with self._lock:
+                        self._bypassed += 1
+                    value = func(*args, **kwargs)
+                    return value.value if isinstance(value, Uncached) else value
+
+                key = (name, args, tuple(sorted(kwargs.items())), fingerprint)
+                value = self.get(key)
+                if value is not _MISSING:
+                    return value
+                value = func(*args, **kwargs)
+                if isinstance(value, Uncached):
+                    with self._lock:
+                        self._uncached += 1
+                    return value.value
+                self.put(key, value, name)
+                return value
+
+            wrapper.cache = self
+            return wrapper
+        return decorator
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 조회 (hit_rate: 조회 중 캐시에서 반환한 비율)"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            by_generator: Dict[str, int] = {}
+            for entry in self._entries.values():
+                by_generator[entry.generator] = by_generator.get(entry.generator, 0) + 1
+            return {
+                'enabled': self.enabled,
+                'ttl_seconds': self.ttl,
+                'max_bytes': self.max_bytes,
+                'bytes': self._bytes,
+                'entries': len(self._entries),
+                'entries_by_generator': by_generator,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'bypassed': self._bypassed,
+                'uncached': self._uncached,
+                'stores': self._stores,
+                'rejected': self._rejected,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._invalidations,
+            }
+
+
+# 전역 데이터 생성 결과 캐시
+result_cache = ResultCache()
@@ -0,0 +1,109 @@
+"""
+Single flight - Coalesces identical concurrent DataGenerators calls into one shared computation on the event loop
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CoalescedTimeoutError(TimeoutError):
+    """같은 키의 진행 중인 계산을 기다리다 키별 제한 시간을 넘었을 때"""
+
+
+class _Flight:
+    __slots__ = ("task", "deadline", "waiters", "callers")
+
+    def __init__(self, task: "asyncio.Task[Any]", deadline: Optional[float]):
+        self.task = task
+        self.deadline = deadline
+        self.waiters = 0  # leader를 제외하고 기다리는 호출 수 (통계용)
+        self.callers = 1  # 결과를 아직 기다리는 호출 수 (leader 포함)
+
+
+class SingleFlight:
+    """키별 in-flight 계산 공유 (이벤트 루프에서 사용)
+
+    - 같은 키로 동시에 들어온 호출 중 첫 호출(leader)만 func()로 태스크를 만들고, 나머지(waiter)는 같은 태스크를 await
+      → 스레드풀 작업은 leader 하나만 차지하고 waiter는 워커 스레드를 쓰지 않음
+    - 태스크가 예외로 끝나면 같은 예외가 모든 호출에 전달됨
+    - timeout은 키별 마감 시간: 계산이 시작된 시점부터 재므로 늦게 합류한 waiter도 같은 시각에 포기함
+      (leader는 제한 없이 기다리며, 실행 자체의 제한 시간은 func 쪽(GeneratorExecutor)이 담당)
+    - 호출이 취소되어도 공유 태스크는 shield로 보호하고, 기다리는 호출이 하나도 남지 않으면 그때 태스크를 취소
+    - 계산이 끝나면 키를 바로 제거하므로 결과를 보관하지 않음 (보관은 result_cache 담당)
+    """
+
+    def __init__(self, timeout: Optional[float] = settings.DATA_COALESCE_TIMEOUT):
+        self.timeout = timeout
+        self._flights: Dict[Hashable, _Flight] = {}
+
+        self._leaders = 0
+        self._coalesced = 0
+        self._failures = 0
+        self._timeouts = 0
+        self._max_waiters = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """key에 대해 진행 중인 계산이 있으면 그 결과를, 없으면 func()를 await한 결과를 반환"""
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        if flight is None:
+            limit = self.timeout if timeout is None else timeout
+            flight = _Flight(loop.create_task(func()), loop.time() + limit if limit else None)
+            flight.task.add_done_callback(lambda task: self._finish(key, task))
+            self._flights[key] = flight
+            self._leaders += 1
+            leader, remaining = True, None
+        else:
+            flight.waiters += 1
+            flight.callers += 1
+            self._coalesced += 1
+            self._max_waiters = max(self._max_waiters, flight.waiters)
+            leader = False
+            remaining = None if flight.deadline is None else max(flight.deadline - loop.time(), 0)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.task), remaining)
+        except asyncio.TimeoutError:
+            if flight.task.done():
+                # 태스크 자체가 TimeoutError로 끝난 경우 (GeneratorExecutor 제한 시간) 그대로 전달
+                raise
+            self._timeouts += 1
+            logger.warning(f"Timed out waiting for in-flight computation of {key!r}")
+            raise CoalescedTimeoutError(f"Timed out waiting for in-flight computation of {key!r}")
+        finally:
+            flight.callers -= 1
+            if not leader:
+                flight.waiters -= 1
+            if flight.callers == 0 and not flight.task.done():
+                # 결과를 받을 호출이 모두 떠났으면 (클라이언트 연결 종료/시간 초과) 대기 중인 작업을 큐에서 뺌
+                flight.task.cancel()
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        # 예외를 여기서 꺼내 두어야 아무도 기다리지 않을 때 "exception was never retrieved" 경고가 나지 않음
+        if not task.cancelled() and task.exception() is not None:
+            self._failures += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """통계 조회 (coalesced: 다른 요청의 계산 결과를 받은 호출 수)"""
+        return {
+            'timeout_seconds': self.timeout,
+            'in_flight': len(self._flights),
+            'waiting': sum(flight.waiters for flight in self._flights.values()),
+            'leaders': self._leaders,
+            'coalesced': self._coalesced,
+            'failures': self._failures,
+            'timeouts': self._timeouts,
+            'max_waiters': self._max_waiters,
+        }
+
+
+# 전역 데이터 생성 single-flight
+data_single_flight = SingleFlight()
@@ -0,0 +1,61 @@
+"""
+Stage pipeline - Measures processing stages and builds progress SSE frames from real timings
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+
+class StagePipeline:
+    """요청 처리 단계(classify → load → transform → persist → render) 진행 이벤트
+
+    각 단계가 실제로 시작/종료될 때 progress SSE 프레임을 만들고 경과 시간을 기록한다.
+    begin/finish는 보낼 프레임 목록을 반환하므로 async generator 안에서 그대로 yield하면 된다.
+    progress=False이면 프레임 없이 시간만 기록한다 (API 클라이언트용).
+
+        for frame in pipeline.begin('load', '📈 데이터를 생성하고 있습니다...'):
+            yield frame
+    """
+
+    def __init__(self, progress: bool = True):
+        self.progress = progress
+        self._started: Dict[str, float] = {}
+        self.timings: Dict[str, float] = {}  # 단계별 경과 시간 (ms)
+
+    def _frame(self, payload: Dict[str, Any]) -> List[str]:
+        if not self.progress:
+            return []
+        return [f"data: {json.dumps(payload)}\n\n"]
+
+    def begin(self, stage: str, message: Optional[str] = None) -> List[str]:
+        """단계 시작 - 진행 메시지 프레임 반환 (message가 없으면 시간만 기록)"""
+        self._started[stage] = time.perf_counter()
+        if message is None:
+            return []
+        return self._frame({'progress_message': message, 'stage': stage, 'status': 'start'})
+
+    def finish(self, stage: str, message: Optional[str] = None) -> List[str]:
+        """단계 종료 - 실제 경과 시간을 담은 프레임 반환"""
+        started = self._started.pop(stage, None)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1) if started is not None else 0.0
+        self.timings[stage] = elapsed_ms
+        payload = {'stage': stage, 'status': 'end', 'elapsed_ms': elapsed_ms}
+        if message:
+            payload['progress_message'] = message
+        return self._frame(payload)
+
+    def fail(self, msg: str) -> List[str]:
+        """열려 있는 단계를 모두 종료한 뒤 에러 프레임을 붙여 반환 (에러 프레임은 progress=False여도 보냄)
+
+        중간에 에러로 끝나도 클라이언트에 시작만 되고 끝나지 않은 단계가 남지 않게 한다.
+        """
+        frames = []
+        for stage in list(self._started):
+            frames.extend(self.finish(stage))
+        frames.append(f"data: {json.dumps({'msg': msg})}\n\n")
+        return frames
+
+    def summary(self) -> Dict[str, Any]:
+        """완료된 단계별 시간과 합계 (DEBUG 로그용, 응답 프레임에는 포함하지 않음)"""
+        return {'stages': dict(self.timings), 'total_ms': round(sum(self.timings.values()), 1)}
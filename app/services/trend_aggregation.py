@@ -0,0 +1,82 @@
+"""
+Trend aggregation - Server-side box-plot statistics for INLINE Trend charts
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# 요청 플래그 값: real_data를 원본 행 대신 박스 통계로 보냄
+AGGREGATE_BOX = "box"
+SUPPORTED_AGGREGATES = (AGGREGATE_BOX,)
+
+# INLINETrendChart.vue가 측정값으로 쓰는 컬럼 (NO_VAL1..N, 결측 코드 컬럼 NO_VAL은 제외)
+VALUE_COLUMN_PATTERN = re.compile(r"^NO_VAL\d+$")
+# 박스마다 첫 값을 그대로 싣는 스펙 라인 컬럼
+SPEC_COLUMNS = ('USL', 'LSL', 'TGT', 'UCL', 'LCL')
+# Plotly 박스 트레이스 기본값과 같은 수염 길이 (1.5 × IQR 안의 가장 먼 점까지)
+WHISKER_IQR = 1.5
+
+
+def value_columns(df: pd.DataFrame) -> List[str]:
+    """측정값 컬럼 목록 (NO_VAL 번호 순)"""
+    columns = [c for c in df.columns if isinstance(c, str) and VALUE_COLUMN_PATTERN.match(c)]
+    return sorted(columns, key=lambda c: int(c[len('NO_VAL'):]))
+
+
+def box_plot_stats(df: pd.DataFrame, group_columns: Sequence[str],
+                   values: Optional[Sequence[str]] = None,
+                   spec_columns: Sequence[str] = SPEC_COLUMNS) -> pd.DataFrame:
+    """그룹별 박스플롯 통계 DataFrame (그룹 하나가 박스 하나)
+
+    - 그룹의 모든 측정값 컬럼 값을 한 표본으로 모아 계산 (결측 제외, 값이 없는 그룹은 제외)
+    - count, mean, q1/median/q3 (선형 보간), lowerfence/upperfence (1.5 × IQR 안의 최소/최대),
+      outliers (울타리 밖 값 목록), 스펙 컬럼은 그룹의 첫 값
+    - 그룹 컬럼 값이 결측인 행은 차트에 그려지지 않으므로 제외
+    """
+    group_columns = list(group_columns)
+    values = list(values) if values is not None else value_columns(df)
+    spec_columns = [c for c in spec_columns if c in df.columns]
+
+    # 그룹 컬럼은 원본 행 단위로 한 번만 인코딩하고, 측정값 행렬을 펼칠 때 그룹 번호만 반복
+    df = df[df[group_columns].notna().all(axis=1)]
+    grouped = df.groupby(group_columns, sort=True, observed=True)
+    row_codes = grouped.ngroup().to_numpy()
+    sample = df[values].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float).ravel()
+    codes = np.repeat(row_codes, len(values))
+    present = ~np.isnan(sample)
+    sample, codes = sample[present], codes[present]
+
+    stats = pd.DataFrame(index=grouped.size().index)
+    all_groups = range(len(stats))
+    by_group = pd.Series(sample).groupby(codes)
+    quartiles = by_group.quantile([0.25, 0.5, 0.75]).unstack().reindex(index=all_groups, columns=[0.25, 0.5, 0.75])
+    stats['count'] = by_group.count().reindex(all_groups, fill_value=0).to_numpy()
+    stats['mean'] = by_group.mean().reindex(all_groups).to_numpy()
+    stats['q1'] = quartiles[0.25].to_numpy()
+    stats['median'] = quartiles[0.5].to_numpy()
+    stats['q3'] = quartiles[0.75].to_numpy()
+
+    # 울타리 안/밖 판정은 그룹 통계를 값마다 펼쳐 한 번에 처리
+    q1, q3 = stats['q1'].to_numpy(), stats['q3'].to_numpy()
+    low_limit = q1 - WHISKER_IQR * (q3 - q1)
+    high_limit = q3 + WHISKER_IQR * (q3 - q1)
+    inside = (sample >= low_limit[codes]) & (sample <= high_limit[codes])
+    stats['lowerfence'] = pd.Series(sample[inside]).groupby(codes[inside]).min().reindex(all_groups).to_numpy()
+    stats['upperfence'] = pd.Series(sample[inside]).groupby(codes[inside]).max().reindex(all_groups).to_numpy()
+
+    # 울타리 밖 값을 그룹 번호 순으로 정렬해 그룹별 구간으로 자름 (그룹마다 pandas 호출 없음)
+    outlier_codes = codes[~inside]
+    order = np.argsort(outlier_codes, kind='stable')
+    points = sample[~inside][order].tolist()
+    ends = np.cumsum(np.bincount(outlier_codes, minlength=len(stats))).tolist()
+    starts = [0] + ends[:-1]
+    stats['outliers'] = [points[start:end] for start, end in zip(starts, ends)]
+
+    if spec_columns:
+        stats = stats.join(grouped[spec_columns].first())
+
+    # 측정값이 하나도 없는 그룹은 박스가 없음
+    return stats[stats['count'] > 0].reset_index()
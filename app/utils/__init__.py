@@ -18,7 +18,15 @@ from .app_utils import (
     get_app_info
 )
 
-from from utils.call_llm import safe_generate, client
+from .json_codec import (
+    dumps,
+    dumps_bytes,
+    splice_object,
+    sse_frame
+)
+
+# call_llm은 google-genai 클라이언트를 import 시점에 만들므로 패키지에서 다시 내보내지 않음
+# (필요한 곳에서 from app.utils.call_llm import safe_generate)
 
 __all__ = [
     "create_jwt_token",
@@ -31,6 +39,8 @@ __all__ = [
     "initialize_default_chatrooms", 
     "initialize_application",
     "get_app_info",
-    "safe_generate",
-    "client"
+    "dumps",
+    "dumps_bytes",
+    "splice_object",
+    "sse_frame"
 ]
@@ -0,0 +1,117 @@
+"""
+JSON codec - Single JSON encoder for the response path (orjson when installed, stdlib json otherwise)
+
+응답 경로의 페이로드는 여기서 한 번만 bytes로 직렬화하고, 저장/SSE 프레임/로그 크기 계산에 같은 bytes를 재사용한다.
+numpy 배열/스칼라, pandas DataFrame/Series/Timestamp, datetime을 그대로 넘겨도 된다.
+"""
+
+import datetime as _dt
+import decimal
+import json
+import math
+from typing import Any, Dict
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def _default(obj: Any) -> Any:
+    """기본 인코더가 모르는 타입 변환 (orjson/stdlib 공용)"""
+    if pd is not None:
+        if isinstance(obj, pd.DataFrame):
+            return obj.to_dict(orient='records')
+        if isinstance(obj, pd.Series):
+            return obj.tolist()
+        if isinstance(obj, pd.Timestamp):
+            return None if pd.isna(obj) else obj.isoformat()
+        if obj is pd.NaT:
+            return None
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+    if isinstance(obj, (_dt.datetime, _dt.date, _dt.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """obj → UTF-8 JSON bytes (NaN/Infinity는 null)"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    def loads(data: Any) -> Any:
+        return orjson.loads(data)
+else:
+    def _without_non_finite(obj: Any) -> Any:
+        """NaN/Infinity → None으로 바꾼 사본 (stdlib json은 NaN/Infinity를 그대로 써서 JSON이 깨짐)"""
+        if isinstance(obj, float):
+            return obj if math.isfinite(obj) else None
+        if obj is None or isinstance(obj, (str, int)):
+            return obj
+        if isinstance(obj, dict):
+            return {key: _without_non_finite(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [_without_non_finite(value) for value in obj]
+        return _without_non_finite(_default(obj))
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """obj → UTF-8 JSON bytes (orjson이 없을 때 stdlib json 사용, NaN/Infinity는 null)"""
+        try:
+            text = json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':'), allow_nan=False)
+        except ValueError:
+            # 비유한 실수가 있을 때만 전체를 한 번 더 훑음 (대부분의 응답은 첫 시도로 끝남)
+            text = json.dumps(_without_non_finite(obj), ensure_ascii=False, separators=(',', ':'))
+        return text.encode('utf-8')
+
+    def loads(data: Any) -> Any:
+        return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """obj → JSON 문자열 (DB TEXT/JSONB 컬럼에 저장할 때)"""
+    return dumps_bytes(obj).decode('utf-8')
+
+
+def splice_object(encoded: bytes, members: Dict[str, bytes]) -> bytes:
+    """이미 직렬화된 JSON 객체 bytes에 직렬화된 멤버를 덧붙임 (다시 인코딩하지 않음)
+
+        splice_object(b'{"a":1}', {'real_data': b'[1,2]'}) == b'{"a":1,"real_data":[1,2]}'
+    """
+    if not members:
+        return encoded
+    body = encoded.rstrip()
+    if not body.endswith(b'}'):
+        raise ValueError("splice_object expects an encoded JSON object")
+    parts = [dumps_bytes(key) + b':' + value for key, value in members.items()]
+    separator = b'' if body == b'{}' else b','
+    return body[:-1] + separator + b','.join(parts) + b'}'
+
+
+def sse_frame(payload: Any) -> bytes:
+    """SSE data 프레임 bytes (payload가 bytes면 이미 직렬화된 JSON으로 간주)"""
+    body = payload if isinstance(payload, bytes) else dumps_bytes(payload)
+    return b'data: ' + body + b'\n\n'
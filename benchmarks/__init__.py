@@ -0,0 +1,3 @@
+"""
+Benchmarks - Standalone performance scripts (python -m benchmarks.<name>)
+"""
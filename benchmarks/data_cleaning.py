@@ -0,0 +1,107 @@
+"""
+Benchmark - Vectorized clean_frame/to_records vs the previous per-record cleaning loop
+
+Usage:
+    python -m benchmarks.data_cleaning                  # 1,000,000행
+    python -m benchmarks.data_cleaning --rows 200000 --skip-legacy
+"""
+
+import argparse
+import math
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.data_cleaning import clean_frame, to_records
+
+
+def make_iqc_frame(rows: int) -> pd.DataFrame:
+    """iqc_data.xlsx와 같은 모양의 DataFrame (날짜, object 안의 Timestamp, inf/NaN, NO_VAL 결측 코드 9)"""
+    rng = np.random.default_rng(0)
+    trans_date = pd.Timestamp('2025-01-01') + pd.to_timedelta(np.arange(rows) * 7, unit='min')
+    no_vals = {}
+    for n in range(1, 6):
+        values = rng.uniform(350, 650, rows).round(4)
+        values[rng.random(rows) < 0.05] = 9
+        values[rng.random(rows) < 0.01] = np.nan
+        values[rng.random(rows) < 0.001] = np.inf
+        no_vals[f'NO_VAL{n}'] = values
+    return pd.DataFrame({
+        'TRANS_DATE': trans_date,
+        'MEASURED_AT': pd.Series(trans_date.to_pydatetime(), dtype=object),
+        'LOT_NO': np.char.add('LOT', (np.arange(rows) // 25).astype(str)),
+        'FOR_KEY': np.char.add('KEY_', (np.arange(rows) % 40).astype(str)),
+        'DEVICE': rng.choice(['DEVICE_A', 'DEVICE_B', 'DEVICE_C'], rows),
+        'MAIN_EQ': rng.choice(['EQ01', 'EQ02', 'EQ03', 'EQ04'], rows),
+        'PARA': rng.integers(0, 4, rows),
+        **no_vals,
+        'USL': 550, 'TGT': 420, 'LSL': 300, 'UCL': 500, 'LCL': 360,
+    })
+
+
+def legacy_records(masking_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """이전 generate_inline_analysis_data의 정리 단계 (레코드/키마다 Python 루프)"""
+    df_clean = masking_df.copy()
+    for col in df_clean.columns:
+        if pd.api.types.is_datetime64_any_dtype(df_clean[col]):
+            df_clean[col] = df_clean[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+        elif df_clean[col].dtype == 'object':
+            sample_val = df_clean[col].dropna().iloc[0] if len(df_clean[col].dropna()) > 0 else None
+            if sample_val is not None and isinstance(sample_val, (pd.Timestamp, datetime)):
+                df_clean[col] = df_clean[col].apply(
+                    lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if pd.notna(x) and isinstance(x, (pd.Timestamp, datetime)) else x
+                )
+    df_clean = df_clean.replace([np.nan, np.inf, -np.inf], None)
+    for col in df_clean.columns:
+        if df_clean[col].dtype == 'int64':
+            df_clean[col] = df_clean[col].astype('Int64')
+    data = df_clean.to_dict(orient='records')
+    for record in data:
+        for key, value in list(record.items()):
+            if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+                record[key] = None
+            elif isinstance(value, (pd.Timestamp, datetime)):
+                record[key] = value.strftime('%Y-%m-%d %H:%M:%S')
+            elif key.startswith('NO_VAL') and value == 9:
+                record[key] = None
+            elif hasattr(value, 'item'):
+                record[key] = value.item()
+    return data
+
+
+def vectorized_records(masking_df: pd.DataFrame) -> List[Dict[str, Any]]:
+    return to_records(clean_frame(masking_df))
+
+
+def timed(func: Callable[[], Any]) -> Tuple[float, Any]:
+    started = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.data_cleaning")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--skip-legacy", action="store_true", help="이전 루프 방식 측정 생략 (큰 행 수에서 오래 걸림)")
+    args = parser.parse_args()
+
+    df = make_iqc_frame(args.rows)
+    print(f"{args.rows} rows x {df.shape[1]} columns")
+
+    sample = df.head(10_000)
+    assert legacy_records(sample) == vectorized_records(sample), "vectorized output differs from legacy output"
+
+    clean_ms, cleaned = timed(lambda: clean_frame(df))
+    records_ms, _ = timed(lambda: to_records(cleaned))
+    vectorized_ms = clean_ms + records_ms
+    print(f"{'vectorized':<12} {vectorized_ms:>10.0f} ms  (clean_frame {clean_ms:.0f} ms + to_records {records_ms:.0f} ms)")
+    if not args.skip_legacy:
+        legacy_ms, _ = timed(lambda: legacy_records(df))
+        print(f"{'legacy loop':<12} {legacy_ms:>10.0f} ms  ({legacy_ms / vectorized_ms:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
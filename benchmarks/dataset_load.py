@@ -0,0 +1,87 @@
+"""
+Benchmark - Cold-start load time of an Excel data source vs its Parquet / Arrow sidecar
+
+Usage:
+    python -m benchmarks.dataset_load
+    python -m benchmarks.dataset_load --rows 50000 --repeat 3
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+from app.services.dataset_sidecar import HAS_PYARROW, SUPPORTED_FORMATS, DatasetSidecar, normalize_dtypes
+
+
+def make_iqc_frame(rows: int) -> pd.DataFrame:
+    """iqc_data.xlsx와 같은 모양의 DataFrame (TRANS_DATE, 기준 컬럼, NO_VAL1..5, 관리 한계)"""
+    random.seed(0)
+    start = pd.Timestamp('2025-01-01')
+    return pd.DataFrame({
+        'TRANS_DATE': [start + pd.Timedelta(minutes=7 * i) for i in range(rows)],
+        'LOT_NO': [f'LOT{i // 25:05d}' for i in range(rows)],
+        'WAFER_ID': [f'W{i % 25:02d}' for i in range(rows)],
+        'FOR_KEY': [f'KEY_{i % 40}' for i in range(rows)],
+        'DEVICE': [random.choice(['DEVICE_A', 'DEVICE_B', 'DEVICE_C']) for _ in range(rows)],
+        'MAIN_EQ': [random.choice(['EQ01', 'EQ02', 'EQ03', 'EQ04']) for _ in range(rows)],
+        'EQ_CHAM': [random.choice(['P0', 'P1', 'P2']) for _ in range(rows)],
+        'PARA': [random.randint(0, 3) for _ in range(rows)],
+        **{f'NO_VAL{n}': [random.choice([9, round(random.uniform(350, 650), 4)]) for _ in range(rows)]
+           for n in range(1, 6)},
+        'USL': 550, 'TGT': 420, 'LSL': 300, 'UCL': 500, 'LCL': 360,
+    })
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    """repeat번 실행한 것 중 가장 빠른 시간 (ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(rows: int, repeat: int) -> List[Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'iqc_data.xlsx')
+        make_iqc_frame(rows).to_excel(source, index=False)
+        results = [{
+            'source': 'excel (openpyxl)',
+            'bytes': os.path.getsize(source),
+            'load_ms': timed(lambda: normalize_dtypes(pd.read_excel(source)), repeat),
+        }]
+        if HAS_PYARROW:
+            for fmt in SUPPORTED_FORMATS:
+                sidecar = DatasetSidecar(sidecar_dir=os.path.join(tmp, 'cache'), fmt=fmt, enabled=True)
+                sidecar.build(source, force=True)
+                results.append({
+                    'source': f'{fmt} sidecar',
+                    'bytes': os.path.getsize(sidecar.sidecar_path(source)),
+                    'load_ms': timed(lambda: sidecar.load(source), repeat),
+                })
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.dataset_load")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not HAS_PYARROW:
+        print("pyarrow is not installed - sidecar rows skipped (pip install pyarrow)")
+    print(f"{'source':<20} {'bytes':>12} {'load ms':>10} {'speedup':>8}")
+    results = run(args.rows, args.repeat)
+    excel_ms = results[0]['load_ms']
+    for r in results:
+        print(f"{r['source']:<20} {r['bytes']:>12} {r['load_ms']:>10.1f} {excel_ms / r['load_ms']:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark - Stored bot response size and encode/decode cost per content encoding
+
+Usage:
+    python -m benchmarks.response_compression
+    python -m benchmarks.response_compression --rows 5000 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from app.repositories.content_codec import HAS_ZSTD, ContentCodec
+
+
+def make_pcm_trend_response(rows_per_para: int) -> Dict[str, Any]:
+    """DataGenerators.generate_pcm_trend_data와 같은 모양의 응답 (PARA별 행 목록)"""
+    random.seed(0)
+    real_data = {}
+    for para in ("PARA1", "PARA2"):
+        real_data[para] = [{
+            'DATE_WAFER_ID': f'2025-06-{i}:36:57:54_A12345678998999',
+            'MIN': round(random.uniform(8, 12), 2),
+            'MAX': round(random.uniform(18, 22), 2),
+            'Q1': round(random.uniform(14, 16), 2),
+            'Q2': round(random.uniform(15, 17), 2),
+            'Q3': round(random.uniform(16, 18), 2),
+            'DEVICE': random.choice(['A', 'B', 'C']),
+            'USL': 30,
+            'TGT': 15,
+            'LSL': 1,
+            'UCL': 25,
+            'LCL': 6
+        } for i in range(1, rows_per_para + 1)]
+    return {
+        'result': 'lot_start',
+        'real_data': real_data,
+        'sql': 'SELECT * FROM pcm_data WHERE date >= "2024-01-01"',
+        'success_message': '✅ PCM TREND 데이터를 성공적으로 받았습니다!'
+    }
+
+
+def best_ms(func: Callable[[], Any], repeat: int) -> float:
+    """repeat번 실행한 것 중 가장 빠른 시간 (ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(rows_per_para: int, repeat: int) -> List[Dict[str, Any]]:
+    response = make_pcm_trend_response(rows_per_para)
+    text = json.dumps(response)
+    raw_bytes = len(text.encode('utf-8'))
+    results = [{
+        'encoding': 'jsonb (none)',
+        'bytes': raw_bytes,
+        'ratio': 1.0,
+        'encode_ms': best_ms(lambda: json.dumps(response), repeat),
+        'decode_ms': best_ms(lambda: json.loads(text), repeat),
+    }]
+
+    encodings = ['zlib'] + (['zstd'] if HAS_ZSTD else [])
+    for encoding in encodings:
+        for level in (1, 3, 9):
+            codec = ContentCodec(encoding=encoding, level=level)
+            blob, actual = codec.encode(text)
+            results.append({
+                'encoding': f'{actual} (level {level})',
+                'bytes': len(blob),
+                'ratio': round(raw_bytes / len(blob), 2),
+                'encode_ms': best_ms(lambda: codec.encode(json.dumps(response)), repeat),
+                'decode_ms': best_ms(lambda: json.loads(codec.decode(blob, actual)), repeat),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.response_compression")
+    parser.add_argument("--rows", type=int, default=999, help="PARA당 행 수 (기본: generate_pcm_trend_data와 같은 999)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if not HAS_ZSTD:
+        print("zstandard is not installed - zstd rows skipped (pip install zstandard)")
+    print(f"{'encoding':<20} {'bytes':>10} {'ratio':>7} {'saved':>8} {'encode ms':>10} {'decode ms':>10}")
+    results = run(args.rows, args.repeat)
+    raw_bytes = results[0]['bytes']
+    for r in results:
+        saved = 1 - r['bytes'] / raw_bytes
+        print(f"{r['encoding']:<20} {r['bytes']:>10} {r['ratio']:>7} {saved:>8.1%} "
+              f"{r['encode_ms']:>10.2f} {r['decode_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
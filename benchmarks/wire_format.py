@@ -0,0 +1,76 @@
+"""
+Benchmark - Encode time and size of real_data in records vs columnar wire format
+
+Usage:
+    python -m benchmarks.wire_format
+    python -m benchmarks.wire_format --rows 1000000 --repeat 1
+"""
+
+import argparse
+import time
+import zlib
+from typing import Any, Callable, Dict, List
+
+from app.services.columnar_format import encode_real_data
+from app.services.data_cleaning import clean_frame, to_records
+from app.services.data_generators import DataGenerators
+from app.utils import json_codec
+from benchmarks.data_cleaning import make_iqc_frame
+
+
+def timed(func: Callable[[], Any], repeat: int) -> float:
+    """repeat번 실행한 것 중 가장 빠른 시간 (ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def payloads(rows: int) -> Dict[str, Any]:
+    """응답 real_data 모양별 샘플 (PCM Trend: PARA별 999행, INLINE: iqc 모양 rows행)"""
+    return {
+        'pcm_trend': DataGenerators.generate_pcm_trend_data(),
+        f'inline_rows ({rows})': to_records(clean_frame(make_iqc_frame(rows))),
+    }
+
+
+def measure(real_data: Any, repeat: int) -> List[Dict[str, Any]]:
+    records = json_codec.dumps_bytes(real_data)
+    columnar = json_codec.dumps_bytes(encode_real_data(real_data))
+    return [
+        {
+            'format': 'records',
+            'bytes': len(records),
+            'deflate_bytes': len(zlib.compress(records, 6)),
+            'encode_ms': timed(lambda: json_codec.dumps_bytes(real_data), repeat),
+        },
+        {
+            'format': 'columnar',
+            'bytes': len(columnar),
+            'deflate_bytes': len(zlib.compress(columnar, 6)),
+            # 컬럼 변환 + 직렬화 (서버가 실제로 하는 일)
+            'encode_ms': timed(lambda: json_codec.dumps_bytes(encode_real_data(real_data)), repeat),
+        },
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.wire_format")
+    parser.add_argument("--rows", type=int, default=200000, help="INLINE 샘플 행 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if json_codec.HAS_ORJSON else 'json'}")
+    print(f"{'payload':<22} {'format':<9} {'bytes':>12} {'deflate':>11} {'encode ms':>10}")
+    for name, real_data in payloads(args.rows).items():
+        results = measure(real_data, args.repeat)
+        for r in results:
+            print(f"{name:<22} {r['format']:<9} {r['bytes']:>12} {r['deflate_bytes']:>11} {r['encode_ms']:>10.1f}")
+        print(f"{'':<22} {'ratio':<9} {results[0]['bytes'] / results[1]['bytes']:>11.1f}x "
+              f"{results[0]['deflate_bytes'] / results[1]['deflate_bytes']:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
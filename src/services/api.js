@@ -108,6 +108,36 @@ export const getChatRoomHistory = async (chatroomId) => {
   }
 }
 
+// 채팅방 히스토리 페이지 조회 (최신순, 응답의 next_cursor를 before로 넘겨 이전 페이지 조회)
+export const getChatRoomHistoryPage = async (chatroomId, { limit = 20, before = null, idsOnly = false } = {}) => {
+  try {
+    // 인증 확인
+    if (!isAuthenticated()) {
+      throw new Error('인증이 필요합니다. 로그인해주세요.')
+    }
+
+    const params = new URLSearchParams({ limit: String(limit) })
+    if (before) params.set('before', before)
+    if (idsOnly) params.set('fields', 'ids')
+
+    const response = await fetch(`${API_BASE_URL}/chatrooms/${chatroomId}/history?${params}`, {
+      headers: getAuthHeaders()
+    })
+
+    if (!response.ok) {
+      if (response.status === 401) {
+        throw new Error('인증이 만료되었습니다. 다시 로그인해주세요.')
+      }
+      throw new Error(`HTTP error! status: ${response.status}`)
+    }
+
+    return await response.json()
+  } catch (error) {
+    console.error('Error fetching chatroom history page:', error)
+    throw error
+  }
+}
+
 
 
 export const deleteChatRoom = async (chatroomId) => {
@@ -170,9 +200,154 @@ export const updateChatRoomName = async (chatroomId, name) => {
   }
 }
 
+// /chat, /edit_message SSE 응답 읽기 - 완성된 data: 라인마다 파싱해 onData로 전달
+const readChatStream = async (response, onData) => {
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  
+  while (true) {
+    const { done, value } = await reader.read()
+    if (done) break
+    
+    const chunk = decoder.decode(value, { stream: true })
+    buffer += chunk
+    
+    // 완전한 라인들을 찾아서 처리
+    const lines = buffer.split('\n')
+    
+    // 마지막 라인은 불완전할 수 있으므로 버퍼에 보관
+    buffer = lines.pop() || ''
+    
+    for (const line of lines) {
+      if (line.trim() && line.startsWith('data: ')) {
+        try {
+          const jsonString = line.slice(6).trim()
+          if (jsonString) {
+            const data = JSON.parse(jsonString)
+            console.log('✅ Successfully parsed streaming data:', Object.keys(data))
+            onData(data)
+          }
+        } catch (e) {
+          console.error('❌ Error parsing streaming data:', e)
+          console.error('❌ Problematic line:', line.substring(0, 200) + '...')
+        }
+      }
+    }
+  }
+  
+  // 마지막에 남은 버퍼 처리
+  if (buffer.trim() && buffer.startsWith('data: ')) {
+    try {
+      const jsonString = buffer.slice(6).trim()
+      if (jsonString) {
+        const data = JSON.parse(jsonString)
+        console.log('✅ Successfully parsed final streaming data:', Object.keys(data))
+        onData(data)
+      }
+    } catch (e) {
+      console.error('❌ Error parsing final streaming data:', e)
+    }
+  }
+}
+
+// 청크 스트리밍(stream_rows) 프레임을 기존 단일 응답 형태로 재조립
+// header → chunk × N → end 순서로 오며, end에서 { chat_id, message_id, response_id, ..., response }를 onData로 전달
+// onChunk가 있으면 청크가 도착할 때마다 (rows, header)를 넘겨 점진적으로 렌더링할 수 있음
+const createChunkAssembler = (onData, onChunk) => {
+  let header = null
+  let rows = []
+  let received = 0
+
+  return (data) => {
+    if (data.stream === 'header') {
+      header = data
+      rows = []
+      received = 0
+      return
+    }
+    if (!header) {
+      console.error('❌ Chunk frame received before header:', data.stream)
+      return
+    }
+    if (data.stream === 'chunk') {
+      if (data.seq !== received) {
+        console.error(`❌ Out of order chunk: expected ${received}, got ${data.seq}`)
+      }
+      received += 1
+      rows = rows.concat(data.rows)
+      if (onChunk) {
+        onChunk(data.rows, header)
+      }
+      return
+    }
+    if (data.stream === 'end') {
+      if (received !== data.total_chunks || rows.length !== data.total_rows) {
+        console.error(`❌ Incomplete chunked response: ${rows.length}/${data.total_rows} rows`)
+      }
+      // header에서 청크 메타데이터를 뺀 나머지(chat_id, message_id, response_id 등)가 응답 봉투
+      // eslint-disable-next-line no-unused-vars
+      const { stream, meta, columns, total_rows, chunk_rows, total_chunks, ...envelope } = header
+      onData({ ...envelope, response: { ...meta, real_data: rows } })
+      header = null
+      rows = []
+    }
+  }
+}
+
+// 컬럼 형식(real_data_format: 'columnar') real_data를 기존 행 목록으로 복원
+// { format: 'columnar', length, columns, values, constants } → [{ ...constants, [columns[i]]: values[i][row] }]
+const decodeColumnarData = (value) => {
+  if (Array.isArray(value)) {
+    return value.map(decodeColumnarData)
+  }
+  if (!value || typeof value !== 'object') {
+    return value
+  }
+  if (value.format === 'columnar' && Array.isArray(value.columns) && Array.isArray(value.values)) {
+    const constants = value.constants || {}
+    const rows = new Array(value.length)
+    for (let i = 0; i < value.length; i++) {
+      const row = { ...constants }
+      for (let c = 0; c < value.columns.length; c++) {
+        row[value.columns[c]] = value.values[c][i]
+      }
+      rows[i] = row
+    }
+    return rows
+  }
+  const decoded = {}
+  Object.keys(value).forEach((key) => {
+    decoded[key] = decodeColumnarData(value[key])
+  })
+  return decoded
+}
+
+// 최종 응답 프레임의 real_data가 컬럼 형식이면 행 목록으로 바꿔 기존 화면 코드가 그대로 쓰게 함
+const decodeResponseFrame = (data) => {
+  if (!data.response || data.response.real_data_format !== 'columnar') {
+    return data
+  }
+  // eslint-disable-next-line no-unused-vars
+  const { real_data_format, ...response } = data.response
+  return { ...data, response: { ...response, real_data: decodeColumnarData(response.real_data) } }
+}
+
 // 스트리밍 채팅 API
-export const streamChatAPI = async (choice, message, chatroomId, onData) => {
+// options.streamRows: real_data를 청크 단위로 받아 재조립 (기본 true), options.onChunk: 청크 도착 콜백
+// options.aggregate: 'box'면 INLINE Trend real_data를 서버에서 계산한 박스 통계로 받음 (기본 null - 원본 행)
+// options.realDataFormat: 'columnar'면 real_data를 컬럼 형식으로 받아 행 목록으로 복원 (기본 'records', streamRows 무시)
+export const streamChatAPI = async (choice, message, chatroomId, onData, options = {}) => {
   console.log('🚀 Sending chat request:', { choice, message, chatroomId })
+  const { streamRows = true, onChunk = null, aggregate = null, realDataFormat = 'records' } = options
+  const handleChunkFrame = createChunkAssembler(onData, onChunk)
+  const dispatch = (data) => {
+    if (data.stream) {
+      handleChunkFrame(data)
+    } else {
+      onData(decodeResponseFrame(data))
+    }
+  }
   
   try {
     // 인증 확인
@@ -186,7 +361,10 @@ export const streamChatAPI = async (choice, message, chatroomId, onData) => {
       body: JSON.stringify({
         choice: choice,
         message: message,
-        chatroom_id: chatroomId
+        chatroom_id: chatroomId,
+        stream_rows: streamRows,
+        aggregate,
+        real_data_format: realDataFormat
       })
     })
     
@@ -199,62 +377,19 @@ export const streamChatAPI = async (choice, message, chatroomId, onData) => {
       throw new Error(`HTTP error! status: ${response.status}`)
     }
 
-    const reader = response.body.getReader()
-    const decoder = new TextDecoder()
-    let buffer = ''
-    
-    while (true) {
-      const { done, value } = await reader.read()
-      if (done) break
-      
-      const chunk = decoder.decode(value, { stream: true })
-      buffer += chunk
-      
-      // 완전한 라인들을 찾아서 처리
-      const lines = buffer.split('\n')
-      
-      // 마지막 라인은 불완전할 수 있으므로 버퍼에 보관
-      buffer = lines.pop() || ''
-      
-      for (const line of lines) {
-        if (line.trim() && line.startsWith('data: ')) {
-          try {
-            const jsonString = line.slice(6).trim()
-            if (jsonString) {
-              const data = JSON.parse(jsonString)
-              console.log('✅ Successfully parsed streaming data:', Object.keys(data))
-              onData(data)
-            }
-          } catch (e) {
-            console.error('❌ Error parsing streaming data:', e)
-            console.error('❌ Problematic line:', line.substring(0, 200) + '...')
-          }
-        }
-      }
-    }
-    
-    // 마지막에 남은 버퍼 처리
-    if (buffer.trim() && buffer.startsWith('data: ')) {
-      try {
-        const jsonString = buffer.slice(6).trim()
-        if (jsonString) {
-          const data = JSON.parse(jsonString)
-          console.log('✅ Successfully parsed final streaming data:', Object.keys(data))
-          onData(data)
-        }
-      } catch (e) {
-        console.error('❌ Error parsing final streaming data:', e)
-      }
-    }
+    await readChatStream(response, dispatch)
   } catch (error) {
     console.error('Error in streamChatAPI:', error)
     throw error
   }
 }
 
-// 메시지 수정 API (새로 추가)
-export const editMessageAPI = async (choice, message, chatroomId, originalChatId) => {
+// 메시지 수정 API - /chat과 같은 SSE 스트림을 읽어 최종 응답으로 resolve
+// options.onProgress: 진행 메시지 프레임 콜백
+// options.streamRows / options.onChunk / options.aggregate / options.realDataFormat: streamChatAPI와 동일
+export const editMessageAPI = async (choice, message, chatroomId, originalChatId, options = {}) => {
   console.log('🔄 Sending edit message request:', { choice, message, chatroomId, originalChatId })
+  const { streamRows = true, onChunk = null, onProgress = null, aggregate = null, realDataFormat = 'records' } = options
   
   try {
     // 인증 확인
@@ -269,7 +404,10 @@ export const editMessageAPI = async (choice, message, chatroomId, originalChatId
         choice: choice,
         message: message,
         chatroom_id: chatroomId,
-        original_chat_id: originalChatId
+        original_chat_id: originalChatId,
+        stream_rows: streamRows,
+        aggregate,
+        real_data_format: realDataFormat
       })
     })
     
@@ -282,8 +420,33 @@ export const editMessageAPI = async (choice, message, chatroomId, originalChatId
       throw new Error(`HTTP error! status: ${response.status}`)
     }
 
-    const data = await response.json()
-    return data
+    let result = null
+    let errorMessage = null
+    const handleFinal = (data) => {
+      if (data.msg) {
+        errorMessage = data.msg
+      } else if (data.response) {
+        result = decodeResponseFrame(data)
+      } else if (data.progress_message && onProgress) {
+        onProgress(data)
+      }
+    }
+    const handleChunkFrame = createChunkAssembler(handleFinal, onChunk)
+    await readChatStream(response, (data) => {
+      if (data.stream) {
+        handleChunkFrame(data)
+      } else {
+        handleFinal(data)
+      }
+    })
+
+    if (errorMessage) {
+      throw new Error(errorMessage)
+    }
+    if (!result) {
+      throw new Error('수정 응답을 받지 못했습니다.')
+    }
+    return result
   } catch (error) {
     console.error('Error in editMessageAPI:', error)
     throw error